@@ -0,0 +1 @@
+"""Benchmarki wydajności biblioteki. Uruchamiane jako moduły, np. python -m benchmarks.bench_models"""
@@ -0,0 +1,172 @@
+"""Przepustowość i zużycie pamięci głównych funkcji get_* bez dostępu do sieci.
+
+Odpowiedzi API są serwowane przez httpx.MockTransport (klient synchroniczny i asynchroniczny). Dla każdego
+przypadku mierzone są: liczba zapytań na sekundę przez pełną ścieżkę get_*/async_get_* (transport, dekodowanie,
+budowa modeli), osobno czas dekodowania JSON (backendem z opcji --json-backend) i budowy modelu oraz szczytowe
+zużycie pamięci jednego wywołania.
+Domyślnie używane są przykładowe odpowiedzi z benchmarks.payloads; opcja --fixtures pozwala podać plik JSON
+z nagranymi odpowiedziami w postaci {"ścieżka URL": odpowiedź}, np. {"/eli/acts/DU/2024/1": {...}}.
+
+    python -m benchmarks.bench_client > after.json
+    python -m benchmarks.bench_client --compare before.json
+"""
+from datetime import date
+import argparse
+import asyncio
+import json
+import gc
+import platform
+import time
+import tracemalloc
+import httpx
+from sejmAPI import transport, decoding
+from sejmAPI.concurrency import gather_bounded
+from sejmAPI.eli.acts import Act, Acts, get_act_details, async_get_act_details, search_acts, async_search_acts
+from sejmAPI.sejm.votings import Voting, get_voting_details, async_get_voting_details
+from sejmAPI.sejm.interpellations import Interpellation, get_interpellations, async_get_interpellations
+from sejmAPI.sejm.processes import ProcessDetails, get_process, async_get_process
+from sejmAPI.sejm.proceedings import StatementList, get_transcript, async_get_transcript
+from sejmAPI.sejm.mp import Mp, get_mps, async_get_mps
+from . import payloads
+
+DAY = date(2024, 1, 12)
+
+# nazwa: (model, many, ścieżka, odpowiedź, wywołanie synchroniczne, wywołanie asynchroniczne)
+CASES = {
+    'get_act_details': (Act, False, '/eli/acts/DU/2024/1', lambda: payloads.act(1),
+                        lambda s: get_act_details(s, 'DU', 2024, 1), lambda s: async_get_act_details(s, 'DU', 2024, 1)),
+    'search_acts': (Acts, False, '/eli/acts/search',
+                    lambda: {'items': [payloads.act(i) for i in range(100)], 'offset': 0, 'count': 100, 'totalCount': 100},
+                    lambda s: search_acts(s, year=2024), lambda s: async_search_acts(s, year=2024)),
+    'get_voting_details': (Voting, False, '/sejm/term10/votings/1/1', lambda: payloads.voting(),
+                           lambda s: get_voting_details(s, 10, 1, 1), lambda s: async_get_voting_details(s, 10, 1, 1)),
+    'get_interpellations': (Interpellation, True, '/sejm/term10/interpellations',
+                            lambda: [payloads.interpellation(i) for i in range(50)],
+                            lambda s: get_interpellations(s, 10, limit=50), lambda s: async_get_interpellations(s, 10, limit=50)),
+    'get_process': (ProcessDetails, False, '/sejm/term10/processes/1', lambda: payloads.process_details(1),
+                    lambda s: get_process(s, 10, 1), lambda s: async_get_process(s, 10, 1)),
+    'get_transcript': (StatementList, False, f'/sejm/term10/proceedings/1/{DAY}/transcripts', lambda: payloads.statement_list(),
+                       lambda s: get_transcript(s, 10, 1, DAY), lambda s: async_get_transcript(s, 10, 1, DAY)),
+    'get_mps': (Mp, True, '/sejm/term10/MP', lambda: [payloads.mp(i) for i in range(460)],
+                lambda s: get_mps(s, 10), lambda s: async_get_mps(s, 10)),
+}
+
+
+def build_routes(fixtures:dict=None):
+    """Zwraca słownik ścieżka -> zakodowana odpowiedź dla wszystkich przypadków"""
+    fixtures = fixtures or {}
+    return {path: json.dumps(fixtures.get(path, factory())).encode() for _, _, path, factory, _, _ in CASES.values()}
+
+def mock_transport(routes:dict):
+    def handler(request:httpx.Request):
+        body = routes.get(request.url.path)
+        if body is None:
+            return httpx.Response(404)
+        return httpx.Response(200, content=body, headers={'content-type': 'application/json'})
+    return httpx.MockTransport(handler)
+
+def _reset_transport():
+    # Wyniki nie mogą pochodzić z pamięci podręcznej ani być spowalniane przez limiter
+    transport.set_response_cache(None)
+    transport.set_rate_limiter(None)
+    transport.conditional_cache.clear()
+
+def bench_parse(model, many:bool, body:bytes, repeat:int):
+    decode = construct = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        raw = decoding.loads(body)
+        decoded = time.perf_counter()
+        value = [model(r) for r in raw] if many else model(raw)
+        construct += time.perf_counter() - decoded
+        decode += decoded - start
+        del raw, value
+    return decode / repeat * 1e6, construct / repeat * 1e6
+
+def bench_sync(call, routes:dict, requests:int):
+    with httpx.Client(transport=mock_transport(routes)) as session:
+        call(session)
+        start = time.perf_counter()
+        for _ in range(requests):
+            call(session)
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        tracemalloc.start()
+        call(session)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return requests / elapsed, peak
+
+async def bench_async(call, routes:dict, requests:int, concurrency:int):
+    async with httpx.AsyncClient(transport=mock_transport(routes)) as session:
+        await call(session)
+        start = time.perf_counter()
+        await gather_bounded((call(session) for _ in range(requests)), concurrency)
+        return requests / (time.perf_counter() - start)
+
+def run(requests:int, repeat:int, concurrency:int, fixtures:dict=None, only:list[str]=None):
+    _reset_transport()
+    routes = build_routes(fixtures)
+    cases = {}
+    for name, (model, many, path, _, sync_call, async_call) in CASES.items():
+        if only and name not in only:
+            continue
+        body = routes[path]
+        decode_us, construct_us = bench_parse(model, many, body, repeat)
+        sync_rps, peak = bench_sync(sync_call, routes, requests)
+        async_rps = asyncio.run(bench_async(async_call, routes, requests, concurrency))
+        cases[name] = {
+            'model': model.__name__,
+            'body_bytes': len(body),
+            'decode_us': decode_us,
+            'construct_us': construct_us,
+            'sync_req_per_s': sync_rps,
+            'async_req_per_s': async_rps,
+            'peak_bytes': peak,
+        }
+    return {
+        'python': platform.python_version(),
+        'httpx': httpx.__version__,
+        'json_backend': decoding.get_json_backend(),
+        'requests': requests,
+        'concurrency': concurrency,
+        'cases': cases,
+    }
+
+def compare(before:dict, after:dict):
+    lines = [f'{"case":<22}{"sync req/s":>24}{"async req/s":>24}{"construct µs":>24}{"peak KiB":>22}']
+    for name, result in after['cases'].items():
+        b = before.get('cases', {}).get(name)
+        if b is None:
+            continue
+        lines.append(f'{name:<22}{b["sync_req_per_s"]:>10.0f} -> {result["sync_req_per_s"]:>10.0f}'
+                     f'{b["async_req_per_s"]:>10.0f} -> {result["async_req_per_s"]:>10.0f}'
+                     f'{b["construct_us"]:>10.1f} -> {result["construct_us"]:>10.1f}'
+                     f'{b["peak_bytes"] / 1024:>9.0f} -> {result["peak_bytes"] / 1024:>9.0f}')
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500, help='liczba zapytań na przypadek')
+    parser.add_argument('--repeat', type=int, default=200, help='liczba powtórzeń pomiaru dekodowania i budowy modelu')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--fixtures', help='plik JSON z nagranymi odpowiedziami {"ścieżka": odpowiedź}')
+    parser.add_argument('--json-backend', choices=decoding.BACKENDS, help='domyślnie najszybszy zainstalowany')
+    parser.add_argument('--case', action='append', choices=sorted(CASES), help='uruchom tylko wybrane przypadki')
+    parser.add_argument('--compare', help='plik JSON z wcześniejszym wynikiem')
+    args = parser.parse_args()
+    if args.json_backend:
+        decoding.set_json_backend(args.json_backend)
+    fixtures = None
+    if args.fixtures:
+        with open(args.fixtures, encoding='utf-8') as f:
+            fixtures = json.load(f)
+    result = run(args.requests, args.repeat, args.concurrency, fixtures, args.case)
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(json.load(f), result))
+    else:
+        print(json.dumps(result, indent=2))
+
+if __name__ == '__main__':
+    main()
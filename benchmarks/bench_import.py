@@ -0,0 +1,90 @@
+"""Czas importu pakietu sejmAPI mierzony przez -X importtime z kontrolą budżetu.
+
+Każdy przypadek jest importowany w osobnym, świeżym interpreterze (--repeat razy, brana jest mediana).
+Mierzony jest czas łączny (total_ms, razem z zależnościami, np. httpx) i własny czas modułów sejmAPI (own_ms).
+Budżet pakietów dotyczy czasu łącznego, bo ich import nie powinien wczytywać żadnych zależności; budżet
+podmodułów dotyczy czasu własnego, bo czas importu httpx zależy od środowiska. Dla każdego przypadku
+sprawdzane jest też, że import nie wczytał podmodułów, które powinny ładować się leniwie, a dla pakietów -
+że dir() działa również po wczytaniu wszystkich podmodułów (np. sejmAPI.eli.globals przesłania builtin globals).
+Wynik jest drukowany jako JSON, a przekroczenie budżetu lub wczytanie zbędnego modułu kończy program kodem 1,
+więc skrypt może działać jako test regresji w CI:
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --budget sejmAPI=50 --repeat 9
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+
+# przypadek: (instrukcja importu, mierzony czas, budżet w ms, moduły, których import nie może wczytać)
+CASES = {
+    'sejmAPI': ('import sejmAPI', 'total_ms', 20.0, ('httpx', 'sejmAPI.sejm.mp', 'sejmAPI.eli.acts', 'sejmAPI.client')),
+    'sejmAPI.sejm': ('import sejmAPI.sejm', 'total_ms', 20.0, ('httpx', 'sejmAPI.sejm.mp', 'sejmAPI.sejm.questions')),
+    'sejmAPI.eli': ('import sejmAPI.eli', 'total_ms', 20.0, ('httpx', 'sejmAPI.eli.acts')),
+    'sejmAPI.sejm.mp': ('import sejmAPI.sejm.mp', 'own_ms', 30.0, ('sejmAPI.sejm.questions', 'sejmAPI.eli.acts', 'cgi')),
+    'sejmAPI.eli.acts': ('import sejmAPI.eli.acts', 'own_ms', 30.0, ('sejmAPI.sejm.mp', 'sejmAPI.eli.graph')),
+    'sejmAPI.sejm *': ('from sejmAPI.sejm import *', 'own_ms', 60.0,
+                       ('numpy', 'sejmAPI.sejm.votematrix', 'sejmAPI.sejm.images', 'sejmAPI.sejm.transcripts', 'sejmAPI.sejm.sync')),
+    'sejmAPI.eli *': ('from sejmAPI.eli import *', 'own_ms', 30.0, ('sejmAPI.eli.graph', 'sejmAPI.eli.structs', 'sejmAPI.eli.sync')),
+}
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$')
+
+
+def measure(statement:str, forbidden:tuple[str]):
+    """Importuje w nowym interpreterze i zwraca czasy {'total_ms', 'own_ms'} oraz wczytane moduły zabronione"""
+    check = f'{statement}; import sys; print(",".join(m for m in {list(forbidden)!r} if m in sys.modules))'
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', check], capture_output=True, text=True, check=True)
+    total = own = 0
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match or not match.group(4).startswith('sejmAPI'):
+            continue
+        own += int(match.group(1))
+        # Wiersze najwyższego poziomu (bez wcięcia) zawierają czas łączny razem z zależnościami
+        if len(match.group(3)) == 1:
+            total += int(match.group(2))
+    loaded = [m for m in proc.stdout.strip().split(',') if m]
+    return {'total_ms': total / 1000, 'own_ms': own / 1000}, loaded
+
+def check_dir(package:str):
+    """Wczytuje wszystkie podmoduły pakietu w nowym interpreterze i zwraca błąd dir() lub None"""
+    check = (f'import importlib, {package} as p\n'
+             f'for name in p._SUBMODULES: importlib.import_module(f"{package}.{{name}}")\n'
+             f'assert set(p._SUBMODULES) <= set(dir(p))')
+    proc = subprocess.run([sys.executable, '-c', check], capture_output=True, text=True)
+    return proc.stderr.strip().splitlines()[-1] if proc.returncode else None
+
+def bench_case(name:str, repeat:int, budget:float=None):
+    statement, metric, default_budget, forbidden = CASES[name]
+    budget = default_budget if budget is None else budget
+    samples, loaded = [], []
+    for _ in range(repeat):
+        elapsed, loaded = measure(statement, forbidden)
+        samples.append(elapsed)
+    result = {key: round(statistics.median(s[key] for s in samples), 2) for key in ('total_ms', 'own_ms')}
+    result.update({'budget': f'{metric} <= {budget}', 'unexpected_modules': loaded,
+                   'ok': result[metric] <= budget and not loaded})
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='liczba świeżych interpreterów na przypadek')
+    parser.add_argument('--case', action='append', choices=sorted(CASES), help='mierzone przypadki (domyślnie wszystkie)')
+    parser.add_argument('--budget', action='append', default=[], metavar='CASE=MS', help='nadpisuje budżet przypadku')
+    args = parser.parse_args()
+    budgets = {case: float(ms) for case, ms in (b.split('=', 1) for b in args.budget)}
+    results = {name: bench_case(name, args.repeat, budgets.get(name)) for name in args.case or CASES}
+    dir_errors = {package: error for package in ('sejmAPI.sejm', 'sejmAPI.eli') if (error := check_dir(package))}
+    json.dump({**results, 'dir_errors': dir_errors}, sys.stdout, indent=2)
+    print()
+    if dir_errors or not all(result['ok'] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
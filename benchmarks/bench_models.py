@@ -0,0 +1,94 @@
+"""Zużycie pamięci i przepustowość konstrukcji modeli.
+
+Dla każdego modelu mierzony jest czas budowy instancji ze zdekodowanego JSON-a, czas pierwszego odczytu
+wszystkich pól z datami oraz pamięć zajmowana przez instancję po zwolnieniu surowych słowników.
+Wynik jest drukowany jako JSON; opcja --compare wypisuje różnicę względem wcześniejszego wyniku.
+
+    python -m benchmarks.bench_models > after.json
+    python -m benchmarks.bench_models --compare before.json
+"""
+import argparse
+import json
+import gc
+import time
+import tracemalloc
+from sejmAPI.eli.acts import Act, ActInfo
+from sejmAPI.sejm.votings import Vote
+from sejmAPI.sejm.proceedings import Statement
+from sejmAPI.sejm.mp import Mp
+from sejmAPI.sejm.interpellations import Interpellation
+from sejmAPI.sejm.processes import ProcessDetails
+from . import payloads
+
+MODELS = {
+    'Act': (Act, payloads.act, ('promulgation', 'announcement_date', 'change_date', 'entry_into_force', 'valid_from',
+                                'repeal_date', 'expiration_date', 'legal_status_date')),
+    'ActInfo': (ActInfo, payloads.act_info, ('promulgation', 'announcement_date', 'change_date')),
+    'Vote': (Vote, payloads.vote, ()),
+    'Statement': (Statement, payloads.statement, ('start_datetime', 'end_datetime')),
+    'Mp': (Mp, payloads.mp, ('birth_date',)),
+    'Interpellation': (Interpellation, payloads.interpellation, ('receipt_date', 'sent_date', 'last_modified')),
+    'ProcessDetails': (ProcessDetails, payloads.process_details, ('document_date', 'change_date', 'process_start_date')),
+}
+
+
+def _encoded(factory, count:int):
+    return json.dumps([factory(i) for i in range(count)]).encode()
+
+def bench_model(model, factory, date_fields, count:int):
+    body = _encoded(factory, count)
+    raw = json.loads(body)
+    start = time.perf_counter()
+    instances = [model(r) for r in raw]
+    construct = time.perf_counter() - start
+    start = time.perf_counter()
+    for instance in instances:
+        for field in date_fields:
+            getattr(instance, field)
+    access = time.perf_counter() - start
+    del instances, raw
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    raw = json.loads(body)
+    instances = [model(r) for r in raw]
+    del raw
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del instances
+    return {
+        'construct_us': construct / count * 1e6,
+        'date_access_us': access / count * 1e6,
+        'instances_per_s': count / construct,
+        'bytes_per_instance': retained / count,
+    }
+
+def run(count:int):
+    return {name: bench_model(model, factory, fields, count) for name, (model, factory, fields) in MODELS.items()}
+
+def compare(before:dict, after:dict):
+    lines = [f'{"model":<16}{"construct µs":>22}{"bytes/instance":>24}']
+    for name, result in after.items():
+        if name not in before:
+            continue
+        b = before[name]
+        lines.append(f'{name:<16}{b["construct_us"]:>9.2f} -> {result["construct_us"]:>8.2f}'
+                     f'{b["bytes_per_instance"]:>11.0f} -> {result["bytes_per_instance"]:>9.0f}')
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--compare', help='plik JSON z wcześniejszym wynikiem')
+    args = parser.parse_args()
+    result = run(args.count)
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(json.load(f), result))
+    else:
+        print(json.dumps(result, indent=2))
+
+if __name__ == '__main__':
+    main()
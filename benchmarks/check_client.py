@@ -0,0 +1,60 @@
+"""Sprawdza, że każda publiczna funkcja z SEJM_MODULES i ELI_MODULES jest dostępna przez przestrzenie nazw klienta.
+
+Dla każdej funkcji z __all__ modułów przyjmującej sesję jako pierwszy parametr (np. get_term z parametrem client)
+sprawdzane jest, że SejmClient (funkcje synchroniczne) lub AsyncSejmClient (async_* bez przedrostka i aiter_*)
+zwraca ją jako metodę client.sejm/client.eli i że figuruje ona w dir() przestrzeni nazw. Funkcje publiczne, które
+nie przyjmują sesji, są wypisywane osobno. Brakująca operacja kończy program kodem 1:
+
+    python -m benchmarks.check_client
+"""
+import asyncio
+import importlib
+import inspect
+import json
+import sys
+import httpx
+from sejmAPI.client import SEJM_MODULES, ELI_MODULES, SejmClient, AsyncSejmClient, _is_async
+
+
+def _public_functions(package:str, modules:tuple[str]):
+    for module_name in modules:
+        module = importlib.import_module(f'{package}.{module_name}')
+        for name in module.__all__:
+            func = getattr(module, name)
+            if inspect.isfunction(func):
+                yield module_name, name, func
+
+def check(namespaces:dict):
+    """Zwraca listy operacji brakujących w kliencie oraz funkcji publicznych pominiętych, bo nie przyjmują sesji"""
+    missing, skipped = [], []
+    for package, modules in (('sejmAPI.sejm', SEJM_MODULES), ('sejmAPI.eli', ELI_MODULES)):
+        for module_name, name, func in _public_functions(package, modules):
+            parameters = list(inspect.signature(func).parameters)
+            if not parameters:
+                skipped.append(f'{module_name}.{name}')
+                continue
+            asynchronous = _is_async(func)
+            namespace = namespaces[package, asynchronous]
+            method = name.removeprefix('async_') if asynchronous else name
+            if method not in dir(namespace) or getattr(namespace, method, None) is None:
+                missing.append(f'{module_name}.{name}')
+    return missing, skipped
+
+
+def main():
+    transport = httpx.MockTransport(lambda request: httpx.Response(404))
+    client, async_client = SejmClient(transport=transport), AsyncSejmClient(transport=transport)
+    try:
+        missing, skipped = check({('sejmAPI.sejm', False): client.sejm, ('sejmAPI.eli', False): client.eli,
+                                  ('sejmAPI.sejm', True): async_client.sejm, ('sejmAPI.eli', True): async_client.eli})
+    finally:
+        client.close()
+        asyncio.run(async_client.aclose())
+    json.dump({'missing': missing, 'skipped': skipped, 'ok': not missing}, sys.stdout, indent=2)
+    print()
+    if missing:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
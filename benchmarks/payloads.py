@@ -0,0 +1,92 @@
+"""Przykładowe odpowiedzi API o strukturze zgodnej z dokumentacją, używane przez benchmarki."""
+
+
+def act(i:int=0):
+    return {
+        'address': f'WDU2024000{i:04d}', 'publisher': 'DU', 'year': 2024, 'volume': 0, 'pos': i,
+        'title': f'Ustawa z dnia 12 stycznia 2024 r. o zmianie ustawy o podatku dochodowym nr {i}',
+        'displayAddress': f'Dz.U. 2024 poz. {i}', 'promulgation': '2024-01-15', 'announcementDate': '2024-01-12',
+        'textPDF': True, 'textHTML': True, 'changeDate': '2024-02-01T10:15:30', 'ELI': f'DU/2024/{i}',
+        'type': 'Ustawa', 'status': 'obowiązujący', 'entryIntoForce': '2024-02-01', 'validFrom': '2024-02-01',
+        'legalStatusDate': '2024-02-01', 'inForce': 'IN_FORCE', 'comments': '', 'releasedBy': ['SEJM'],
+        'obligated': '', 'directives': [], 'keywords': ['podatki', 'podatek dochodowy'],
+        'keywordsNames': ['podatki'], 'texts': [{'fileName': 'D20240001.pdf', 'type': 'O'}], 'previousTitle': [],
+        'prints': [{'term': 10, 'number': '123', 'link': 'https://www.sejm.gov.pl/', 'linkPrintAPI': '', 'linkProcessAPI': ''}],
+        'references': {
+            'Akty zmienione': [{'id': f'DU/2020/{j}', 'date': '2024-02-01'} for j in range(5)],
+            'Podstawa prawna z art.': [{'id': 'DU/1997/483', 'art': 'art. 217'}],
+        },
+    }
+
+def act_info(i:int=0):
+    return {
+        'address': f'WDU2024000{i:04d}', 'publisher': 'DU', 'year': 2024, 'volume': 0, 'pos': i,
+        'title': f'Rozporządzenie Ministra Finansów w sprawie stawek nr {i}', 'displayAddress': f'Dz.U. 2024 poz. {i}',
+        'promulgation': '2024-01-15', 'announcementDate': '2024-01-12', 'textPDF': True, 'textHTML': False,
+        'changeDate': '2024-02-01T10:15:30', 'ELI': f'DU/2024/{i}', 'type': 'Rozporządzenie', 'status': 'obowiązujący',
+    }
+
+def vote(i:int=0):
+    # W każdym głosowaniu głosuje tych samych 460 posłów
+    mp = i % 460 + 1
+    return {'MP': mp, 'club': ('PiS', 'KO', 'PSL-TD', 'Polska2050-TD', 'Lewica', 'Konfederacja')[mp % 6], 'firstName': 'Jan',
+            'lastName': f'Kowalski{mp}', 'vote': ('YES', 'NO', 'ABSTAIN', 'ABSENT')[i % 4]}
+
+def voting(sitting:int=1, number:int=1, mps:int=460):
+    return {
+        'term': 10, 'sitting': sitting, 'sittingDay': 1, 'votingNumber': number, 'yes': 230, 'no': 200, 'abstain': 10,
+        'notParticipating': 20, 'totalVoted': 440, 'date': '2024-01-12T11:30:00', 'title': 'Pkt 3. porządku dziennego',
+        'description': 'głosowanie nad całością projektu', 'topic': 'Rządowy projekt ustawy', 'kind': 'ELECTRONIC',
+        'votes': [vote(i) for i in range(mps)],
+    }
+
+def statement(i:int=0):
+    return {
+        'num': i, 'function': 'Poseł', 'name': f'Jan Kowalski{i}', 'memberID': i, 'rapporteur': False, 'secretary': False,
+        'unspoken': False, 'startDateTime': '2024-01-12T10:00:00', 'endDateTime': '2024-01-12T10:05:00',
+    }
+
+def statement_list(count:int=200):
+    return {'proceedingNum': 3, 'date': '2024-01-12', 'statements': [statement(i) for i in range(count)]}
+
+def mp(i:int=0):
+    return {
+        'accusativeName': f'Jana Kowalskiego{i}', 'active': True, 'birthDate': '1970-05-01', 'birthLocation': 'Kraków',
+        'club': 'KO', 'districtName': 'Kraków', 'districtNum': 13, 'educationLevel': 'wyższe', 'email': 'jan@sejm.pl',
+        'firstLastName': f'Jan Kowalski{i}', 'firstName': 'Jan', 'genitiveName': f'Jana Kowalskiego{i}', 'id': i,
+        'lastFirstName': f'Kowalski{i} Jan', 'lastName': f'Kowalski{i}', 'numberOfVotes': 12345, 'profession': 'prawnik',
+        'secondName': 'Adam', 'voivodeship': 'małopolskie',
+    }
+
+def interpellation(i:int=0):
+    return {
+        'term': 10, 'num': i, 'title': f'Interpelacja w sprawie budowy drogi nr {i}', 'from': ['123'], 'to': ['Minister Infrastruktury'],
+        'receiptDate': '2024-01-10', 'sentDate': '2024-01-11', 'lastModified': '2024-02-01T10:15:30',
+        'links': [{'href': f'https://api.sejm.gov.pl/sejm/term10/interpellations/{i}/body', 'rel': 'body'}],
+        'replies': [{'key': f'R{i}', 'from': 'Minister Infrastruktury', 'receiptDate': '2024-02-01', 'onlyAttachment': False,
+                     'lastModified': '2024-02-01T10:15:30', 'links': [], 'attachments': []}],
+    }
+
+def process_details(i:int=0):
+    return {
+        'uE': 'NO', 'term': 10, 'number': str(i), 'title': f'Rządowy projekt ustawy nr {i}', 'description': 'projekt ustawy',
+        'documentDate': '2024-01-10', 'processStartDate': '2024-01-11', 'changeDate': '2024-02-01T10:15:30',
+        'webGeneratedDate': '2024-02-01T10:15:30', 'documentType': 'projekt ustawy', 'comments': '',
+        'otherDocuments': [{'number': '1', 'registeredDate': '2024-01-12'}], 'rclNum': 'UD1', 'urgencyStatus': 'NORMAL',
+        'legislativeCommittee': False, 'principleOfSubsidiarity': False, 'printsConsideredJointly': [],
+        'stages': [{'stageName': 'Projekt wpłynął do Sejmu', 'date': '2024-01-11',
+                    'children': [{'stageName': 'Skierowano do I czytania', 'date': '2024-01-12'}]}],
+    }
+
+def print_(i:int=0):
+    return {
+        'number': str(i), 'deliveryDate': '2024-01-10', 'title': f'Projekt ustawy nr {i}', 'term': 10,
+        'changeDate': '2024-02-01T10:15:30', 'documentDate': '2024-01-09', 'attachments': [f'{i}.pdf', f'{i}.docx'],
+    }
+
+def process_header(i:int=0):
+    return {
+        'uE': 'NO', 'ue': 'NO', 'term': 10, 'number': str(i), 'title': f'Projekt ustawy nr {i}', 'description': 'projekt ustawy',
+        'documentDate': '2024-01-10', 'processStartDate': '2024-01-11', 'changeDate': '2024-02-01T10:15:30',
+        'documentType': 'projekt ustawy', 'comments': '', 'webGeneratedDate': '2024-02-01T10:15:30',
+    }
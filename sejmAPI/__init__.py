@@ -1 +1,20 @@
-from . import sejm
\ No newline at end of file
+"""Klient API Sejmu RP i ELI. Pakiety sejm i eli oraz klienci są importowani dopiero przy pierwszym
+odwołaniu (PEP 562), więc samo `import sejmAPI` nie wczytuje httpx"""
+import importlib
+
+_SUBMODULES = ('sejm', 'eli', 'client', 'transport', 'cache', 'decoding', 'metrics', 'ratelimit', 'concurrency',
+               'pagination', 'lazy')
+_CLIENTS = ('SejmClient', 'AsyncSejmClient')
+
+
+def __getattr__(name:str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in _CLIENTS:
+        return getattr(importlib.import_module(f'{__name__}.client'), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | set(_CLIENTS))
+
+__all__ = ['sejm', 'eli', 'SejmClient', 'AsyncSejmClient']
@@ -0,0 +1,170 @@
+"""Trwała pamięć podręczna odpowiedzi API oparta o SQLite.
+
+Plik bazy może być współdzielony przez wiele procesów. Czas ważności wpisów zależy od rodziny endpointów
+(TTLPolicy), a rozmiar bazy jest ograniczony przez max_bytes - najdawniej używane wpisy są usuwane jako pierwsze.
+"""
+from threading import Lock
+import sqlite3
+import time
+import re
+import httpx
+
+FOREVER = float('inf')
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+
+class TTLPolicy:
+    """Czas ważności dla rodziny endpointów. Pole ttl to liczba sekund (0 wyłącza zapamiętywanie), FOREVER
+    lub funkcja przyjmująca zdekodowaną odpowiedź i zwracająca liczbę sekund"""
+    def __init__(self, name:str, pattern:str, ttl):
+        self.name = name
+        self.pattern = re.compile(pattern)
+        self.ttl = ttl
+
+    def matches(self, path:str):
+        return self.pattern.search(path) is not None
+
+    def resolve(self, data):
+        if callable(self.ttl):
+            return self.ttl(data)
+        return self.ttl
+
+    def __repr__(self):
+        return f'TTLPolicy(name={self.name}, ttl={self.ttl})'
+
+
+def _term_ttl(data):
+    if isinstance(data, dict) and data.get('current') is False:
+        return FOREVER
+    return DAY
+
+def _act_ttl(data):
+    if isinstance(data, dict) and data.get('repealDate'):
+        return FOREVER
+    return DAY
+
+DEFAULT_POLICIES = [
+    TTLPolicy('terms', r'^/sejm/term$', DAY),
+    TTLPolicy('term', r'^/sejm/term\d+$', _term_ttl),
+    TTLPolicy('videos_today', r'^/sejm/term\d+/videos/today$', 30),
+    TTLPolicy('term_reference', r'^/sejm/term\d+/(clubs|committees|bilateralGroups)(/[^/]+)?$', DAY),
+    TTLPolicy('mps', r'^/sejm/term\d+/MP$', HOUR),
+    TTLPolicy('eli_reference', r'^/eli/(keywords|types|statuses|institutions|references)$', DAY),
+    TTLPolicy('eli_publishers', r'^/eli/acts(/(?!search$)[^/]+)?$', DAY),
+    TTLPolicy('act_details', r'^/eli/acts/[^/]+/\d+/\d+$', _act_ttl),
+]
+
+
+class CachedResponse:
+    __slots__ = ('body', 'encoding', 'etag', 'last_modified', 'expires', 'ttl')
+
+    def __init__(self, body:bytes, encoding:str, etag:str, last_modified:str, expires:float|None, ttl:float):
+        self.body = body
+        self.encoding = encoding
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+        self.ttl = ttl
+
+    @property
+    def fresh(self):
+        return self.expires is None or self.expires > time.time()
+
+
+class ResponseCache:
+    """Pamięć podręczna odpowiedzi zapisywana w pliku SQLite.
+    Parametr ttls pozwala nadpisać czas ważności wybranych rodzin, np. {'videos_today': 10}"""
+    def __init__(self, path:str, max_bytes:int=256 * 1024 * 1024, policies:list[TTLPolicy]=None, ttls:dict=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.policies = [TTLPolicy(p.name, p.pattern.pattern, p.ttl) for p in (DEFAULT_POLICIES if policies is None else policies)]
+        for name, ttl in (ttls or {}).items():
+            self.set_ttl(name, ttl)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY, body BLOB NOT NULL, encoding TEXT, etag TEXT, last_modified TEXT,
+            expires REAL, ttl REAL NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+    def set_ttl(self, name:str, ttl):
+        """Zmienia czas ważności rodziny endpointów o podanej nazwie"""
+        for policy in self.policies:
+            if policy.name == name:
+                policy.ttl = ttl
+                return
+        raise KeyError(name)
+
+    def ttl_for(self, url:str, data):
+        path = httpx.URL(url).path
+        for policy in self.policies:
+            if policy.matches(path):
+                return policy.resolve(data)
+        return 0
+
+    def get(self, key:str):
+        with self._lock:
+            row = self._conn.execute('SELECT body, encoding, etag, last_modified, expires, ttl FROM responses WHERE key = ?',
+                                     (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (time.time(), key))
+            stored = CachedResponse(*row)
+            if stored.fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return stored
+
+    def store(self, key:str, res:httpx.Response, data):
+        """Zapisuje odpowiedź, jeśli polityka dla danego endpointu na to pozwala"""
+        ttl = self.ttl_for(key, data)
+        if not ttl or ttl <= 0:
+            return
+        now = time.time()
+        expires = None if ttl == FOREVER else now + ttl
+        body = res.content
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                               (key, body, res.encoding, res.headers.get('etag'), res.headers.get('last-modified'),
+                                expires, ttl, len(body), now))
+            self._evict()
+
+    def refresh(self, key:str, stored:CachedResponse):
+        """Przedłuża ważność wpisu po odpowiedzi 304"""
+        expires = None if stored.ttl == FOREVER else time.time() + stored.ttl
+        with self._lock:
+            self._conn.execute('UPDATE responses SET expires = ? WHERE key = ?', (expires, key))
+
+    def _evict(self):
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY accessed').fetchall():
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'entries': entries, 'bytes': size}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+__all__ = ['FOREVER', 'MINUTE', 'HOUR', 'DAY', 'TTLPolicy', 'DEFAULT_POLICIES', 'CachedResponse', 'ResponseCache']
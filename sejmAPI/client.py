@@ -0,0 +1,140 @@
+"""Klienci trzymający własną, dostrojoną pulę połączeń HTTP.
+
+SejmClient i AsyncSejmClient tworzą jeden httpx.Client/AsyncClient (HTTP/2, jeśli zainstalowano pakiet h2,
+keep-alive, limity połączeń i timeouty) i udostępniają funkcje z pakietów sejm oraz eli jako metody
+przestrzeni nazw client.sejm i client.eli, z sesją przekazywaną automatycznie:
+
+    with SejmClient() as client:
+        mps = client.sejm.get_mps(10)
+        act = client.eli.get_act_details('DU', 2024, 1)
+
+    async with AsyncSejmClient() as client:
+        mps = await client.sejm.get_mps(10)          # sejm.mp.async_get_mps
+        async for act in client.eli.aiter_search_acts(year=2024):
+            ...
+
+W kliencie asynchronicznym funkcje async_* są dostępne bez przedrostka, a generatory aiter_* pod własną nazwą.
+Parametr metrics (sejmAPI.metrics.Metrics) dodaje do sesji klienta haki mierzące opóźnienia zapytań.
+Moduły są importowane dopiero przy pierwszym użyciu przestrzeni nazw.
+"""
+from functools import partial, update_wrapper
+import importlib
+import inspect
+import httpx
+from .metrics import Metrics
+
+SEJM_MODULES = ('terms', 'mp', 'clubs', 'committees', 'groups', 'interpellations', 'questions', 'prints',
+                'proceedings', 'processes', 'videos', 'votings')
+ELI_MODULES = ('acts', 'globals')
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+
+def http2_available():
+    """Czy zainstalowano pakiet h2 wymagany przez httpx do obsługi HTTP/2"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _is_async(func):
+    return inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func) or func.__name__.startswith('aiter_')
+
+def _takes_session(func):
+    """Czy pierwszy parametr pozycyjny funkcji to sesja httpx (niezależnie od nazwy, np. session lub client)"""
+    parameters = list(inspect.signature(func).parameters.values())
+    if not parameters or parameters[0].kind not in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD):
+        return False
+    first = parameters[0]
+    if first.annotation is not inspect.Parameter.empty:
+        return first.annotation in (httpx.Client, httpx.AsyncClient)
+    return first.name in ('session', 'client')
+
+def _operations(package:str, modules:tuple[str], asynchronous:bool):
+    """Zwraca słownik nazwa metody -> funkcja dla funkcji z __all__ podanych modułów przyjmujących sesję"""
+    operations = {}
+    for module_name in modules:
+        module = importlib.import_module(f'{package}.{module_name}')
+        for name in getattr(module, '__all__', ()):
+            func = getattr(module, name)
+            if not inspect.isfunction(func) or _is_async(func) != asynchronous or not _takes_session(func):
+                continue
+            operations[name.removeprefix('async_') if asynchronous else name] = func
+    return operations
+
+
+class Namespace:
+    """Funkcje jednego pakietu (sejm lub eli) z przypiętą sesją klienta"""
+    def __init__(self, session, package:str, modules:tuple[str], asynchronous:bool):
+        self._session = session
+        self._package = package
+        self._modules = modules
+        self._asynchronous = asynchronous
+        self._operations = None
+
+    def _load(self):
+        if self._operations is None:
+            self._operations = _operations(self._package, self._modules, self._asynchronous)
+        return self._operations
+
+    def __getattr__(self, name:str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        func = self._load().get(name)
+        if func is None:
+            raise AttributeError(f'{self._package} nie udostępnia operacji {name}')
+        method = update_wrapper(partial(func, self._session), func)
+        setattr(self, name, method)
+        return method
+
+    def __dir__(self):
+        return sorted(self._load())
+
+
+class SejmClient:
+    """Klient synchroniczny. Parametr http2=None włącza HTTP/2, jeśli dostępny jest pakiet h2.
+    Pozostałe parametry (np. transport, proxy) są przekazywane do httpx.Client"""
+    def __init__(self, http2:bool=None, limits:httpx.Limits=DEFAULT_LIMITS, timeout:httpx.Timeout=DEFAULT_TIMEOUT,
+                 metrics:Metrics=None, **client_options):
+        self.session = httpx.Client(http2=http2_available() if http2 is None else http2, limits=limits, timeout=timeout,
+                                    **client_options)
+        if metrics is not None:
+            metrics.instrument(self.session)
+        self.sejm = Namespace(self.session, 'sejmAPI.sejm', SEJM_MODULES, False)
+        self.eli = Namespace(self.session, 'sejmAPI.eli', ELI_MODULES, False)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncSejmClient:
+    """Klient asynchroniczny. Parametr http2=None włącza HTTP/2, jeśli dostępny jest pakiet h2.
+    Pozostałe parametry (np. transport, proxy) są przekazywane do httpx.AsyncClient"""
+    def __init__(self, http2:bool=None, limits:httpx.Limits=DEFAULT_LIMITS, timeout:httpx.Timeout=DEFAULT_TIMEOUT,
+                 metrics:Metrics=None, **client_options):
+        self.session = httpx.AsyncClient(http2=http2_available() if http2 is None else http2, limits=limits,
+                                         timeout=timeout, **client_options)
+        if metrics is not None:
+            metrics.instrument(self.session)
+        self.sejm = Namespace(self.session, 'sejmAPI.sejm', SEJM_MODULES, True)
+        self.eli = Namespace(self.session, 'sejmAPI.eli', ELI_MODULES, True)
+
+    async def aclose(self):
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+__all__ = ['SEJM_MODULES', 'ELI_MODULES', 'DEFAULT_LIMITS', 'DEFAULT_TIMEOUT', 'http2_available', 'Namespace',
+           'SejmClient', 'AsyncSejmClient']
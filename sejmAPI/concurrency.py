@@ -0,0 +1,80 @@
+"""Pomocnicze funkcje do równoległego wykonywania wielu zapytań asynchronicznych."""
+from threading import Lock
+from itertools import islice
+import asyncio
+
+
+async def bounded_as_completed(coros, concurrency:int):
+    """Uruchamia korutyny z iterowalnego coros, najwyżej concurrency naraz, i zwraca ich wyniki w kolejności
+    ukończenia. Korutyny są tworzone leniwie, więc coros może być generatorem dowolnej długości"""
+    if concurrency < 1:
+        raise ValueError('concurrency musi być większe od 0')
+    coros = iter(coros)
+    pending = {asyncio.ensure_future(c) for c in islice(coros, concurrency)}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+            pending |= {asyncio.ensure_future(c) for c in islice(coros, len(done))}
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+async def gather_bounded(coros, concurrency:int):
+    """Jak asyncio.gather, ale wykonuje najwyżej concurrency korutyn naraz. Wyniki są w kolejności wejściowej"""
+    async def indexed(i, coro):
+        return i, await coro
+    results = {}
+    async for i, result in bounded_as_completed((indexed(i, c) for i, c in enumerate(coros)), concurrency):
+        results[i] = result
+    return [results[i] for i in range(len(results))]
+
+
+class SingleFlight:
+    """Łączy równoczesne wywołania o tym samym kluczu w jedno - pierwsze wywołanie uruchamia zadanie, a kolejne
+    czekają na jego wynik (lub wyjątek). Zadanie jest anulowane dopiero, gdy anulowani zostaną wszyscy oczekujący"""
+    def __init__(self):
+        self.calls = 0
+        self.duplicates = 0
+        self.failures = 0
+        self._inflight = {}
+        self._lock = Lock()
+
+    async def do(self, key, fn):
+        """Zwraca wynik korutyny fn() współdzielony przez wszystkie równoczesne wywołania z tym samym kluczem"""
+        key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            flight = self._inflight.get(key)
+            if flight is None:
+                self.calls += 1
+                flight = [asyncio.ensure_future(fn()), 0]
+                flight[0].add_done_callback(lambda task: self._done(key, task))
+                self._inflight[key] = flight
+            else:
+                self.duplicates += 1
+            flight[1] += 1
+        task = flight[0]
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                flight[1] -= 1
+                if flight[1] == 0:
+                    task.cancel()
+            raise
+
+    def _done(self, key, task:asyncio.Task):
+        with self._lock:
+            if self._inflight.get(key, (None,))[0] is task:
+                del self._inflight[key]
+            if not task.cancelled() and task.exception() is not None:
+                self.failures += 1
+
+    def stats(self):
+        with self._lock:
+            return {'calls': self.calls, 'duplicates': self.duplicates, 'failures': self.failures, 'inflight': len(self._inflight)}
+
+__all__ = ['bounded_as_completed', 'gather_bounded', 'SingleFlight']
@@ -0,0 +1,50 @@
+"""Wybór biblioteki dekodującej odpowiedzi JSON.
+
+Odpowiedzi są dekodowane bezpośrednio z bajtów (bez pośredniego tekstu) najszybszą dostępną biblioteką:
+msgspec, orjson lub standardowym modułem json. Backend można zmienić funkcją set_json_backend, np. aby
+porównać wyniki benchmarków. Modele (Act, Interpellation, ...) są budowane ze zdekodowanych słowników
+w swoich __init__, które odwzorowują nazwy pól camelCase na snake_case.
+"""
+import json
+
+BACKENDS = ('msgspec', 'orjson', 'json')
+
+
+def _load_backend(name:str):
+    if name == 'msgspec':
+        import msgspec
+        return msgspec.json.Decoder().decode
+    if name == 'orjson':
+        import orjson
+        return orjson.loads
+    if name == 'json':
+        return json.loads
+    raise ValueError(f'Nieznany backend JSON: {name}, dostępne: {", ".join(BACKENDS)}')
+
+def available_backends():
+    """Zwraca nazwy zainstalowanych backendów w kolejności preferencji"""
+    available = []
+    for name in BACKENDS:
+        try:
+            _load_backend(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+def set_json_backend(name:str=None):
+    """Ustawia backend dekodujący (msgspec, orjson lub json). None wybiera najszybszy zainstalowany"""
+    global loads, backend
+    if name is None:
+        name = available_backends()[0]
+    loads = _load_backend(name)
+    backend = name
+
+def get_json_backend():
+    return backend
+
+loads = json.loads
+backend = 'json'
+set_json_backend()
+
+__all__ = ['BACKENDS', 'available_backends', 'set_json_backend', 'get_json_backend', 'loads']
@@ -1,2 +1,17 @@
-from . import utils
-from . import acts
\ No newline at end of file
+"""Moduły API ELI. Podmoduły są importowane dopiero przy pierwszym odwołaniu (PEP 562)"""
+import importlib
+
+_SUBMODULES = ('utils', 'acts', 'globals', 'graph', 'index', 'structs', 'sync')
+
+
+def __getattr__(name:str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    # Bez globals(): po imporcie sejmAPI.eli.globals ta nazwa w przestrzeni pakietu wskazuje na podmoduł
+    return sorted(set(__all__) | set(_SUBMODULES))
+
+# Jak w sejmAPI.sejm: import * wczytuje tylko utils i acts, a graph, index, structs i sync wymagają jawnego importu
+__all__ = ['utils', 'acts']
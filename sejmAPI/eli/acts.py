@@ -1,15 +1,24 @@
+from collections.abc import Mapping
 from enum import StrEnum
-from .utils import BASE_URL, filter_query_params, parse_normal_date, parse_iso_format, ReferencesEnum
+from .utils import BASE_URL, filter_query_params, ReferencesEnum, LazyDate, LazyDateTime
+from ..transport import get_json, async_get_json, get_text, async_get_text, get_bytes, async_get_bytes, download, async_download
+from ..pagination import iter_pages, aiter_pages
+from array import array
 from datetime import date, datetime
 import httpx
 
 class Directive:
+    __slots__ = ('address', 'title', '_date')
+    date = LazyDate()
+
     def __init__(self, raw:dict):
         self.address = raw.get('address', '')
         self.title = raw.get('title', '')
-        self.date = parse_normal_date(raw.get('date', ''), '%Y-%m-%d')
+        self.date = raw.get('date', '')
 
 class PublishigHouse:
+    __slots__ = ('code', 'short_name', 'name', 'acts_count', 'years')
+
     def __init__(self, raw:dict):
         self.code = raw.get('code', '')
         self.short_name = raw.get('shortName', '')
@@ -18,6 +27,12 @@ class PublishigHouse:
         self.years = raw.get('years', [])
 
 class ActInfo:
+    __slots__ = ('address', 'publisher', 'year', 'volume', 'pos', 'title', 'display_address', '_promulgation',
+                 '_announcement_date', 'textPDF', 'textHTML', '_change_date', 'eli', 'act_type', 'status')
+    promulgation = LazyDate()
+    announcement_date = LazyDate()
+    change_date = LazyDateTime()
+
     def __init__(self, raw:dict):
         self.address = raw.get('address', '')
         self.publisher = raw.get('publisher', '')
@@ -26,11 +41,11 @@ class ActInfo:
         self.pos = raw.get('pos', -1)
         self.title = raw.get('title', '')
         self.display_address = raw.get('displayAddress', '')
-        self.promulgation = parse_normal_date(raw.get('promulgation', ''), '%Y-%m-%d')
-        self.announcement_date = parse_normal_date(raw.get('announcementDate', ''), '%Y-%m-%d')
+        self.promulgation = raw.get('promulgation', '')
+        self.announcement_date = raw.get('announcementDate', '')
         self.textPDF = raw.get('textPDF', False)
         self.textHTML = raw.get('textHTML', False)
-        self.change_date = parse_iso_format(raw.get('changeDate', ''))
+        self.change_date = raw.get('changeDate', '')
         self.eli = raw.get('ELI', '')
         self.act_type = raw.get('type', '')
         self.status = raw.get('status', '')
@@ -42,11 +57,15 @@ class ActText:
         u='U'
         h='H'
         i='I'
+    __slots__ = ('filename', 'type_')
+
     def __init__(self, raw:dict):
         self.filename = raw.get('filename', '')
         self.type_ = ActText.ActTextTypeEnum(raw.get('type'))
 
 class PrintRef:
+    __slots__ = ('term', 'number', 'link', 'link_print_api', 'link_process_api')
+
     def __init__(self, raw:dict):
         self.term = raw.get('term', -1)
         self.number = raw.get('number', '')
@@ -55,29 +74,73 @@ class PrintRef:
         self.link_process_api = raw.get('linkProcessAPI', '')
 
 class ReferenceInfo:
+    __slots__ = ('id', 'art', '_date')
+    date = LazyDate()
+
     def __init__(self, raw:dict):
         self.id	= raw.get('id', '')
         self.art = raw.get('art', '')
-        self.date = parse_normal_date(raw.get('date', ''), '%Y-%m-%d')
+        self.date = raw.get('date', '')
 
+_REFERENCE_TYPES = {t.value: t for t in ReferencesEnum}
 
-class Act:
+class References(Mapping):
+    """Referencje aktu (typ -> lista ReferenceInfo) tworzone z surowej odpowiedzi dopiero przy odczycie danego typu.
+    Iteracja i len obejmują tylko niepuste typy, a odczyt znanego typu bez referencji zwraca pustą listę"""
+    __slots__ = ('raw', '_lists')
+
+    def __init__(self, raw:dict):
+        self.raw = raw
+        self._lists = {}
+
+    def __getitem__(self, ref_type:ReferencesEnum):
+        items = self._lists.get(ref_type)
+        if items is None:
+            key = _REFERENCE_TYPES.get(ref_type)
+            if key is None:
+                raise KeyError(ref_type)
+            items = self._lists[key] = [ReferenceInfo(d) for d in self.raw.get(key) or ()]
+        return items
+
+    def __iter__(self):
+        for key, items in self.raw.items():
+            if items and key in _REFERENCE_TYPES:
+                yield _REFERENCE_TYPES[key]
+
+    def __len__(self):
+        return sum(1 for _ in self)
 
-    @staticmethod
-    def _create_references(raw:dict):
-        fd = {}
-        if len(raw.keys()) == 0:
-            return fd
-        for ref in ReferencesEnum:
-            references_list =  raw.get(ref, [])
-            fd.update({ref:list(map(lambda d:ReferenceInfo(d), references_list))})
-        return fd
+    def __contains__(self, ref_type):
+        return ref_type in _REFERENCE_TYPES and bool(self.raw.get(ref_type))
 
+    def ids(self, ref_type:ReferencesEnum):
+        """Zwraca identyfikatory ELI referencji danego typu bez tworzenia obiektów ReferenceInfo"""
+        return [d.get('id', '') for d in self.raw.get(ref_type) or ()]
+
+    def __str__(self):
+        return f'References({", ".join(f"{t}={len(self.raw[t])}" for t in self)})'
+
+
+class Act:
     class ActInForceEnum(StrEnum):
         in_force='IN_FORCE'
         not_in_force = 'NOT_IN_FORCE'
         unknown = 'UNKNOWN'
 
+    __slots__ = ('address', 'publisher', 'year', 'volume', 'pos', 'title', 'display_address', '_promulgation',
+                 '_announcement_date', 'textPDF', 'textHTML', '_change_date', 'eli', 'act_type', 'status',
+                 '_entry_into_force', '_valid_from', '_repeal_date', '_expiration_date', '_legal_status_date',
+                 'in_force', 'comments', 'released_by', 'obligated', 'directives', 'keywords', 'keywords_names',
+                 'texts', 'previous_title', 'prints', 'references')
+    promulgation = LazyDate()
+    announcement_date = LazyDate()
+    change_date = LazyDateTime()
+    entry_into_force = LazyDate()
+    valid_from = LazyDate()
+    repeal_date = LazyDate()
+    expiration_date = LazyDate()
+    legal_status_date = LazyDate()
+
     def __init__(self, raw:dict):
         self.address = raw.get('address', '')
         self.publisher = raw.get('publisher', '')
@@ -86,19 +149,19 @@ class Act:
         self.pos = raw.get('pos', -1)
         self.title = raw.get('title', '')
         self.display_address = raw.get('displayAddress', '')
-        self.promulgation = parse_normal_date(raw.get('promulgation', ''), '%Y-%m-%d')
-        self.announcement_date = parse_normal_date(raw.get('announcementDate', ''), '%Y-%m-%d')
+        self.promulgation = raw.get('promulgation', '')
+        self.announcement_date = raw.get('announcementDate', '')
         self.textPDF = raw.get('textPDF', False)
         self.textHTML = raw.get('textHTML', False)
-        self.change_date = parse_iso_format(raw.get('changeDate', ''))
+        self.change_date = raw.get('changeDate', '')
         self.eli = raw.get('ELI', '')
         self.act_type = raw.get('type', '')
         self.status = raw.get('status', '')
-        self.entry_into_force = parse_normal_date(raw.get('entryIntoForce', ''), '%Y-%m-%d')
-        self.valid_from = parse_normal_date(raw.get('validFrom', ''), '%Y-%m-%d')
-        self.repeal_date = parse_normal_date(raw.get('repealDate', ''), '%Y-%m-%d')
-        self.expiration_date = parse_normal_date(raw.get('expirationDate', ''), '%Y-%m-%d')
-        self.legal_status_date = parse_normal_date(raw.get('legalStatusDate', ''), '%Y-%m-%d')
+        self.entry_into_force = raw.get('entryIntoForce', '')
+        self.valid_from = raw.get('validFrom', '')
+        self.repeal_date = raw.get('repealDate', '')
+        self.expiration_date = raw.get('expirationDate', '')
+        self.legal_status_date = raw.get('legalStatusDate', '')
         self.in_force = Act.ActInForceEnum(raw.get('inForce'))
         self.comments = raw.get('comments', [])
         self.released_by = raw.get('releasedBy', '')
@@ -110,7 +173,7 @@ class Act:
         self.texts = [ActText(at) for at in raw.get('texts', [])]
         self.previous_title = raw.get('previousTitle', [])
         self.prints = [PrintRef(p) for p in raw.get('prints', [])]
-        self.references = self._create_references(raw.get('references', {}))
+        self.references = References(raw.get('references', {}))
 
 
 
@@ -118,6 +181,8 @@ class Act:
 
 
 class Acts:
+    __slots__ = ('items', 'offset', 'count', 'total_count')
+
     def __init__(self, raw:dict):
         self.items = [Act(a) for a in raw.get('items', [])]
         self.offset = raw.get('offset', -1)
@@ -126,6 +191,8 @@ class Acts:
         # TODO: Można tu kiedyś dodać obiekt możliwej klasy searchQuery
 
 class ActsInfo:
+    __slots__ = ('items', 'offset', 'count', 'total_count')
+
     def __init__(self, raw:dict):
         self.items = [ActInfo(ai) for ai in raw.get('items', [])]
         self.offset = raw.get('offset', -1)
@@ -133,17 +200,107 @@ class ActsInfo:
         self.total_count = raw.get('totalCount', -1)
         # TODO: Można tu kiedyś dodać obiekt możliwej klasy searchQuery
 
+class ActUnit:
+    """Jednostka redakcyjna aktu (widok na element ActStruct)"""
+    __slots__ = ('struct', 'index')
+
+    def __init__(self, struct, index:int):
+        self.struct = struct
+        self.index = index
+
+    @property
+    def id(self):
+        return self.struct.ids[self.index]
+
+    @property
+    def type_(self):
+        return self.struct.types[self.index]
+
+    @property
+    def title(self):
+        return self.struct.titles[self.index]
+
+    @property
+    def parent(self):
+        parent = self.struct.parents[self.index]
+        return ActUnit(self.struct, parent) if parent >= 0 else None
+
+    @property
+    def children(self):
+        return self.struct.children(self.index)
+
+    def __str__(self):
+        return f'ActUnit(id={self.id}, type={self.type_}, title={self.title})'
+
+class ActStruct:
+    """Struktura aktu z /struct zapisana zwarto: listy ids, types i titles oraz tablica parents (numer rodzica
+    lub -1) w kolejności przejścia drzewa w głąb, zamiast obiektu dla każdej jednostki"""
+    __slots__ = ('ids', 'types', 'titles', 'parents', '_positions', '_children')
+
+    def __init__(self, raw:list|dict):
+        self.ids, self.types, self.titles, self.parents = [], [], [], array('i')
+        stack = [(-1, unit) for unit in reversed(raw if isinstance(raw, list) else [raw])]
+        while stack:
+            parent, unit = stack.pop()
+            index = len(self.ids)
+            self.ids.append(unit.get('id', ''))
+            self.types.append(unit.get('type', ''))
+            self.titles.append(unit.get('title', ''))
+            self.parents.append(parent)
+            stack.extend((index, child) for child in reversed(unit.get('children') or ()))
+        self._positions = self._children = None
+
+    @classmethod
+    def from_columns(cls, columns:dict):
+        """Odtwarza strukturę z wyniku columns()"""
+        struct = cls.__new__(cls)
+        struct.ids, struct.types, struct.titles = columns['ids'], columns['types'], columns['titles']
+        struct.parents = array('i', columns['parents'])
+        struct._positions = struct._children = None
+        return struct
+
+    def columns(self):
+        return {'ids': self.ids, 'types': self.types, 'titles': self.titles, 'parents': self.parents.tolist()}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return (ActUnit(self, i) for i in range(len(self.ids)))
+
+    def children(self, index:int=-1):
+        """Zwraca dzieci jednostki o podanym numerze (-1 - jednostki najwyższego poziomu)"""
+        if self._children is None:
+            self._children = {}
+            for i, parent in enumerate(self.parents):
+                self._children.setdefault(parent, []).append(i)
+        return [ActUnit(self, i) for i in self._children.get(index, ())]
+
+    @property
+    def roots(self):
+        return self.children(-1)
+
+    def find(self, unit_id:str):
+        """Zwraca jednostkę o podanym identyfikatorze (np. 'art_5') lub None"""
+        if self._positions is None:
+            self._positions = {unit_id: i for i, unit_id in enumerate(self.ids)}
+        index = self._positions.get(unit_id)
+        return ActUnit(self, index) if index is not None else None
+
+    def units(self, type_:str):
+        """Zwraca jednostki danego typu w kolejności występowania w akcie"""
+        return [ActUnit(self, i) for i, t in enumerate(self.types) if t == type_]
+
+    def __str__(self):
+        return f'ActStruct(units={len(self.ids)})'
+
 def get_publishers(session:httpx.Client):
     """Zwraca listę wydawców"""
-    res = session.get(f'{BASE_URL}/acts')
-    res.raise_for_status()
-    return [PublishigHouse(p) for p in res.json()]
+    return get_json(session, f'{BASE_URL}/acts', PublishigHouse, many=True)
 
 async def async_get_publishers(session:httpx.AsyncClient):
     """Zwraca listę wydawców"""
-    res = await session.get(f'{BASE_URL}/acts')
-    res.raise_for_status()
-    return [PublishigHouse(p) for p in res.json()]
+    return await async_get_json(session, f'{BASE_URL}/acts', PublishigHouse, many=True)
 
 # TODO: parametr act_type jest prawdopodobnie enumem
 def search_acts(session:httpx.Client, announcement_date:date=None, date_effect:date=None, date_effect_from:date=None, date_effect_to:date=None,
@@ -155,9 +312,7 @@ def search_acts(session:httpx.Client, announcement_date:date=None, date_effect:d
         date_from=date_from, date_to=date_to, exile=exile, in_force=in_force, keyword=keyword, limit=limit, offset=offset,
         position=position, pub_date=pub_date, pub_date_from=pub_date_from, pub_date_to=pub_date_to, publisher=publisher, title=title,
         act_ype=act_ype, volume=volume, year=year)
-    res = session.get(f'{BASE_URL}/acts/search', params=params)
-    res.raise_for_status()
-    return Acts(res.json())
+    return get_json(session, f'{BASE_URL}/acts/search', Acts, params=params)
 
 # TODO: parametr act_type jest prawdopodobnie enumem
 async def async_search_acts(session:httpx.AsyncClient, announcement_date:date=None, date_effect:date=None, date_effect_from:date=None, date_effect_to:date=None,
@@ -169,113 +324,131 @@ async def async_search_acts(session:httpx.AsyncClient, announcement_date:date=No
         date_from=date_from, date_to=date_to, exile=exile, in_force=in_force, keyword=keyword, limit=limit, offset=offset,
         position=position, pub_date=pub_date, pub_date_from=pub_date_from, pub_date_to=pub_date_to, publisher=publisher, title=title,
         act_ype=act_ype, volume=volume, year=year)
-    res = await session.get(f'{BASE_URL}/acts/search', params=params)
-    res.raise_for_status()
-    return Acts(res.json())
+    return await async_get_json(session, f'{BASE_URL}/acts/search', Acts, params=params)
+
+def iter_search_acts(session:httpx.Client, page_size:int=100, **filters):
+    """Zwraca kolejno wszystkie akty spełniające kryteria, pobierając wyniki stronami.
+    Parametry filters odpowiadają parametrom search_acts (bez offset i limit)"""
+    def fetch_page(offset, limit):
+        acts = search_acts(session, offset=offset, limit=limit, **filters)
+        return acts.items, acts.total_count
+    return iter_pages(fetch_page, page_size)
+
+def aiter_search_acts(session:httpx.AsyncClient, page_size:int=100, prefetch:int=4, **filters):
+    """Asynchronicznie zwraca wszystkie akty spełniające kryteria, pobierając do prefetch stron naraz.
+    Parametry filters odpowiadają parametrom search_acts (bez offset i limit)"""
+    async def fetch_page(offset, limit):
+        acts = await async_search_acts(session, offset=offset, limit=limit, **filters)
+        return acts.items, acts.total_count
+    return aiter_pages(fetch_page, page_size, prefetch=prefetch)
 
 def get_publisher_info(session:httpx.Client, publisher:str):
     """Zwraca informacje na temat wydawcy"""
-    res = session.get(f'{BASE_URL}/acts/{publisher}')
-    res.raise_for_status()
-    return PublishigHouse(res.json())
+    return get_json(session, f'{BASE_URL}/acts/{publisher}', PublishigHouse)
 
 async def async_get_publisher_info(session:httpx.AsyncClient, publisher:str):
     """Zwraca informacje na temat wydawcy"""
-    res = await session.get(f'{BASE_URL}/acts/{publisher}')
-    res.raise_for_status()
-    return PublishigHouse(res.json())
+    return await async_get_json(session, f'{BASE_URL}/acts/{publisher}', PublishigHouse)
 
 def get_acts_for_year(session:httpx.Client, publisher:str, year:int):
     """Zwraca Akty dla danego roku i wydawcy"""
-    res = session.get(f'{BASE_URL}/acts/{publisher}/{year}')
-    res.raise_for_status()
-    return ActsInfo(res.json())
+    return get_json(session, f'{BASE_URL}/acts/{publisher}/{year}', ActsInfo)
 
 async def async_get_acts_for_year(session:httpx.AsyncClient, publisher:str, year:int):
     """Zwraca Akty dla danego roku i wydawcy"""
-    res = await session.get(f'{BASE_URL}/acts/{publisher}/{year}')
-    res.raise_for_status()
-    return ActsInfo(res.json())
+    return await async_get_json(session, f'{BASE_URL}/acts/{publisher}/{year}', ActsInfo)
 
 def get_volumes(session:httpx.Client, publisher:str, year:int):
     """Zwraca listę tomów dla danego wydawcy i roku"""
-    res = session.get(f'{BASE_URL}/acts/{publisher}/{year}/volumes')
-    res.raise_for_status()
-    return res.json()
+    return get_json(session, f'{BASE_URL}/acts/{publisher}/{year}/volumes')
 
 async def async_get_volumes(session:httpx.AsyncClient, publisher:str, year:int):
     """Zwraca listę tomów dla danego wydawcy i roku"""
-    res = await session.get(f'{BASE_URL}/acts/{publisher}/{year}/volumes')
-    res.raise_for_status()
-    return res.json()
+    return await async_get_json(session, f'{BASE_URL}/acts/{publisher}/{year}/volumes')
 
 def get_acts_for_volume(session:httpx.Client, publisher:str, year:int, volume:int):
     """Zwraca listę tomów dla danego wydawcy i roku"""
-    res = session.get(f'{BASE_URL}/acts/{publisher}/{year}/volumes/{volume}')
-    res.raise_for_status()
-    return ActsInfo(res.json())
+    return get_json(session, f'{BASE_URL}/acts/{publisher}/{year}/volumes/{volume}', ActsInfo)
 
 async def async_get_acts_for_volume(session:httpx.AsyncClient, publisher:str, year:int, volume:int):
     """Zwraca listę tomów dla danego wydawcy i roku"""
-    res = await session.get(f'{BASE_URL}/acts/{publisher}/{year}/volumes/{volume}')
-    res.raise_for_status()
-    return ActsInfo(res.json())
+    return await async_get_json(session, f'{BASE_URL}/acts/{publisher}/{year}/volumes/{volume}', ActsInfo)
 
 def get_act_details(session:httpx.Client, publisher:str, year:int, position:int):
     """Zwróć szczegóły na temat konkretnego aktu"""
-    res = session.get(f'{BASE_URL}/acts/{publisher}/{year}/{position}')
-    res.raise_for_status()
-    return Act(res.json())
+    return get_json(session, f'{BASE_URL}/acts/{publisher}/{year}/{position}', Act)
 
 async def async_get_act_details(session:httpx.AsyncClient, publisher:str, year:int, position:int):
     """Zwróć szczegóły na temat konkretnego aktu"""
-    res = await session.get(f'{BASE_URL}/acts/{publisher}/{year}/{position}')
-    res.raise_for_status()
-    return Act(res.json())
+    return await async_get_json(session, f'{BASE_URL}/acts/{publisher}/{year}/{position}', Act)
 
 def get_act_references(session:httpx.Client, publisher:str, year:int, position:int):
     """Zwróć referencje do danego aktu"""
-    res = session.get(f'{BASE_URL}/acts/{publisher}/{year}/{position}/references')
-    res.raise_for_status()
-    return Act._create_references(res.json())
+    return get_json(session, f'{BASE_URL}/acts/{publisher}/{year}/{position}/references', References)
 
 async def async_get_act_references(session:httpx.AsyncClient, publisher:str, year:int, position:int):
     """Zwróć referencje do danego aktu"""
-    res = await session.get(f'{BASE_URL}/acts/{publisher}/{year}/{position}/references')
-    res.raise_for_status()
-    return Act._create_references(res.json())
-
-# TODO: DO ogarnięcia funkcja pobierająca dane z /acts/{publisher}/{year}/{position}/struct oraz enkapsulacja danych w klasę
+    return await async_get_json(session, f'{BASE_URL}/acts/{publisher}/{year}/{position}/references', References)
+
+def get_act_struct(session:httpx.Client, publisher:str, year:int, position:int, cache=None, change_date:datetime=None):
+    """Zwróć strukturę aktu. Z pamięcią cache (np. eli.structs.StructCache) struktura jest pobierana tylko wtedy,
+    gdy brak wpisu dla danej daty zmiany aktu (change_date, domyślnie odczytywana z get_act_details)"""
+    eli = f'{publisher}/{year}/{position}'
+    if cache is None:
+        return get_json(session, f'{BASE_URL}/acts/{eli}/struct', ActStruct)
+    if change_date is None:
+        change_date = get_act_details(session, publisher, year, position).change_date
+    struct = cache.get(eli, change_date)
+    if struct is None:
+        struct = get_json(session, f'{BASE_URL}/acts/{eli}/struct', ActStruct)
+        cache.set(eli, change_date, struct)
+    return struct
+
+async def async_get_act_struct(session:httpx.AsyncClient, publisher:str, year:int, position:int, cache=None,
+                               change_date:datetime=None):
+    """Zwróć strukturę aktu. Z pamięcią cache (np. eli.structs.StructCache) struktura jest pobierana tylko wtedy,
+    gdy brak wpisu dla danej daty zmiany aktu (change_date, domyślnie odczytywana z get_act_details)"""
+    eli = f'{publisher}/{year}/{position}'
+    if cache is None:
+        return await async_get_json(session, f'{BASE_URL}/acts/{eli}/struct', ActStruct)
+    if change_date is None:
+        change_date = (await async_get_act_details(session, publisher, year, position)).change_date
+    struct = cache.get(eli, change_date)
+    if struct is None:
+        struct = await async_get_json(session, f'{BASE_URL}/acts/{eli}/struct', ActStruct)
+        cache.set(eli, change_date, struct)
+    return struct
 
 def get_act_text(session:httpx.Client, publisher:str, year:int, position:int):
     """Zwróć text aktu w HTML"""
-    res = session.get(f'{BASE_URL}/acts/{publisher}/{year}/{position}/text.html')
-    res.raise_for_status()
-    return res.text
+    return get_text(session, f'{BASE_URL}/acts/{publisher}/{year}/{position}/text.html')
 
 async def async_get_act_text(session:httpx.AsyncClient, publisher:str, year:int, position:int):
     """Zwróć text aktu w HTML"""
-    res = await session.get(f'{BASE_URL}/acts/{publisher}/{year}/{position}/text.html')
-    res.raise_for_status()
-    return res.text
+    return await async_get_text(session, f'{BASE_URL}/acts/{publisher}/{year}/{position}/text.html')
 
 #TODO: Do ogarnięcia funkcja pobierająca dane z /acts/{publisher}/{year}/{position}/text.html/{tree}
 
 def get_act_pdf(session:httpx.Client, publisher:str, year:int, position:int):
     """Zwróć akt w postaci PDF"""
-    res = session.get(f'{BASE_URL}/acts/{publisher}/{year}/{position}/text.pdf')
-    res.raise_for_status()
-    return res.content
+    return get_bytes(session, f'{BASE_URL}/acts/{publisher}/{year}/{position}/text.pdf')
 
 async def async_get_act_pdf(session:httpx.AsyncClient, publisher:str, year:int, position:int):
     """Zwróć akt w postaci PDF"""
-    res = await session.get(f'{BASE_URL}/acts/{publisher}/{year}/{position}/text.pdf')
-    res.raise_for_status()
-    return res.content
+    return await async_get_bytes(session, f'{BASE_URL}/acts/{publisher}/{year}/{position}/text.pdf')
+
+def download_act_pdf(session:httpx.Client, publisher:str, year:int, position:int, dest, **options):
+    """Pobierz akt w postaci PDF strumieniowo do pliku lub obiektu plikowego. Opcje (chunk_size, expected_size, sha256, resume) jak w transport.download"""
+    return download(session, f'{BASE_URL}/acts/{publisher}/{year}/{position}/text.pdf', dest, **options)
+
+async def async_download_act_pdf(session:httpx.AsyncClient, publisher:str, year:int, position:int, dest, **options):
+    """Pobierz akt w postaci PDF strumieniowo do pliku lub obiektu plikowego. Opcje (chunk_size, expected_size, sha256, resume) jak w transport.download"""
+    return await async_download(session, f'{BASE_URL}/acts/{publisher}/{year}/{position}/text.pdf', dest, **options)
 
 # TODO: Endpoint /acts/{publisher}/{year}/{position}/text/{type}/{fileName} zdaje się nie działać
 
-__all__ = ['Directive', 'PublishigHouse', 'ActInfo', 'ActText', 'PrintRef', 'ReferenceInfo', 'Act', 'Acts', 'ActsInfo', 'get_act_pdf', 'get_act_references',
+__all__ = ['Directive', 'PublishigHouse', 'ActInfo', 'ActText', 'PrintRef', 'ReferenceInfo', 'References', 'Act', 'ActUnit', 'ActStruct', 'Acts', 'ActsInfo', 'get_act_pdf', 'get_act_references',
            'get_act_text', 'get_act_details', 'get_acts_for_year', 'get_acts_for_volume', 'get_volumes', 'get_publisher_info', 'get_publishers', 'async_get_act_text',
            'async_get_act_pdf', 'async_get_act_references', 'async_search_acts', 'async_get_volumes', 'async_get_act_details', 'async_get_acts_for_year', 'async_get_acts_for_volume',
-           'async_get_publisher_info', 'async_get_publishers', 'search_acts']
+           'async_get_publisher_info', 'async_get_publishers', 'search_acts', 'iter_search_acts', 'aiter_search_acts',
+           'download_act_pdf', 'async_download_act_pdf', 'get_act_struct', 'async_get_act_struct']
@@ -1,7 +1,9 @@
 from enum import StrEnum
 
 from .utils import BASE_URL, filter_query_params
+from ..transport import get_json, async_get_json
 from .acts import Acts
+from ..pagination import iter_pages, aiter_pages
 from datetime import datetime
 import httpx
 
@@ -29,101 +31,84 @@ class ReferencesEnum(StrEnum):
 
 def get_all_endpoints(session:httpx.Client):
     """Zwraca endpointy API"""
-    res = session.get(f'{BASE_URL}/')
-    res.raise_for_status()
-    return res.json()
+    return get_json(session, f'{BASE_URL}/')
 
 async def async_get_all_endpoints(session:httpx.AsyncClient):
     """Zwraca endpointy API"""
-    res = await session.get(f'{BASE_URL}/')
-    res.raise_for_status()
-    return res.json()
+    return await async_get_json(session, f'{BASE_URL}/')
 
 def get_changed_acts(session:httpx.Client, since:datetime, limit:int=None, offset:int=None):
     """Pobierz zmienione akty"""
     params = filter_query_params(since=since.strftime('%Y-%m-%dT%H:%M:%S'), limit=limit, offset=offset)
-    res = session.get(f'{BASE_URL}/changes/acts', params=params)
-    res.raise_for_status()
-    return Acts(res.json())
+    return get_json(session, f'{BASE_URL}/changes/acts', Acts, params=params)
 
 async def async_get_changed_acts(session:httpx.AsyncClient, since:datetime, limit:int=None, offset:int=None):
     """Pobierz zmienione akty"""
     params = filter_query_params(since=since.strftime('%Y-%m-%dT%H:%M:%S'), limit=limit, offset=offset)
-    res = await session.get(f'{BASE_URL}/changes/acts', params=params)
-    res.raise_for_status()
-    return Acts(res.json())
+    return await async_get_json(session, f'{BASE_URL}/changes/acts', Acts, params=params)
+
+def iter_changed_acts(session:httpx.Client, since:datetime, page_size:int=100):
+    """Zwraca kolejno wszystkie akty zmienione od podanej daty"""
+    def fetch_page(offset, limit):
+        acts = get_changed_acts(session, since, limit=limit, offset=offset)
+        return acts.items, acts.total_count
+    return iter_pages(fetch_page, page_size)
+
+def aiter_changed_acts(session:httpx.AsyncClient, since:datetime, page_size:int=100, prefetch:int=4):
+    """Asynchronicznie zwraca wszystkie akty zmienione od podanej daty, pobierając do prefetch stron naraz"""
+    async def fetch_page(offset, limit):
+        acts = await async_get_changed_acts(session, since, limit=limit, offset=offset)
+        return acts.items, acts.total_count
+    return aiter_pages(fetch_page, page_size, prefetch=prefetch)
 
 def get_institutions(session:httpx.Client):
     """Zwróć listę nazw instytucji"""
-    res = session.get(f'{BASE_URL}/institutions')
-    res.raise_for_status()
-    return res.json()
+    return get_json(session, f'{BASE_URL}/institutions')
 
 async def async_get_institutions(session:httpx.AsyncClient):
     """Zwróć listę nazw instytucji"""
-    res = await session.get(f'{BASE_URL}/institutions')
-    res.raise_for_status()
-    return res.json()
+    return await async_get_json(session, f'{BASE_URL}/institutions')
 
 def get_keywords(session:httpx.Client):
     """Zwróć listę słów kluczowych"""
-    res = session.get(f'{BASE_URL}/keywords')
-    res.raise_for_status()
-    return res.json()
+    return get_json(session, f'{BASE_URL}/keywords')
 
 async def async_get_keywords(session:httpx.AsyncClient):
     """Zwróć listę słów kluczowych"""
-    res = await session.get(f'{BASE_URL}/keywords')
-    res.raise_for_status()
-    return res.json()
+    return await async_get_json(session, f'{BASE_URL}/keywords')
 
 def get_references(session:httpx.Client):
     """Zwróć listę typów referencji"""
-    res = session.get(f'{BASE_URL}/references')
-    res.raise_for_status()
-    return res.json()
+    return get_json(session, f'{BASE_URL}/references')
 
 async def async_get_references(session:httpx.AsyncClient):
     """Zwróć listę typów referencji"""
-    res = await session.get(f'{BASE_URL}/references')
-    res.raise_for_status()
-    return res.json()
+    return await async_get_json(session, f'{BASE_URL}/references')
 
 def get_statuses(session:httpx.Client):
     """Zwróć listę statusów, które może mieć act"""
-    res = session.get(f'{BASE_URL}/statuses')
-    res.raise_for_status()
-    return res.json()
+    return get_json(session, f'{BASE_URL}/statuses')
 
 async def async_get_statuses(session:httpx.AsyncClient):
     """Zwróć listę statusów, które może mieć act"""
-    res = await session.get(f'{BASE_URL}/statuses')
-    res.raise_for_status()
-    return res.json()
+    return await async_get_json(session, f'{BASE_URL}/statuses')
 
 def get_titles(session:httpx.Client, query:str):
     """Zwraca listę słów znajdujących się w tytułach aktów na bazie parametru query"""
-    res = session.get(f'{BASE_URL}/titles', params={'q':query})
-    res.raise_for_status()
-    return res.json()
+    return get_json(session, f'{BASE_URL}/titles', params={'q':query})
 
 async def async_get_titles(session:httpx.AsyncClient, query:str):
     """Zwraca listę słów znajdujących się w tytułach aktów na bazie parametru query"""
-    res = await session.get(f'{BASE_URL}/titles', params={'q':query})
-    res.raise_for_status()
-    return res.json()
+    return await async_get_json(session, f'{BASE_URL}/titles', params={'q':query})
 
 def get_types(session:httpx.Client):
     """Zwróć listę typów, które może mieć dokument"""
-    res = session.get(f'{BASE_URL}/types')
-    res.raise_for_status()
-    return res.json()
+    return get_json(session, f'{BASE_URL}/types')
 
 async def async_get_types(session:httpx.AsyncClient):
     """Zwróć listę typów, które może mieć dokument"""
-    res = await session.get(f'{BASE_URL}/types')
-    res.raise_for_status()
-    return res.json()
+    return await async_get_json(session, f'{BASE_URL}/types')
 
 __all__ = ['get_types', 'get_titles', 'get_statuses', 'get_references', 'get_all_endpoints', 'get_keywords', 'get_institutions', 'get_changed_acts', 'async_get_types',
-           'async_get_titles', 'async_get_statuses', 'async_get_references', 'async_get_keywords', 'async_get_institutions', 'async_get_all_endpoints', 'async_get_changed_acts', 'ReferencesEnum']
\ No newline at end of file
+           'async_get_titles', 'async_get_statuses', 'async_get_references', 'async_get_keywords', 'async_get_institutions', 'async_get_all_endpoints', 'async_get_changed_acts', 'ReferencesEnum',
+           'iter_changed_acts', 'aiter_changed_acts']
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""Graf referencji między aktami oparty o tablice (CSR).
+
+Węzłami są identyfikatory ELI aktów (np. 'DU/2020/1842'), takie jak w Act.eli i ReferenceInfo.id. Dla każdej
+wartości ReferencesEnum przechowywana jest osobna lista sąsiedztwa w postaci CSR: tablica przesunięć
+(offsets[n]:offsets[n + 1] to krawędzie węzła n) i tablica węzłów docelowych. Referencje dodane po ostatnim
+compact() trafiają do części przyrostowej i są scalane automatycznie przed pierwszym zapytaniem.
+Odwrotne listy sąsiedztwa (dla ancestors) są budowane przy pierwszym użyciu.
+
+    graph = ReferenceGraph()
+    await graph.async_ingest(session, ['DU/1997/483', 'DU/2020/1842'])
+    chain = graph.bfs('DU/2020/1842', [ReferencesEnum.AKTY_ZMIENIAJACE])
+"""
+from .utils import BASE_URL, ReferencesEnum, array_bytes, bytes_array
+from ..transport import get_json, async_get_json
+from ..concurrency import bounded_as_completed
+from array import array
+from collections import deque
+import json
+import struct
+import zlib
+import httpx
+
+MAGIC = b'SEJMREF1'
+TYPES = list(ReferencesEnum)
+_TYPE_INDEX = {t: i for i, t in enumerate(TYPES)}
+
+
+def _reference_id(reference):
+    return reference['id'] if isinstance(reference, dict) else reference.id
+
+def _type_indexes(types):
+    return range(len(TYPES)) if types is None else [_TYPE_INDEX[ReferencesEnum(t)] for t in types]
+
+
+class ReferenceGraph:
+    """Skierowany graf referencji z osobnym zbiorem krawędzi dla każdego typu referencji"""
+    def __init__(self):
+        self.nodes = []
+        self._node_ids = {}
+        self._offsets = [array('I', [0]) for _ in TYPES]
+        self._targets = [array('I') for _ in TYPES]
+        self._reverse = [None for _ in TYPES]
+        self._ingested = set()
+        # Część przyrostowa: węzeł źródłowy -> {numer typu: tablica węzłów docelowych}
+        self._pending = {}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, eli:str):
+        return eli in self._node_ids
+
+    def _node(self, eli:str):
+        node = self._node_ids.get(eli)
+        if node is None:
+            node = self._node_ids[eli] = len(self.nodes)
+            self.nodes.append(eli)
+        return node
+
+    def add_references(self, eli:str, references:dict):
+        """Dodaje (lub zastępuje) referencje aktu. references to słownik typ -> lista ReferenceInfo
+        (jak Act.references) albo surowa odpowiedź endpointu /references"""
+        source = self._node(eli)
+        # Z leniwego Act.references odczytywane są surowe listy, bez tworzenia obiektów ReferenceInfo
+        references = getattr(references, 'raw', references)
+        edges = {}
+        for ref_type, items in references.items():
+            # Elementy StrEnum mają ten sam hash co ich wartości, więc słownik obsługuje oba rodzaje kluczy
+            t = _TYPE_INDEX.get(ref_type)
+            if t is not None and items:
+                edges[t] = array('I', [self._node(_reference_id(item)) for item in items])
+        self._pending[source] = edges
+        self._ingested.add(source)
+
+    def add_act(self, act):
+        """Dodaje referencje z obiektu Act"""
+        self.add_references(act.eli, act.references)
+
+    @property
+    def ingested(self):
+        """Identyfikatory aktów, dla których wczytano referencje"""
+        return {self.nodes[n] for n in self._ingested}
+
+    def compact(self):
+        """Scala część przyrostową z tablicami CSR"""
+        if not self._pending:
+            return
+        count = len(self.nodes)
+        changed = sorted(self._pending)
+        for t in range(len(TYPES)):
+            old_offsets, old_targets = self._offsets[t], self._targets[t]
+            old_count = len(old_offsets) - 1
+            offsets, targets = array('I', [0]), array('I')
+
+            def copy(lo:int, hi:int):
+                # Węzły [lo, hi) bez zmian: kopiowane blokiem z poprzednich tablic (nowe węzły nie mają krawędzi)
+                end = min(hi, old_count)
+                if lo < end:
+                    shift = len(targets) - old_offsets[lo]
+                    targets.extend(old_targets[old_offsets[lo]:old_offsets[end]])
+                    offsets.extend(o + shift for o in old_offsets[lo + 1:end + 1])
+                offsets.extend([len(targets)] * (hi - max(lo, end)))
+            # Węzły zmienione, które nie mają i nie miały krawędzi tego typu, mogą zostać skopiowane blokiem
+            touched = [n for n in changed if t in self._pending[n] or (n < old_count and old_offsets[n] != old_offsets[n + 1])]
+            previous = 0
+            for node in touched:
+                copy(previous, node)
+                targets.extend(self._pending[node].get(t, ()))
+                offsets.append(len(targets))
+                previous = node + 1
+            copy(previous, count)
+            self._offsets[t], self._targets[t] = offsets, targets
+        self._reverse = [None for _ in TYPES]
+        self._pending = {}
+
+    def _reversed(self, t:int):
+        reverse = self._reverse[t]
+        if reverse is None:
+            offsets, targets = self._offsets[t], self._targets[t]
+            counts = array('I', [0]) * (len(self.nodes) + 1)
+            for target in targets:
+                counts[target + 1] += 1
+            for node in range(len(self.nodes)):
+                counts[node + 1] += counts[node]
+            sources, position = array('I', [0]) * len(targets), array('I', counts)
+            for node in range(len(offsets) - 1):
+                for i in range(offsets[node], offsets[node + 1]):
+                    target = targets[i]
+                    sources[position[target]] = node
+                    position[target] += 1
+            reverse = self._reverse[t] = (counts, sources)
+        return reverse
+
+    def _adjacency(self, t:int, reverse:bool):
+        return self._reversed(t) if reverse else (self._offsets[t], self._targets[t])
+
+    def neighbors(self, eli:str, types:list[ReferencesEnum]=None, reverse:bool=False):
+        """Zwraca bezpośrednich sąsiadów aktu (reverse=True - akty wskazujące na dany akt)"""
+        self.compact()
+        node = self._node_ids.get(eli)
+        if node is None:
+            return []
+        result = []
+        for t in _type_indexes(types):
+            offsets, targets = self._adjacency(t, reverse)
+            if node < len(offsets) - 1:
+                result.extend(self.nodes[n] for n in targets[offsets[node]:offsets[node + 1]])
+        return list(dict.fromkeys(result))
+
+    def bfs(self, eli:str, types:list[ReferencesEnum]=None, max_depth:int=None, reverse:bool=False):
+        """Przeszukuje graf wszerz od aktu, idąc krawędziami podanych typów. Zwraca słownik ELI -> odległość
+        (bez aktu początkowego), w kolejności odwiedzania"""
+        self.compact()
+        start = self._node_ids.get(eli)
+        if start is None:
+            return {}
+        adjacency = [self._adjacency(t, reverse) for t in _type_indexes(types)]
+        depth = {start: 0}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if max_depth is not None and depth[node] >= max_depth:
+                continue
+            for offsets, targets in adjacency:
+                if node >= len(offsets) - 1:
+                    continue
+                for i in range(offsets[node], offsets[node + 1]):
+                    target = targets[i]
+                    if target not in depth:
+                        depth[target] = depth[node] + 1
+                        queue.append(target)
+        del depth[start]
+        return {self.nodes[n]: d for n, d in depth.items()}
+
+    def ancestors(self, eli:str, types:list[ReferencesEnum]=None, max_depth:int=None):
+        """Zwraca akty, z których da się dojść do danego aktu krawędziami podanych typów (ELI -> odległość)"""
+        return self.bfs(eli, types, max_depth, reverse=True)
+
+    def edge_count(self, ref_type:ReferencesEnum=None):
+        self.compact()
+        return sum(len(self._targets[t]) for t in _type_indexes(None if ref_type is None else [ref_type]))
+
+    def ingest(self, session:httpx.Client, elis:list[str]):
+        """Pobiera referencje podanych aktów i dodaje je do grafu. Zwraca listę aktów, których nie udało się pobrać"""
+        failed = []
+        for eli in elis:
+            try:
+                self.add_references(eli, get_json(session, f'{BASE_URL}/acts/{eli}/references'))
+            except httpx.HTTPError:
+                failed.append(eli)
+        return failed
+
+    async def async_ingest(self, session:httpx.AsyncClient, elis:list[str], concurrency:int=8):
+        """Pobiera referencje podanych aktów, najwyżej concurrency naraz, i dodaje je do grafu.
+        Zwraca listę aktów, których nie udało się pobrać"""
+        async def fetch(eli):
+            try:
+                return eli, await async_get_json(session, f'{BASE_URL}/acts/{eli}/references')
+            except httpx.HTTPError:
+                return eli, None
+        failed = []
+        async for eli, references in bounded_as_completed((fetch(eli) for eli in elis), concurrency):
+            if references is None:
+                failed.append(eli)
+            else:
+                self.add_references(eli, references)
+        return failed
+
+    def save(self, path:str):
+        """Zapisuje graf do pliku (tablice CSR kompresowane zlib)"""
+        self.compact()
+        sections = ['\n'.join(self.nodes).encode(), array_bytes(array('I', sorted(self._ingested)))]
+        for t in range(len(TYPES)):
+            sections += [array_bytes(self._offsets[t]), array_bytes(self._targets[t])]
+        sections = [zlib.compress(s) for s in sections]
+        header = json.dumps({'nodes': len(self.nodes), 'types': [str(t) for t in TYPES],
+                             'sections': [len(s) for s in sections]}).encode()
+        with open(path, 'wb') as f:
+            f.write(MAGIC + struct.pack('<I', len(header)) + header)
+            for section in sections:
+                f.write(section)
+
+    @classmethod
+    def load(cls, path:str):
+        """Wczytuje graf zapisany metodą save"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} nie jest plikiem grafu referencji')
+        header_size, = struct.unpack_from('<I', data, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(data[start:start + header_size])
+        position, sections = start + header_size, []
+        for size in header['sections']:
+            sections.append(zlib.decompress(data[position:position + size]))
+            position += size
+        graph = cls()
+        graph.nodes = sections[0].decode().split('\n') if header['nodes'] else []
+        graph._node_ids = {eli: n for n, eli in enumerate(graph.nodes)}
+        graph._ingested = set(bytes_array('I', sections[1]))
+        # Typy referencji są dopasowywane po nazwie, więc plik pozostaje poprawny po zmianie kolejności w ReferencesEnum
+        for i, name in enumerate(header['types']):
+            try:
+                t = _TYPE_INDEX[ReferencesEnum(name)]
+            except ValueError:
+                continue
+            graph._offsets[t] = bytes_array('I', sections[2 + 2 * i])
+            graph._targets[t] = bytes_array('I', sections[3 + 2 * i])
+        return graph
+
+    def __str__(self):
+        return f'ReferenceGraph(nodes={len(self.nodes)}, ingested={len(self._ingested)})'
+
+
+__all__ = ['TYPES', 'ReferenceGraph']
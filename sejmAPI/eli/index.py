@@ -0,0 +1,298 @@
+"""Lokalny indeks odwrócony tytułów i słów kluczowych aktów do wyszukiwania bez zapytań do API.
+
+Każdy akt (ActInfo lub Act) otrzymuje numer dokumentu. Słowa z tytułu oraz z keywords/keywords_names (dostępnych
+tylko w Act) trafiają do list dokumentów (postings). Zapisany indeks ma postać tablicową: posortowane słowa,
+tablicę przesunięć i jedną tablicę numerów dokumentów. Akty dodane później trafiają do części przyrostowej,
+scalanej przy compact() i save(). Ponowne dodanie aktu o tym samym adresie zastępuje poprzednią wersję.
+"""
+from .utils import array_bytes, bytes_array
+from .acts import get_publishers, async_get_publishers, get_acts_for_year, async_get_acts_for_year
+from ..concurrency import bounded_as_completed
+from array import array
+from bisect import bisect_left, insort
+import heapq
+import json
+import re
+import struct
+import zlib
+import httpx
+
+MAGIC = b'SEJMIDX1'
+_TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text:str):
+    """Dzieli tekst na słowa zapisane małymi literami"""
+    return _TOKEN.findall(text.casefold())
+
+
+class IndexHit:
+    __slots__ = ('address', 'title', 'publisher', 'year', 'status')
+
+    def __init__(self, address:str, title:str, publisher:str, year:int, status:str):
+        self.address = address
+        self.title = title
+        self.publisher = publisher
+        self.year = year
+        self.status = status
+
+    def __str__(self):
+        return f'IndexHit(address={self.address}, title={self.title})'
+
+
+class _Table:
+    """Słownik wartości tekstowych na numery (wydawcy, statusy)"""
+    __slots__ = ('names', 'ids')
+
+    def __init__(self, names:list[str]=None):
+        self.names = names or []
+        self.ids = {name: i for i, name in enumerate(self.names)}
+
+    def id(self, name:str):
+        i = self.ids.get(name)
+        if i is None:
+            i = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+
+class ActIndex:
+    """Indeks odwrócony aktów. Zapytania obsługiwane są w pamięci, bez kontaktu z API"""
+    def __init__(self):
+        self.addresses = []
+        self.titles = []
+        self.years = array('H')
+        self._publisher = array('H')
+        self._status = array('H')
+        self._publishers = _Table()
+        self._statuses = _Table()
+        self._doc_ids = {}
+        self._deleted = set()
+        # Część zwarta (CSR): słowo _terms[i] ma dokumenty _postings[_offsets[i]:_offsets[i + 1]]
+        self._terms = []
+        self._term_ids = {}
+        self._offsets = array('I', [0])
+        self._postings = array('I')
+        # Część przyrostowa
+        self._delta = {}
+        self._delta_terms = []
+
+    def __len__(self):
+        return len(self.addresses) - len(self._deleted)
+
+    def __contains__(self, address:str):
+        return address in self._doc_ids
+
+    def add(self, act):
+        """Dodaje akt (ActInfo lub Act) albo zastępuje wcześniej dodaną wersję aktu o tym samym adresie"""
+        old = self._doc_ids.get(act.address)
+        if old is not None:
+            self._deleted.add(old)
+        doc = len(self.addresses)
+        self._doc_ids[act.address] = doc
+        self.addresses.append(act.address)
+        self.titles.append(act.title)
+        self.years.append(max(act.year, 0))
+        self._publisher.append(self._publishers.id(act.publisher))
+        self._status.append(self._statuses.id(act.status))
+        words = set(tokenize(act.title))
+        for phrase in (*getattr(act, 'keywords', ()), *getattr(act, 'keywords_names', ())):
+            words.update(tokenize(phrase))
+        for word in words:
+            postings = self._delta.get(word)
+            if postings is None:
+                postings = self._delta[word] = array('I')
+                insort(self._delta_terms, word)
+            postings.append(doc)
+
+    def add_many(self, acts):
+        for act in acts:
+            self.add(act)
+
+    def _term_postings(self, term:str):
+        """Zwraca listy dokumentów słowa jako trójki (tablica, początek, koniec), bez kopiowania"""
+        refs = []
+        i = self._term_ids.get(term)
+        if i is not None:
+            refs.append((self._postings, self._offsets[i], self._offsets[i + 1]))
+        delta = self._delta.get(term)
+        if delta is not None:
+            refs.append((delta, 0, len(delta)))
+        return refs
+
+    def _prefix_terms(self, prefix:str):
+        for terms in (self._terms, self._delta_terms):
+            i = bisect_left(terms, prefix)
+            while i < len(terms) and terms[i].startswith(prefix):
+                yield terms[i]
+                i += 1
+
+    def _group(self, token:str, prefix:bool):
+        terms = set(self._prefix_terms(token)) if prefix else (token,)
+        return [ref for term in terms for ref in self._term_postings(term)]
+
+    @staticmethod
+    def _descending(group):
+        last = None
+        for doc in heapq.merge(*(_reversed(*ref) for ref in group), reverse=True):
+            if doc != last:
+                last = doc
+                yield doc
+
+    @staticmethod
+    def _contains(group, doc:int):
+        for a, lo, hi in group:
+            i = bisect_left(a, doc, lo, hi)
+            if i < hi and a[i] == doc:
+                return True
+        return False
+
+    def _accepts(self, publisher:str=None, year:int=None, status:str=None):
+        checks = []
+        if publisher is not None:
+            publisher_id = self._publishers.ids.get(publisher, -1)
+            checks.append(lambda d: self._publisher[d] == publisher_id)
+        if year is not None:
+            checks.append(lambda d: self.years[d] == year)
+        if status is not None:
+            status_id = self._statuses.ids.get(status, -1)
+            checks.append(lambda d: self._status[d] == status_id)
+        return lambda d: d not in self._deleted and all(check(d) for check in checks)
+
+    def search(self, query:str, prefix:bool=True, publisher:str=None, year:int=None, status:str=None, limit:int=20):
+        """Zwraca akty zawierające wszystkie słowa zapytania (ostatnie słowo jako początek słowa, jeśli prefix=True).
+        Wyniki są uporządkowane od najnowszych: najpierw akty dodane po ostatnim compact(), potem malejąco wg roku"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        groups = [self._group(token, prefix and i == len(tokens) - 1) for i, token in enumerate(tokens)]
+        groups.sort(key=lambda group: sum(hi - lo for _, lo, hi in group))
+        accepts = self._accepts(publisher, year, status)
+        hits = []
+        for doc in self._descending(groups[0]):
+            if accepts(doc) and all(self._contains(group, doc) for group in groups[1:]):
+                hits.append(self._hit(doc))
+                if len(hits) >= limit:
+                    break
+        return hits
+
+    def complete(self, prefix:str, limit:int=10):
+        """Zwraca słowa zaczynające się od prefix, od najczęściej występujących (odpowiednik get_titles)"""
+        prefix = prefix.casefold()
+        counts = {term: sum(hi - lo for _, lo, hi in self._term_postings(term)) for term in set(self._prefix_terms(prefix))}
+        return heapq.nlargest(limit, counts, key=counts.get)
+
+    def _hit(self, doc:int):
+        return IndexHit(self.addresses[doc], self.titles[doc], self._publishers.names[self._publisher[doc]],
+                        self.years[doc], self._statuses.names[self._status[doc]])
+
+    def get(self, address:str):
+        doc = self._doc_ids.get(address)
+        return self._hit(doc) if doc is not None else None
+
+    def compact(self):
+        """Scala część przyrostową z częścią zwartą, usuwa zastąpione wersje aktów i numeruje dokumenty
+        według roku i adresu"""
+        remap = array('l', [-1]) * len(self.addresses)
+        live = sorted((d for d in range(len(self.addresses)) if d not in self._deleted),
+                      key=lambda d: (self.years[d], self.addresses[d]))
+        for new, old in enumerate(live):
+            remap[old] = new
+        self.addresses = [self.addresses[d] for d in live]
+        self.titles = [self.titles[d] for d in live]
+        self.years = array('H', (self.years[d] for d in live))
+        self._publisher = array('H', (self._publisher[d] for d in live))
+        self._status = array('H', (self._status[d] for d in live))
+        self._doc_ids = {address: d for d, address in enumerate(self.addresses)}
+        terms, offsets, postings = [], array('I', [0]), array('I')
+        for term in sorted(set(self._terms).union(self._delta)):
+            docs = sorted(remap[a[i]] for a, lo, hi in self._term_postings(term) for i in range(lo, hi) if remap[a[i]] >= 0)
+            if docs:
+                terms.append(term)
+                postings.extend(docs)
+                offsets.append(len(postings))
+        self._terms, self._offsets, self._postings = terms, offsets, postings
+        self._term_ids = {term: i for i, term in enumerate(terms)}
+        self._delta, self._delta_terms, self._deleted = {}, [], set()
+
+    def save(self, path:str):
+        """Zapisuje zwarty indeks do pliku (sekcje tekstowe i tablice kompresowane zlib)"""
+        self.compact()
+        sections = [
+            '\n'.join(self.addresses).encode(),
+            '\n'.join(t.replace('\n', ' ') for t in self.titles).encode(),
+            '\n'.join(self._terms).encode(),
+            array_bytes(self.years), array_bytes(self._publisher), array_bytes(self._status),
+            array_bytes(self._offsets), array_bytes(self._postings),
+        ]
+        sections = [zlib.compress(s) for s in sections]
+        header = json.dumps({'docs': len(self.addresses), 'terms': len(self._terms), 'publishers': self._publishers.names,
+                             'statuses': self._statuses.names, 'sections': [len(s) for s in sections]}).encode()
+        with open(path, 'wb') as f:
+            f.write(MAGIC + struct.pack('<I', len(header)) + header)
+            for section in sections:
+                f.write(section)
+
+    @classmethod
+    def load(cls, path:str):
+        """Wczytuje indeks zapisany metodą save"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} nie jest plikiem indeksu aktów')
+        start = len(MAGIC) + 4
+        header_size, = struct.unpack_from('<I', data, len(MAGIC))
+        header = json.loads(data[start:start + header_size])
+        position, sections = start + header_size, []
+        for size in header['sections']:
+            sections.append(zlib.decompress(data[position:position + size]))
+            position += size
+        addresses, titles, terms, years, publisher, status, offsets, postings = sections
+        index = cls()
+        index.addresses = addresses.decode().split('\n') if header['docs'] else []
+        index.titles = titles.decode().split('\n') if header['docs'] else []
+        index._terms = terms.decode().split('\n') if header['terms'] else []
+        index.years, index._publisher, index._status = bytes_array('H', years), bytes_array('H', publisher), bytes_array('H', status)
+        index._offsets, index._postings = bytes_array('I', offsets), bytes_array('I', postings)
+        index._publishers, index._statuses = _Table(header['publishers']), _Table(header['statuses'])
+        index._doc_ids = {address: d for d, address in enumerate(index.addresses)}
+        index._term_ids = {term: i for i, term in enumerate(index._terms)}
+        return index
+
+    def __str__(self):
+        return f'ActIndex(acts={len(self)}, terms={len(self._terms) + len(self._delta)})'
+
+
+def _reversed(values:array, lo:int, hi:int):
+    for i in range(hi - 1, lo - 1, -1):
+        yield values[i]
+
+
+
+def _years(publishers, only_publishers, only_years):
+    for publisher in publishers:
+        if only_publishers and publisher.code not in only_publishers:
+            continue
+        for year in publisher.years:
+            if not only_years or year in only_years:
+                yield publisher.code, year
+
+def build_act_index(session:httpx.Client, publishers:list[str]=None, years:list[int]=None, index:ActIndex=None):
+    """Buduje (lub uzupełnia) indeks aktami z get_acts_for_year dla wszystkich wydawców i lat"""
+    index = index if index is not None else ActIndex()
+    for publisher, year in _years(get_publishers(session), publishers, years):
+        index.add_many(get_acts_for_year(session, publisher, year).items)
+    index.compact()
+    return index
+
+async def async_build_act_index(session:httpx.AsyncClient, publishers:list[str]=None, years:list[int]=None,
+                                index:ActIndex=None, concurrency:int=8):
+    """Buduje (lub uzupełnia) indeks, pobierając najwyżej concurrency list aktów naraz"""
+    index = index if index is not None else ActIndex()
+    pairs = _years(await async_get_publishers(session), publishers, years)
+    async for acts in bounded_as_completed((async_get_acts_for_year(session, p, y) for p, y in pairs), concurrency):
+        index.add_many(acts.items)
+    index.compact()
+    return index
+
+__all__ = ['tokenize', 'IndexHit', 'ActIndex', 'build_act_index', 'async_build_act_index']
@@ -0,0 +1,110 @@
+"""Trwała pamięć podręczna struktur aktów oraz wsadowe pobieranie struktur w puli procesów.
+
+StructCache przechowuje w pliku SQLite zwartą postać ActStruct (ActStruct.columns, kompresowane zlib) dla pary
+(ELI aktu, data zmiany). Wpis jest ważny, dopóki data zmiany aktu się nie zmieni, więc dla aktów z listy
+get_acts_for_year lub search_acts struktura jest pobierana tylko raz na wersję aktu:
+
+    cache = StructCache('structs.db')
+    struct = get_act_struct(session, 'DU', 2024, 1, cache=cache, change_date=act.change_date)
+
+build_act_structs dzieli pobieranie i budowę struktur wielu aktów między procesy. Każdy proces ma własną sesję
+HTTP, a do procesu głównego wraca tylko zwarta postać struktury, zapisywana w pamięci podręcznej.
+"""
+from .utils import BASE_URL
+from .acts import ActStruct
+from ..transport import get_bytes
+from .. import decoding
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from threading import Lock
+import sqlite3
+import json
+import zlib
+import httpx
+
+
+def _version(change_date:datetime|str|None):
+    if isinstance(change_date, datetime):
+        return change_date.isoformat()
+    return change_date or ''
+
+
+class StructCache:
+    """Pamięć podręczna struktur aktów w pliku SQLite, z kluczem (ELI, data zmiany aktu)"""
+    def __init__(self, path:str):
+        self.path = path
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS structs (eli TEXT PRIMARY KEY, change_date TEXT NOT NULL, data BLOB NOT NULL)')
+
+    def get(self, eli:str, change_date:datetime|str|None):
+        """Zwraca ActStruct zapisaną dla danej wersji aktu lub None"""
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM structs WHERE eli = ? AND change_date = ?',
+                                     (eli, _version(change_date))).fetchone()
+        return ActStruct.from_columns(json.loads(zlib.decompress(row[0]))) if row else None
+
+    def set(self, eli:str, change_date:datetime|str|None, struct:ActStruct):
+        """Zapisuje strukturę aktu, zastępując strukturę poprzedniej wersji"""
+        self.set_columns(eli, change_date, struct.columns())
+
+    def set_columns(self, eli:str, change_date:datetime|str|None, columns:dict):
+        data = zlib.compress(json.dumps(columns, ensure_ascii=False).encode())
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO structs VALUES (?, ?, ?)', (eli, _version(change_date), data))
+
+    def missing(self, versions:dict[str, datetime|str|None]):
+        """Zwraca ELI z podanego słownika ELI -> data zmiany, dla których brak aktualnego wpisu"""
+        with self._lock:
+            stored = dict(self._conn.execute('SELECT eli, change_date FROM structs'))
+        return [eli for eli, change_date in versions.items() if stored.get(eli) != _version(change_date)]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM structs').fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+
+_worker_session = None
+
+def _init_worker(client_options:dict):
+    global _worker_session
+    _worker_session = httpx.Client(**client_options)
+
+def _fetch_columns(eli:str):
+    """Zwraca (eli, kolumny struktury) lub (eli, None), jeśli nie udało się pobrać struktury albo ma ona
+    nieoczekiwaną postać - wyjątek w procesie roboczym przerwałby całe build_act_structs"""
+    try:
+        raw = decoding.loads(get_bytes(_worker_session, f'{BASE_URL}/acts/{eli}/struct'))
+        return eli, ActStruct(raw).columns()
+    except (httpx.HTTPError, ValueError, KeyError, TypeError, AttributeError, IndexError):
+        return eli, None
+
+def build_act_structs(acts, cache:StructCache=None, processes:int=None, chunksize:int=8, client_options:dict=None):
+    """Pobiera i buduje struktury aktów (obiekty z polami eli i change_date, np. ActInfo lub Act) w puli procesów.
+    Akty z aktualnym wpisem w cache są pomijane. Zwraca słownik ELI -> ActStruct oraz listę ELI,
+    których nie udało się pobrać"""
+    versions = {act.eli: act.change_date for act in acts}
+    structs, failed = {}, []
+    todo = list(versions)
+    if cache is not None:
+        todo = cache.missing(versions)
+        for eli in versions.keys() - set(todo):
+            structs[eli] = cache.get(eli, versions[eli])
+    if not todo:
+        return structs, failed
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(client_options or {},)) as pool:
+        for eli, columns in pool.map(_fetch_columns, todo, chunksize=chunksize):
+            if columns is None:
+                failed.append(eli)
+                continue
+            if cache is not None:
+                cache.set_columns(eli, versions[eli], columns)
+            structs[eli] = ActStruct.from_columns(columns)
+    return structs, failed
+
+__all__ = ['StructCache', 'build_act_structs']
@@ -0,0 +1,248 @@
+"""Przyrostowa synchronizacja aktów ELI do lokalnej bazy SQLite na podstawie endpointu /changes/acts.
+
+ActStore przechowuje surowe dane aktów (z których można odtworzyć obiekty Act), opcjonalnie ich referencje
+i tekst HTML, oraz znacznik (watermark) - najpóźniejszą datę zmiany (changeDate) widzianą podczas synchronizacji.
+Kolejna synchronizacja pobiera tylko akty zmienione od tej daty, a referencje i tekst odświeża wyłącznie dla aktów,
+których changeDate faktycznie się zmieniło. Takie akty są oznaczane jako oczekujące na odświeżenie w tej samej
+transakcji, w której zapisywane są ich dane, a oznaczenie usuwa dopiero zapis referencji lub tekstu - akty, dla których
+odświeżenie się nie powiodło lub nie zdążyło wykonać (np. po przerwaniu procesu), są ponawiane przy następnej
+synchronizacji.
+"""
+from .utils import BASE_URL, filter_query_params
+from .acts import Act, References
+from ..transport import get_json, async_get_json, get_text, async_get_text
+from ..pagination import iter_pages, aiter_pages
+from ..concurrency import gather_bounded
+from datetime import datetime
+from threading import Lock
+import sqlite3
+import json
+import httpx
+
+REFERENCES = 'references'
+TEXT = 'text'
+
+
+def _change_date(raw:dict):
+    try:
+        return datetime.fromisoformat(raw.get('changeDate', ''))
+    except (TypeError, ValueError):
+        return None
+
+
+class ActStore:
+    """Lokalna baza aktów w pliku SQLite (może być współdzielona z innymi procesami)"""
+    def __init__(self, path:str):
+        self.path = path
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS acts (
+                address TEXT PRIMARY KEY, publisher TEXT, year INTEGER, pos INTEGER, change_date TEXT, data TEXT NOT NULL)''')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS act_references (address TEXT PRIMARY KEY, data TEXT NOT NULL)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS act_texts (address TEXT PRIMARY KEY, html TEXT NOT NULL)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS pending (address TEXT NOT NULL, kind TEXT NOT NULL, PRIMARY KEY (address, kind))')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+
+    @property
+    def watermark(self):
+        """Najpóźniejsza data zmiany aktu zapisana w bazie lub None"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'watermark'").fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    @watermark.setter
+    def watermark(self, value:datetime):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('watermark', ?)", (value.isoformat(),))
+
+    def upsert_acts(self, raws:list[dict], pending_kinds:tuple[str]=()):
+        """Zapisuje akty i zwraca te, które są nowe lub mają inną datę zmiany niż zapisana. Zwracane akty są
+        w tej samej transakcji oznaczane jako oczekujące na odświeżenie rodzajów pending_kinds (REFERENCES, TEXT)"""
+        changed = []
+        with self._lock, self._conn:
+            for raw in raws:
+                address = raw.get('address', '')
+                row = self._conn.execute('SELECT change_date FROM acts WHERE address = ?', (address,)).fetchone()
+                if row is not None and row[0] == raw.get('changeDate'):
+                    continue
+                self._conn.execute('INSERT OR REPLACE INTO acts VALUES (?, ?, ?, ?, ?, ?)',
+                                   (address, raw.get('publisher'), raw.get('year'), raw.get('pos'), raw.get('changeDate'),
+                                    json.dumps(raw, ensure_ascii=False)))
+                for kind in pending_kinds:
+                    if kind == REFERENCES or raw.get('textHTML'):
+                        self._conn.execute('INSERT OR IGNORE INTO pending VALUES (?, ?)', (address, kind))
+                changed.append(raw)
+        return changed
+
+    def get_raw(self, address:str):
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM acts WHERE address = ?', (address,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_act(self, address:str):
+        """Zwraca obiekt Act lub None, jeśli aktu nie ma w bazie"""
+        raw = self.get_raw(address)
+        return Act(raw) if raw is not None else None
+
+    def iter_acts(self, publisher:str=None, year:int=None):
+        """Zwraca kolejno zapisane akty (opcjonalnie tylko danego wydawcy i roku)"""
+        query, args = 'SELECT data FROM acts', []
+        conditions = [(c, v) for c, v in (('publisher', publisher), ('year', year)) if v is not None]
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(f'{c} = ?' for c, _ in conditions)
+            args = [v for _, v in conditions]
+        with self._lock:
+            rows = self._conn.execute(query + ' ORDER BY address', args).fetchall()
+        for (data,) in rows:
+            yield Act(json.loads(data))
+
+    def set_references(self, address:str, raw:dict):
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO act_references VALUES (?, ?)', (address, json.dumps(raw, ensure_ascii=False)))
+            self._conn.execute('DELETE FROM pending WHERE address = ? AND kind = ?', (address, REFERENCES))
+
+    def get_references(self, address:str):
+        """Zwraca referencje aktu w postaci jak Act.references lub None"""
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM act_references WHERE address = ?', (address,)).fetchone()
+        return References(json.loads(row[0])) if row else None
+
+    def set_text(self, address:str, html:str):
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO act_texts VALUES (?, ?)', (address, html))
+            self._conn.execute('DELETE FROM pending WHERE address = ? AND kind = ?', (address, TEXT))
+
+    def get_text(self, address:str):
+        with self._lock:
+            row = self._conn.execute('SELECT html FROM act_texts WHERE address = ?', (address,)).fetchone()
+        return row[0] if row else None
+
+    def mark_pending(self, address:str, kind:str):
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR IGNORE INTO pending VALUES (?, ?)', (address, kind))
+
+    def pending(self, kind:str):
+        """Zwraca surowe dane aktów, dla których odświeżenie danego rodzaju (REFERENCES, TEXT) czeka na ponowienie"""
+        with self._lock:
+            rows = self._conn.execute('SELECT a.data FROM pending p JOIN acts a ON a.address = p.address WHERE p.kind = ?',
+                                      (kind,)).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM acts').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SyncResult:
+    """Podsumowanie synchronizacji"""
+    __slots__ = ('seen', 'changed', 'references', 'texts', 'failed', 'watermark')
+
+    def __init__(self, watermark:datetime|None):
+        self.seen = 0
+        self.changed = 0
+        self.references = 0
+        self.texts = 0
+        self.failed = 0
+        self.watermark = watermark
+
+    def __str__(self):
+        return (f'SyncResult(seen={self.seen}, changed={self.changed}, references={self.references}, '
+                f'texts={self.texts}, failed={self.failed}, watermark={self.watermark})')
+
+
+def _start(store:ActStore, since:datetime|None):
+    since = since or store.watermark
+    if since is None:
+        raise ValueError('Pierwsza synchronizacja wymaga podania parametru since')
+    return since
+
+def _changes_params(since:datetime, offset:int, limit:int):
+    return filter_query_params(since=since.strftime('%Y-%m-%dT%H:%M:%S'), limit=limit, offset=offset)
+
+def _record_page(store:ActStore, result:SyncResult, raws:list[dict], kinds:tuple[str]):
+    result.seen += len(raws)
+    for raw in raws:
+        changed = _change_date(raw)
+        if changed is not None and (result.watermark is None or changed > result.watermark):
+            result.watermark = changed
+    result.changed += len(store.upsert_acts(raws, kinds))
+
+def _act_url(raw:dict):
+    return f"{BASE_URL}/acts/{raw['publisher']}/{raw['year']}/{raw['pos']}"
+
+
+def sync_acts(session:httpx.Client, store:ActStore, since:datetime=None, refresh_references:bool=False,
+              refresh_text:bool=False, page_size:int=100):
+    """Pobiera akty zmienione od since (domyślnie od znacznika zapisanego w store) i zapisuje je w store.
+    Znacznik jest przesuwany dopiero po zapisaniu wszystkich stron, a referencje i teksty są odświeżane dla wszystkich
+    aktów oczekujących na odświeżenie (zmienionych teraz lub w przerwanych wcześniej synchronizacjach)"""
+    result = SyncResult(_start(store, since))
+    since = result.watermark
+    kinds = tuple(kind for kind, enabled in ((REFERENCES, refresh_references), (TEXT, refresh_text)) if enabled)
+
+    def fetch_page(offset, limit):
+        page = get_json(session, f'{BASE_URL}/changes/acts', params=_changes_params(since, offset, limit))
+        _record_page(store, result, page.get('items', []), kinds)
+        return page.get('items', []), page.get('totalCount')
+    for _ in iter_pages(fetch_page, page_size):
+        pass
+
+    for kind in kinds:
+        for raw in store.pending(kind):
+            try:
+                if kind == REFERENCES:
+                    store.set_references(raw['address'], get_json(session, f'{_act_url(raw)}/references'))
+                    result.references += 1
+                else:
+                    store.set_text(raw['address'], get_text(session, f'{_act_url(raw)}/text.html'))
+                    result.texts += 1
+            except httpx.HTTPError:
+                store.mark_pending(raw['address'], kind)
+                result.failed += 1
+    store.watermark = result.watermark
+    return result
+
+async def async_sync_acts(session:httpx.AsyncClient, store:ActStore, since:datetime=None, refresh_references:bool=False,
+                          refresh_text:bool=False, page_size:int=100, prefetch:int=4, concurrency:int=8):
+    """Asynchronicznie pobiera akty zmienione od since (domyślnie od znacznika zapisanego w store), pobierając
+    do prefetch stron naraz, i zapisuje je w store. Referencje i teksty są pobierane najwyżej concurrency naraz"""
+    result = SyncResult(_start(store, since))
+    since = result.watermark
+    kinds = tuple(kind for kind, enabled in ((REFERENCES, refresh_references), (TEXT, refresh_text)) if enabled)
+
+    async def fetch_page(offset, limit):
+        page = await async_get_json(session, f'{BASE_URL}/changes/acts', params=_changes_params(since, offset, limit))
+        _record_page(store, result, page.get('items', []), kinds)
+        return page.get('items', []), page.get('totalCount')
+    async for _ in aiter_pages(fetch_page, page_size, prefetch=prefetch):
+        pass
+
+    async def refresh(raw, kind):
+        try:
+            if kind == REFERENCES:
+                store.set_references(raw['address'], await async_get_json(session, f'{_act_url(raw)}/references'))
+            else:
+                store.set_text(raw['address'], await async_get_text(session, f'{_act_url(raw)}/text.html'))
+            return kind
+        except httpx.HTTPError:
+            store.mark_pending(raw['address'], kind)
+            return None
+
+    jobs = [(raw, kind) for kind in kinds for raw in store.pending(kind)]
+    for done in await gather_bounded((refresh(raw, kind) for raw, kind in jobs), concurrency):
+        if done == REFERENCES:
+            result.references += 1
+        elif done == TEXT:
+            result.texts += 1
+        else:
+            result.failed += 1
+    store.watermark = result.watermark
+    return result
+
+__all__ = ['REFERENCES', 'TEXT', 'ActStore', 'SyncResult', 'sync_acts', 'async_sync_acts']
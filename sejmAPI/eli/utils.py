@@ -1,4 +1,7 @@
 from datetime import datetime
+from array import array
+import sys
+from ..lazy import LazyDate, LazyDateTime
 from enum import StrEnum
 
 BASE_URL = 'https://api.sejm.gov.pl/eli'
@@ -41,4 +44,19 @@ def parse_normal_date(date_str:str, format:str):
     except ValueError:
         return None
 
-__all__ = ['BASE_URL', 'filter_query_params', 'parse_iso_format', 'parse_normal_date']
\ No newline at end of file
+def array_bytes(values:array):
+    """Zwraca zawartość tablicy array w kolejności bajtów little-endian (format plików indeksów)"""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def bytes_array(typecode:str, data:bytes):
+    """Odwrotność array_bytes"""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+__all__ = ['BASE_URL', 'filter_query_params', 'parse_iso_format', 'parse_normal_date', 'LazyDate', 'LazyDateTime', 'array_bytes', 'bytes_array']
\ No newline at end of file
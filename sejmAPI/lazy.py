@@ -0,0 +1,52 @@
+"""Deskryptory pól modeli parsujące daty dopiero przy pierwszym odczycie.
+
+Model przechowuje surowy tekst w slocie o nazwie poprzedzonej podkreśleniem (np. pole promulgation
+korzysta ze slotu _promulgation). Po pierwszym odczycie w slocie zapisywana jest sparsowana wartość.
+"""
+from datetime import datetime
+
+
+class LazyDate:
+    """Pole typu date parsowane formatem format przy pierwszym odczycie"""
+    __slots__ = ('slot', 'format')
+
+    def __init__(self, format:str='%Y-%m-%d'):
+        self.format = format
+        self.slot = None
+
+    def __set_name__(self, owner, name):
+        self.slot = f'_{name}'
+
+    def parse(self, value:str):
+        try:
+            return datetime.strptime(value, self.format).date()
+        except ValueError:
+            return None
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if isinstance(value, str):
+            value = self.parse(value)
+            setattr(obj, self.slot, value)
+        return value
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, value)
+
+
+class LazyDateTime(LazyDate):
+    """Pole typu datetime w formacie ISO parsowane przy pierwszym odczycie"""
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(None)
+
+    def parse(self, value:str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+
+__all__ = ['LazyDate', 'LazyDateTime']
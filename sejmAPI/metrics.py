@@ -0,0 +1,287 @@
+"""Pomiary zapytań sieciowych w podziale na szablony endpointów.
+
+Metrics zbiera dla każdego szablonu endpointu (np. /sejm/term{term}/MP/{id}) histogram opóźnień, liczbę bajtów
+odpowiedzi, liczniki kodów statusu, ponowień i błędów połączenia oraz osobne histogramy czasu dekodowania JSON
+i tworzenia modeli. Opóźnienie (czas do otrzymania nagłówków odpowiedzi) mierzą haki zdarzeń httpx dodawane do
+sesji przez instrument(session), więc obejmuje ono każde zapytanie sesji, w tym ponowienia i pobierania plików.
+Bajty, ponowienia i czasy parsowania zapisuje warstwa transport po włączeniu set_metrics:
+
+    metrics = Metrics(exporters=[LoggingExporter()])
+    metrics.instrument(session)
+    transport.set_metrics(metrics)
+    ...
+    metrics.export()
+
+Bez wywołania instrument i set_metrics (domyślnie) pomiary nie wykonują żadnej pracy.
+"""
+from bisect import bisect_left
+from functools import lru_cache
+from threading import Lock
+from urllib.parse import urlsplit
+import logging
+import os
+import re
+import time
+import httpx
+
+# Granice przedziałów histogramu w sekundach: od 1 ms do ok. 65 s, co pierwiastek z 2
+BUCKETS = tuple(0.001 * 2 ** (i / 2) for i in range(33))
+
+_TERM = re.compile(r'term\d+')
+_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_DIGIT = re.compile(r'\d')
+
+
+@lru_cache(maxsize=4096)
+def endpoint_template(url:str):
+    """Zwraca szablon ścieżki adresu: numery kadencji, daty i identyfikatory z cyframi są zastępowane symbolami"""
+    segments = []
+    for segment in urlsplit(url).path.split('/'):
+        if _TERM.fullmatch(segment):
+            segment = 'term{term}'
+        elif _DATE.fullmatch(segment):
+            segment = '{date}'
+        elif _DIGIT.search(segment):
+            segment = '{id}'
+        segments.append(segment)
+    return '/'.join(segments)
+
+
+class Histogram:
+    """Histogram o stałych przedziałach BUCKETS z przybliżonymi kwantylami"""
+    __slots__ = ('counts', 'count', 'sum', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value:float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q:float):
+        """Szacuje kwantyl interpolacją liniową wewnątrz przedziału"""
+        if not self.count:
+            return 0.0
+        rank, cumulative = q * self.count, 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = BUCKETS[i - 1] if i > 0 else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(lower + (upper - lower) * (rank - cumulative) / count, self.max)
+            cumulative += count
+        return self.max
+
+    def summary(self):
+        return {'count': self.count, 'mean': self.sum / self.count if self.count else 0.0,
+                'p50': self.quantile(0.5), 'p95': self.quantile(0.95), 'p99': self.quantile(0.99), 'max': self.max}
+
+
+class EndpointStats:
+    """Pomiary jednego szablonu endpointu"""
+    __slots__ = ('latency', 'parse', 'model', 'bytes', 'statuses', 'retries', 'errors')
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.parse = Histogram()
+        self.model = Histogram()
+        self.bytes = 0
+        self.statuses = {}
+        self.retries = 0
+        self.errors = 0
+
+    def snapshot(self):
+        return {'latency': self.latency.summary(), 'parse': self.parse.summary(), 'model': self.model.summary(),
+                'bytes': self.bytes, 'statuses': dict(self.statuses), 'retries': self.retries, 'errors': self.errors}
+
+
+_START = 'sejmapi.metrics.start'
+
+
+class Metrics:
+    """Zbiór pomiarów wszystkich endpointów z listą eksporterów wywoływanych przez export()"""
+    def __init__(self, exporters:list=None):
+        self.exporters = list(exporters or [])
+        self._endpoints = {}
+        self._lock = Lock()
+
+    def _stats(self, url:str):
+        template = endpoint_template(url)
+        stats = self._endpoints.get(template)
+        if stats is None:
+            stats = self._endpoints.setdefault(template, EndpointStats())
+        return stats
+
+    def instrument(self, session:httpx.Client|httpx.AsyncClient):
+        """Dodaje do sesji haki zdarzeń mierzące opóźnienie i kody statusu każdego zapytania"""
+        if isinstance(session, httpx.AsyncClient):
+            async def on_request(request):
+                self.on_request(request)
+
+            async def on_response(response):
+                self.on_response(response)
+        else:
+            on_request, on_response = self.on_request, self.on_response
+        session.event_hooks['request'].append(on_request)
+        session.event_hooks['response'].append(on_response)
+        return session
+
+    def on_request(self, request:httpx.Request):
+        request.extensions[_START] = time.perf_counter()
+
+    def on_response(self, response:httpx.Response):
+        request = response.request
+        start = request.extensions.get(_START)
+        stats = self._stats(request.url.path)
+        with self._lock:
+            if start is not None:
+                stats.latency.observe(time.perf_counter() - start)
+            stats.statuses[response.status_code] = stats.statuses.get(response.status_code, 0) + 1
+
+    def record_bytes(self, url:str, size:int):
+        stats = self._stats(url)
+        with self._lock:
+            stats.bytes += size
+
+    def record_parse(self, url:str, seconds:float):
+        """Zapisuje czas dekodowania JSON (lub tekstu)"""
+        stats = self._stats(url)
+        with self._lock:
+            stats.parse.observe(seconds)
+
+    def record_model(self, url:str, seconds:float):
+        """Zapisuje czas tworzenia obiektów modelu"""
+        stats = self._stats(url)
+        with self._lock:
+            stats.model.observe(seconds)
+
+    def record_retry(self, url:str):
+        stats = self._stats(url)
+        with self._lock:
+            stats.retries += 1
+
+    def record_error(self, url:str):
+        """Zapisuje błąd połączenia (zapytanie bez odpowiedzi)"""
+        stats = self._stats(url)
+        with self._lock:
+            stats.errors += 1
+
+    def endpoints(self):
+        """Zwraca kopię pomiarów: szablon -> EndpointStats"""
+        with self._lock:
+            result = {}
+            for template, stats in self._endpoints.items():
+                copy = result[template] = EndpointStats()
+                for name in ('latency', 'parse', 'model'):
+                    source, target = getattr(stats, name), getattr(copy, name)
+                    target.counts, target.count, target.sum, target.max = list(source.counts), source.count, source.sum, source.max
+                copy.bytes, copy.statuses = stats.bytes, dict(stats.statuses)
+                copy.retries, copy.errors = stats.retries, stats.errors
+            return result
+
+    def snapshot(self):
+        """Zwraca pomiary jako słownik szablon -> podsumowanie (kwantyle p50/p95/p99 w sekundach)"""
+        return {template: stats.snapshot() for template, stats in sorted(self.endpoints().items())}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def export(self):
+        """Przekazuje bieżące pomiary wszystkim eksporterom"""
+        endpoints = self.endpoints()
+        for exporter in self.exporters:
+            exporter.export(endpoints)
+
+
+class Exporter:
+    """Interfejs eksportera: export otrzymuje słownik szablon -> EndpointStats"""
+    def export(self, endpoints:dict[str, EndpointStats]):
+        raise NotImplementedError
+
+
+class MemoryExporter(Exporter):
+    """Przechowuje ostatnią migawkę pomiarów w polu last"""
+    def __init__(self):
+        self.last = {}
+
+    def export(self, endpoints:dict[str, EndpointStats]):
+        self.last = {template: stats.snapshot() for template, stats in sorted(endpoints.items())}
+
+
+class LoggingExporter(Exporter):
+    """Zapisuje jedną linię logu na endpoint"""
+    def __init__(self, logger:logging.Logger=None, level:int=logging.INFO):
+        self.logger = logger or logging.getLogger('sejmAPI.metrics')
+        self.level = level
+
+    def export(self, endpoints:dict[str, EndpointStats]):
+        for template, stats in sorted(endpoints.items()):
+            latency = stats.latency
+            self.logger.log(self.level, '%s requests=%d p50=%.1fms p95=%.1fms p99=%.1fms bytes=%d parse=%.1fms model=%.1fms '
+                            'statuses=%s retries=%d errors=%d', template, latency.count, latency.quantile(0.5) * 1000,
+                            latency.quantile(0.95) * 1000, latency.quantile(0.99) * 1000, stats.bytes,
+                            stats.parse.sum * 1000, stats.model.sum * 1000, stats.statuses, stats.retries, stats.errors)
+
+
+def _label(value:str):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _histogram_lines(name:str, help_text:str, endpoints:dict, attribute:str):
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    for template, stats in sorted(endpoints.items()):
+        histogram = getattr(stats, attribute)
+        if not histogram.count:
+            continue
+        endpoint, cumulative = _label(template), 0
+        for bound, count in zip(BUCKETS, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="{bound:.6g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="+Inf"}} {histogram.count}')
+        lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {histogram.sum:.9g}')
+        lines.append(f'{name}_count{{endpoint="{endpoint}"}} {histogram.count}')
+    return lines
+
+def _counter_lines(name:str, help_text:str, endpoints:dict, attribute:str):
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+    for template, stats in sorted(endpoints.items()):
+        lines.append(f'{name}{{endpoint="{_label(template)}"}} {getattr(stats, attribute)}')
+    return lines
+
+def prometheus_text(endpoints:dict[str, EndpointStats]):
+    """Zwraca pomiary w formacie tekstowym Prometheusa"""
+    lines = _histogram_lines('sejmapi_request_duration_seconds', 'Czas do otrzymania nagłówków odpowiedzi', endpoints, 'latency')
+    lines += _histogram_lines('sejmapi_parse_duration_seconds', 'Czas dekodowania odpowiedzi', endpoints, 'parse')
+    lines += _histogram_lines('sejmapi_model_duration_seconds', 'Czas tworzenia modeli', endpoints, 'model')
+    lines += _counter_lines('sejmapi_response_bytes_total', 'Pobrane bajty odpowiedzi', endpoints, 'bytes')
+    lines += ['# HELP sejmapi_responses_total Odpowiedzi wg kodu statusu', '# TYPE sejmapi_responses_total counter']
+    for template, stats in sorted(endpoints.items()):
+        for status, count in sorted(stats.statuses.items()):
+            lines.append(f'sejmapi_responses_total{{endpoint="{_label(template)}",status="{status}"}} {count}')
+    lines += _counter_lines('sejmapi_retries_total', 'Ponowione zapytania', endpoints, 'retries')
+    lines += _counter_lines('sejmapi_transport_errors_total', 'Błędy połączenia', endpoints, 'errors')
+    return '\n'.join(lines) + '\n'
+
+
+class PrometheusExporter(Exporter):
+    """Przygotowuje pomiary w formacie tekstowym Prometheusa (pole text). Jeśli podano path, zapisuje je
+    atomowo do pliku, np. dla kolektora textfile w node_exporter"""
+    def __init__(self, path:str=None):
+        self.path = path
+        self.text = ''
+
+    def export(self, endpoints:dict[str, EndpointStats]):
+        self.text = prometheus_text(endpoints)
+        if self.path is not None:
+            tmp = f'{self.path}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(self.text)
+            os.replace(tmp, self.path)
+
+__all__ = ['BUCKETS', 'endpoint_template', 'Histogram', 'EndpointStats', 'Metrics', 'Exporter', 'MemoryExporter',
+           'LoggingExporter', 'PrometheusExporter', 'prometheus_text']
@@ -0,0 +1,52 @@
+"""Pomocnicze generatory stronicujące dla endpointów przyjmujących offset/limit.
+
+Funkcja fetch_page(offset, limit) zwraca krotkę (elementy, total), gdzie total to łączna liczba wyników
+(np. Acts.total_count) lub None, jeśli API jej nie podaje. Wersja asynchroniczna pobiera z wyprzedzeniem
+najwyżej prefetch stron - kolejne zapytania są wysyłane dopiero, gdy odbiorca skonsumuje wcześniejsze strony.
+"""
+from collections import deque
+import asyncio
+
+
+def _total(total):
+    return total if total is not None and total >= 0 else None
+
+def iter_pages(fetch_page, limit:int, offset:int=0):
+    """Zwraca kolejne elementy ze wszystkich stron"""
+    while True:
+        items, total = fetch_page(offset, limit)
+        total = _total(total)
+        yield from items
+        offset += limit
+        if len(items) < limit or (total is not None and offset >= total):
+            return
+
+async def aiter_pages(fetch_page, limit:int, offset:int=0, prefetch:int=4):
+    """Zwraca kolejne elementy ze wszystkich stron, pobierając do prefetch stron równolegle"""
+    items, total = await fetch_page(offset, limit)
+    total = _total(total)
+    for item in items:
+        yield item
+    if len(items) < limit:
+        return
+    next_offset = offset + limit
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < prefetch and (total is None or next_offset < total):
+                pending.append(asyncio.ensure_future(fetch_page(next_offset, limit)))
+                next_offset += limit
+            if not pending:
+                return
+            items, _ = await pending.popleft()
+            for item in items:
+                yield item
+            if len(items) < limit:
+                return
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+__all__ = ['iter_pages', 'aiter_pages']
@@ -0,0 +1,135 @@
+"""Ograniczanie tempa zapytań oraz ponawianie nieudanych zapytań.
+
+RateLimiter utrzymuje osobny kubełek tokenów (TokenBucket) dla każdej części API (/sejm, /eli). Tempo
+kubełka rośnie liniowo po udanych zapytaniach i jest zmniejszane multiplikatywnie po odpowiedziach
+świadczących o przeciążeniu (403, 429, 5xx). RetryPolicy decyduje, czy i po jakim czasie ponowić zapytanie,
+uwzględniając nagłówek Retry-After.
+"""
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from threading import Lock
+import random
+import time
+import httpx
+
+
+class TokenBucket:
+    """Kubełek tokenów o zmiennym tempie (zapytania na sekundę)"""
+    def __init__(self, rate:float=10.0, burst:int=10, min_rate:float=0.5, max_rate:float=50.0,
+                 increase:float=0.1, decrease:float=0.5):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.successes = 0
+        self.throttles = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = Lock()
+
+    def reserve(self):
+        """Pobiera token i zwraca liczbę sekund, które należy odczekać przed wysłaniem zapytania"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def on_success(self):
+        with self._lock:
+            self.successes += 1
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        with self._lock:
+            self.throttles += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+
+    def pause(self, seconds:float):
+        """Wstrzymuje wszystkie zapytania z tego kubełka na podany czas (np. z nagłówka Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+    def stats(self):
+        with self._lock:
+            return {'rate': self.rate, 'successes': self.successes, 'throttles': self.throttles}
+
+
+class RateLimiter:
+    """Zbiór kubełków tokenów, osobny dla każdego hosta i pierwszego segmentu ścieżki (np. /sejm, /eli).
+    Parametr budgets pozwala nadpisać ustawienia kubełka, np. {'/eli': {'rate': 5}}"""
+    def __init__(self, budgets:dict=None, **defaults):
+        self.defaults = defaults
+        self.budgets = budgets or {}
+        self._buckets = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def budget_key(url:httpx.URL):
+        segments = url.path.split('/')
+        return url.host, f'/{segments[1]}' if len(segments) > 1 else '/'
+
+    def bucket(self, url:str|httpx.URL):
+        key = self.budget_key(httpx.URL(url))
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(**{**self.defaults, **self.budgets.get(key[1], {})})
+                self._buckets[key] = bucket
+            return bucket
+
+    def stats(self):
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {f'{host}{prefix}': bucket.stats() for (host, prefix), bucket in buckets.items()}
+
+
+def parse_retry_after(value:str|None):
+    """Zwraca liczbę sekund z nagłówka Retry-After (liczba sekund lub data HTTP)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Ponawia zapytania zakończone błędem sieci lub statusem z retry_statuses, z losowo rozproszonym
+    wykładniczym czasem oczekiwania (full jitter). Nagłówek Retry-After ma pierwszeństwo
+    UWAGA: API zwraca też 403 dla niektórych kombinacji parametrów - takie zapytania zostaną ponowione max_retries razy"""
+    def __init__(self, max_retries:int=3, backoff_base:float=0.5, backoff_max:float=30.0,
+                 retry_statuses:frozenset=frozenset({403, 429, 500, 502, 503, 504})):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self.retries = 0
+
+    def backoff(self, attempt:int):
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def delay(self, attempt:int, res:httpx.Response|None):
+        """Zwraca czas oczekiwania przed kolejną próbą lub None, jeśli zapytania nie należy ponawiać.
+        res równe None oznacza błąd sieci"""
+        if attempt >= self.max_retries:
+            return None
+        if res is not None and res.status_code not in self.retry_statuses:
+            return None
+        self.retries += 1
+        retry_after = parse_retry_after(res.headers.get('retry-after')) if res is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return self.backoff(attempt)
+
+__all__ = ['TokenBucket', 'RateLimiter', 'RetryPolicy', 'parse_retry_after']
@@ -1,12 +1,23 @@
-from . import clubs
-from . import committees
-from . import interpellations
-from . import mp
-from . import prints
-from . import terms
-from . import proceedings
-from . import processes
-from . import videos
-from . import votings
-from . import groups
-from . import questions
\ No newline at end of file
+"""Moduły API Sejmu. Podmoduły są importowane dopiero przy pierwszym odwołaniu (PEP 562),
+np. sejmAPI.sejm.mp wczytuje tylko moduł mp i jego zależności"""
+import importlib
+
+_SUBMODULES = ('clubs', 'committees', 'interpellations', 'mp', 'prints', 'terms', 'proceedings', 'processes', 'videos',
+               'votings', 'groups', 'questions', 'utils', 'images', 'snapshot', 'transcripts', 'votehistory', 'votematrix',
+               'bodies', 'sync')
+
+
+def __getattr__(name:str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    # Bez globals(): po imporcie sejmAPI.eli.globals ta nazwa w przestrzeni pakietu wskazuje na podmoduł
+    return sorted(set(__all__) | set(_SUBMODULES))
+
+# `from sejmAPI.sejm import *` wczytuje tylko podstawowe moduły endpointów. Moduły narzędziowe i do masowego
+# pobierania (images, snapshot, transcripts, votehistory, votematrix, bodies, sync), często z opcjonalnymi
+# zależnościami jak numpy, są dostępne wyłącznie przez atrybut lub jawny import
+__all__ = ['clubs', 'committees', 'interpellations', 'mp', 'prints', 'terms', 'proceedings', 'processes', 'videos',
+           'votings', 'groups', 'questions']
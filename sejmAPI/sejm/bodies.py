@@ -0,0 +1,148 @@
+"""Lokalne archiwum treści interpelacji i zapytań pisemnych oraz odpowiedzi na nie.
+
+BodyStore zapisuje treści HTML (kompresowane zlib) w pliku SQLite, razem z wersją - datą lastModified
+interpelacji/zapytania lub odpowiedzi (Reply.last_modified), z której pochodzi treść. sync_bodies
+i async_sync_bodies przechodzą po wszystkich interpelacjach (lub zapytaniach) kadencji i pobierają tylko treści,
+których wersja różni się od zapisanej, więc kolejne uruchomienia pobierają wyłącznie zmienione treści.
+
+Odpowiedzi oznaczone jako only_attachment nie mają treści HTML i są pomijane.
+"""
+from .interpellations import iter_interpellations, aiter_interpellations, get_interpellation_html, \
+    async_get_interpellation_html, get_interpellation_reply_html, async_get_interpellation_reply_html
+from .questions import iter_written_questions, aiter_written_questions, get_question_html, async_get_question_html, \
+    get_question_reply_html, async_get_question_reply_html
+from ..concurrency import bounded_as_completed
+from datetime import datetime
+from threading import Lock
+import sqlite3
+import zlib
+import httpx
+
+INTERPELLATIONS = 'interpellations'
+QUESTIONS = 'writtenQuestions'
+
+# rodzaj: (iter, aiter, treść, treść odpowiedzi, async treść, async treść odpowiedzi)
+_KINDS = {
+    INTERPELLATIONS: (iter_interpellations, aiter_interpellations, get_interpellation_html, get_interpellation_reply_html,
+                      async_get_interpellation_html, async_get_interpellation_reply_html),
+    QUESTIONS: (iter_written_questions, aiter_written_questions, get_question_html, get_question_reply_html,
+                async_get_question_html, async_get_question_reply_html),
+}
+
+
+def _version(last_modified:datetime|None):
+    return last_modified.isoformat() if last_modified is not None else ''
+
+
+class BodyStore:
+    """Treści HTML interpelacji, zapytań i odpowiedzi w pliku SQLite. Treść główna ma pusty klucz key,
+    a treść odpowiedzi klucz Reply.key"""
+    def __init__(self, path:str):
+        self.path = path
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self._conn:
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS bodies (
+                kind TEXT, term INTEGER, num INTEGER, key TEXT, version TEXT NOT NULL, data BLOB NOT NULL,
+                PRIMARY KEY (kind, term, num, key))''')
+
+    def put(self, kind:str, term:int, num:int, key:str, version:str, html:str):
+        data = zlib.compress(html.encode('utf-8'))
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO bodies VALUES (?, ?, ?, ?, ?, ?)', (kind, term, num, key, version, data))
+
+    def get(self, kind:str, term:int, num:int, key:str=''):
+        """Zwraca zapisaną treść HTML lub None"""
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM bodies WHERE kind = ? AND term = ? AND num = ? AND key = ?',
+                                     (kind, term, num, key)).fetchone()
+        return zlib.decompress(row[0]).decode('utf-8') if row else None
+
+    def versions(self, kind:str, term:int):
+        """Zwraca słownik (num, key) -> wersja dla wszystkich zapisanych treści kadencji"""
+        with self._lock:
+            rows = self._conn.execute('SELECT num, key, version FROM bodies WHERE kind = ? AND term = ?', (kind, term))
+            return {(num, key): version for num, key, version in rows}
+
+    def count(self, kind:str=None):
+        with self._lock:
+            if kind is None:
+                return self._conn.execute('SELECT COUNT(*) FROM bodies').fetchone()[0]
+            return self._conn.execute('SELECT COUNT(*) FROM bodies WHERE kind = ?', (kind,)).fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+
+class BodySyncResult:
+    __slots__ = ('items', 'fetched', 'skipped', 'failed')
+
+    def __init__(self):
+        self.items = 0
+        self.fetched = 0
+        self.skipped = 0
+        self.failed = []
+
+    def __str__(self):
+        return f'BodySyncResult(items={self.items}, fetched={self.fetched}, skipped={self.skipped}, failed={len(self.failed)})'
+
+
+def _candidates(item):
+    """Zwraca trójki (num, key, wersja) wszystkich treści pozycji: głównej i odpowiedzi z treścią HTML"""
+    candidates = [(item.num, '', _version(item.last_modified))]
+    candidates += [(item.num, reply.key, _version(reply.last_modified)) for reply in item.replies
+                   if not reply.only_attachment and reply.key]
+    return candidates
+
+def _jobs(items, versions:dict, result:BodySyncResult):
+    """Zwraca trójki (num, key, wersja) treści do pobrania. Treści bez daty modyfikacji są pobierane zawsze"""
+    for item in items:
+        result.items += 1
+        for num, key, version in _candidates(item):
+            if version and versions.get((num, key)) == version:
+                result.skipped += 1
+            else:
+                yield num, key, version
+
+def sync_bodies(session:httpx.Client, store:BodyStore, term:int, kind:str=INTERPELLATIONS, items:list=None):
+    """Pobiera zmienione treści interpelacji (kind=INTERPELLATIONS) lub zapytań (kind=QUESTIONS) i ich odpowiedzi.
+    Domyślnie sprawdzane są wszystkie pozycje kadencji, a items pozwala podać własną listę"""
+    iter_items, _, body, reply_body, _, _ = _KINDS[kind]
+    items = items if items is not None else iter_items(session, term)
+    result = BodySyncResult()
+    for num, key, version in _jobs(items, store.versions(kind, term), result):
+        try:
+            html = reply_body(session, term, num, key) if key else body(session, term, num)
+        except httpx.HTTPError:
+            result.failed.append((num, key))
+            continue
+        store.put(kind, term, num, key, version, html)
+        result.fetched += 1
+    return result
+
+async def async_sync_bodies(session:httpx.AsyncClient, store:BodyStore, term:int, kind:str=INTERPELLATIONS, items:list=None,
+                            concurrency:int=8):
+    """Pobiera zmienione treści, najwyżej concurrency naraz. Parametry jak w sync_bodies"""
+    _, aiter_items, _, _, body, reply_body = _KINDS[kind]
+    if items is None:
+        items = [item async for item in aiter_items(session, term)]
+    result = BodySyncResult()
+
+    async def fetch(num, key, version):
+        try:
+            html = await (reply_body(session, term, num, key) if key else body(session, term, num))
+        except httpx.HTTPError:
+            return num, key, version, None
+        return num, key, version, html
+    jobs = _jobs(items, store.versions(kind, term), result)
+    async for num, key, version, html in bounded_as_completed((fetch(*job) for job in jobs), concurrency):
+        if html is None:
+            result.failed.append((num, key))
+        else:
+            store.put(kind, term, num, key, version, html)
+            result.fetched += 1
+    return result
+
+__all__ = ['INTERPELLATIONS', 'QUESTIONS', 'BodyStore', 'BodySyncResult', 'sync_bodies', 'async_sync_bodies']
@@ -1,7 +1,10 @@
 from .utils import BASE_URL
+from ..transport import get_json, async_get_json, get_bytes, async_get_bytes, download, async_download
 import httpx
 
 class Club:
+    __slots__ = ('email', 'fax', 'id', 'members_count', 'name', 'phone')
+
     def __init__(self, raw: dict):
         self.email = raw.get('email', '')
         self.fax = raw.get('fax', '')
@@ -22,38 +25,34 @@ class Club:
 
 def get_clubs(session:httpx.Client, term:int):
     """Pobierz informacje o klubach"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/clubs')
-    res.raise_for_status()
-    return list(map(lambda d:Club(d), res.json()))
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/clubs', Club, many=True)
 
 def get_club(session:httpx.Client, term:int, id:str):
     """Pobierz informacje o klubie"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/clubs/{id}')
-    res.raise_for_status()
-    return Club(res.json())
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/clubs/{id}', Club)
 
 def get_logo(session:httpx.Client, uri:str):
     """Zdjęcie powinno być pobrane w rozszerzeniu .jfif"""
-    res = session.get(uri)
-    res.raise_for_status()
-    return res.content
+    return get_bytes(session, uri)
 
 async def async_get_clubs(session:httpx.AsyncClient, term:int):
     """Pobierz informacje o klubach"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/clubs')
-    res.raise_for_status()
-    return list(map(lambda d:Club(d), res.json()))
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/clubs', Club, many=True)
 
 async def async_get_club(session:httpx.AsyncClient, term:int, id:str):
     """Pobierz informacje o klubie"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/clubs/{id}')
-    res.raise_for_status()
-    return Club(res.json())
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/clubs/{id}', Club)
 
 async def async_get_logo(session:httpx.AsyncClient, uri:str):
     """Zdjęcie powinno być pobrane w rozszerzeniu .jfif"""
-    res = await session.get(uri)
-    res.raise_for_status()
-    return res.content
+    return await async_get_bytes(session, uri)
+
+def download_logo(session:httpx.Client, uri:str, dest, **options):
+    """Pobierz logo strumieniowo do pliku lub obiektu plikowego (rozszerzenie .jfif). Opcje (chunk_size, expected_size, sha256, resume) jak w transport.download"""
+    return download(session, uri, dest, **options)
+
+async def async_download_logo(session:httpx.AsyncClient, uri:str, dest, **options):
+    """Pobierz logo strumieniowo do pliku lub obiektu plikowego (rozszerzenie .jfif). Opcje (chunk_size, expected_size, sha256, resume) jak w transport.download"""
+    return await async_download(session, uri, dest, **options)
 
-__all__ = ['Club', 'get_clubs', 'get_club', 'get_logo', 'async_get_club', 'async_get_clubs', 'async_get_logo']
+__all__ = ['Club', 'get_clubs', 'get_club', 'get_logo', 'async_get_club', 'async_get_clubs', 'async_get_logo', 'download_logo', 'async_download_logo']
@@ -1,8 +1,11 @@
-from .utils import BASE_URL, parse_normal_date
+from .utils import BASE_URL, LazyDate
+from ..transport import get_json, async_get_json, get_text, async_get_text, get_bytes, async_get_bytes, download, async_download
 from enum import StrEnum
 import httpx
 
 class Member:
+    __slots__ = ('club', 'function', 'id', 'last_first_name')
+
     def __init__(self, raw: dict):
         self.club = raw.get('club', '')
         self.function = raw.get('function', '')  # Niektórzy członkowie mogą nie mieć funkcji
@@ -22,10 +25,15 @@ class Committee:
         extraordinary = 'EXTRAORDINARY'
         investigative = 'INVESTIGATIVE '
 
+    __slots__ = ('_appointment_date', 'code', '_composition_date', 'members', 'name', 'name_genitive', 'phone',
+                 'scope', 'type')
+    appointment_date = LazyDate()
+    composition_date = LazyDate()
+
     def __init__(self, raw: dict):
-        self.appointment_date = parse_normal_date(raw.get('appointmentDate', ''), '%Y-%m-%d')
+        self.appointment_date = raw.get('appointmentDate', '')
         self.code = raw.get('code', '')
-        self.composition_date = parse_normal_date(raw.get('compositionDate', ''), '%Y-%m-%d')
+        self.composition_date = raw.get('compositionDate', '')
         self.members = [Member(member_data) for member_data in raw.get('members')]
         self.name = raw.get('name')
         self.name_genitive = raw.get('nameGenitive')
@@ -45,10 +53,13 @@ class Committee:
 
 
 class Sitting:
+    __slots__ = ('agenda', 'closed', '_date', 'joint_with', 'num', 'remote', 'video', 'audio', 'city')
+    date = LazyDate()
+
     def __init__(self, raw: dict):
         self.agenda = raw.get('agenda', '').encode('utf-8').decode('unicode_escape')
         self.closed = raw.get('closed', False)
-        self.date = parse_normal_date(raw.get('date', ''), '%Y-%m-%d')
+        self.date = raw.get('date', '')
         self.joint_with = raw.get('jointWith', [])
         self.num = raw.get('num', -1)
         self.remote = raw.get('remote', False)
@@ -64,67 +75,58 @@ class Sitting:
 
 def get_committees(session:httpx.Client, term:int):
     """Zwraca listę komitetów"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/committees')
-    res.raise_for_status()
-    return list(map(lambda d:Committee(d), res.json()))
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/committees', Committee, many=True)
 
 def get_committee(session:httpx.Client, term:int, code:str):
     """Zwraca szczegóły komitetu"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/committees/{code}')
-    res.raise_for_status()
-    return Committee(res.json())
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/committees/{code}', Committee)
 
 def get_sittings(session:httpx.Client, uri:str):
     """Zwraca listę posiedzeń"""
-    res = session.get(uri)
-    res.raise_for_status()
-    return list(map(lambda d:Sitting(d), res.json()))
+    return get_json(session, uri, Sitting, many=True)
 
 def get_sitting(session:httpx.Client, uri:str):
     """Zwraca szczegóły posiedzenia"""
-    res = session.get(uri)
-    res.raise_for_status()
-    return Sitting(res.json())
+    return get_json(session, uri, Sitting)
 
 def get_sitting_transcript(session:httpx.Client, term:int, code:str, num:int, format:str):
     """Zwraca transkrypt dla danego posiedzenia w wybranym formacie: pdf lub html"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/committees/{code}/sittings/{num}/{format}')
-    res.raise_for_status()
+    url = f'{BASE_URL}/sejm/term{term}/committees/{code}/sittings/{num}/{format}'
     if format == 'html':
-        return res.text
-    return res.content
+        return get_text(session, url)
+    return get_bytes(session, url)
 
 async def async_get_committees(session:httpx.AsyncClient, term:int):
     """Zwraca listę komitetów"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/committees')
-    res.raise_for_status()
-    return [Committee(d) for d in res.json()]
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/committees', Committee, many=True)
 
 async def async_get_committee(session:httpx.AsyncClient, term:int, code:str):
     """Zwraca szczegóły komitetu"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/committees/{code}')
-    res.raise_for_status()
-    return Committee(res.json())
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/committees/{code}', Committee)
 
 async def async_get_sittings(session:httpx.AsyncClient, uri:str):
     """Zwraca listę posiedzeń"""
-    res = await session.get(uri)
-    res.raise_for_status()
-    return [Sitting(d) for d in res.json()]
+    return await async_get_json(session, uri, Sitting, many=True)
 
 async def async_get_sitting(session:httpx.AsyncClient, uri:str):
     """Zwraca szczegóły posiedzenia"""
-    res = await session.get(uri)
-    res.raise_for_status()
-    return Sitting(res.json())
+    return await async_get_json(session, uri, Sitting)
 
 async def async_get_sitting_transcript(session:httpx.AsyncClient, term:int, code:str, num:int, format:str):
     """Zwraca transkrypt dla danego posiedzenia w wybranym formacie: pdf lub html"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/committees/{code}/sittings/{num}/{format}')
-    res.raise_for_status()
+    url = f'{BASE_URL}/sejm/term{term}/committees/{code}/sittings/{num}/{format}'
     if format == 'html':
-        return res.text
-    return res.content
+        return await async_get_text(session, url)
+    return await async_get_bytes(session, url)
+
+def download_sitting_transcript(session:httpx.Client, term:int, code:str, num:int, dest, format:str='pdf', **options):
+    """Pobierz transkrypt posiedzenia strumieniowo do pliku lub obiektu plikowego. Opcje (chunk_size, expected_size, sha256, resume) jak w transport.download"""
+    return download(session, f'{BASE_URL}/sejm/term{term}/committees/{code}/sittings/{num}/{format}', dest, **options)
+
+async def async_download_sitting_transcript(session:httpx.AsyncClient, term:int, code:str, num:int, dest, format:str='pdf', **options):
+    """Pobierz transkrypt posiedzenia strumieniowo do pliku lub obiektu plikowego. Opcje (chunk_size, expected_size, sha256, resume) jak w transport.download"""
+    return await async_download(session, f'{BASE_URL}/sejm/term{term}/committees/{code}/sittings/{num}/{format}', dest, **options)
 
 __all__ = ['Member', 'Committee', 'Sitting', 'get_committees', 'get_committee', 'get_sittings', 'get_sitting',
-           'async_get_sitting', 'async_get_sittings', 'async_get_committee', 'async_get_committees', 'get_sitting_transcript', 'async_get_sitting_transcript']
\ No newline at end of file
+           'async_get_sitting', 'async_get_sittings', 'async_get_committee', 'async_get_committees', 'get_sitting_transcript', 'async_get_sitting_transcript',
+           'download_sitting_transcript', 'async_download_sitting_transcript']
\ No newline at end of file
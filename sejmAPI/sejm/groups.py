@@ -1,13 +1,17 @@
-from .utils import BASE_URL, parse_normal_date
+from .utils import BASE_URL, LazyDate
+from ..transport import get_json, async_get_json
 from enum import StrEnum
 import httpx
 
 class Group:
+    __slots__ = ('id', 'name', 'eng_name', '_appointment_date')
+    appointment_date = LazyDate()
+
     def __init__(self, raw:dict):
         self.id = raw.get('id', '')
         self.name = raw.get('name', '')
         self.eng_name = raw.get('engName', '')
-        self.appointment_date = parse_normal_date(raw.get('appointmentDate'), '%Y-%m-%d')
+        self.appointment_date = raw.get('appointmentDate')
 
     def __str__(self):
         return f'Group(id={self.id}, name={self.name})'
@@ -23,15 +27,20 @@ class GroupMember:
         secretary = 'secretary'
         member = 'member'
 
+    __slots__ = ('id', 'name', 'club', 'senator', 'type', '_membership_start', '_membership_end', '_mandate_end')
+    membership_start = LazyDate()
+    membership_end = LazyDate()
+    mandate_end = LazyDate()
+
     def __init__(self, raw:dict):
         self.id = raw.get('id', -1)
         self.name = raw.get('name', '')
         self.club = raw.get('club', '')
         self.senator = raw.get('senator', False)
         self.type = GroupMember.ChairManEnum(raw.get('type'))
-        self.membership_start = parse_normal_date(raw.get('membershipStart', ''), '%Y-%m-%d')
-        self.membership_end = parse_normal_date(raw.get('membershipEnd', ''), '%Y-%m-%d')
-        self.mandate_end = parse_normal_date(raw.get('mandateEnd', ''), '%Y-%m-%d')
+        self.membership_start = raw.get('membershipStart', '')
+        self.membership_end = raw.get('membershipEnd', '')
+        self.mandate_end = raw.get('mandateEnd', '')
 
     def __str__(self):
         return f'GroupMember(id={self.id}, name={self.name}, club={self.club})'
@@ -40,37 +49,32 @@ class GroupMember:
         return f'GroupMember(id={self.id}, name={self.name}, club={self.club})'
 
 class GroupDetails:
+    __slots__ = ('id', 'name', 'eng_name', '_appointment_date', 'remarks', 'members')
+    appointment_date = LazyDate()
+
     def __init__(self, raw:dict):
         self.id = raw.get('id', '')
         self.name = raw.get('name', '')
         self.eng_name = raw.get('engName', '')
-        self.appointment_date = parse_normal_date(raw.get('appointmentDate', ''), '%Y-%m-%d')
+        self.appointment_date = raw.get('appointmentDate', '')
         self.remarks = raw.get('remarks', '')
         self.members = [GroupMember(e) for e in raw.get('members', [])]
 
 
 def get_bilateral_groups(session:httpx.Client, term:int):
     """Zwróć grupy dwustronne"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/bilateralGroups')
-    res.raise_for_status()
-    return [Group(e) for e in res.json()]
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/bilateralGroups', Group, many=True)
 
 def get_bilateral_group(session:httpx.Client, term:int, id:int):
     """Zwróć informacje na temat grupy dwustronnej"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/bilateralGroups/{id}')
-    res.raise_for_status()
-    return GroupDetails(res.json())
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/bilateralGroups/{id}', GroupDetails)
 
 async def async_get_bilateral_groups(session:httpx.AsyncClient, term:int):
     """Zwróć grupy dwustronne"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/bilateralGroups')
-    res.raise_for_status()
-    return [Group(e) for e in res.json()]
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/bilateralGroups', Group, many=True)
 
 async def async_get_bilateral_group(session:httpx.AsyncClient, term:int, id:int):
     """Zwróć informacje na temat grupy dwustronnej"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/bilateralGroups/{id}')
-    res.raise_for_status()
-    return GroupDetails(res.json())
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/bilateralGroups/{id}', GroupDetails)
 
 __all__ = ['Group', 'GroupMember', 'GroupDetails', 'get_bilateral_group', 'get_bilateral_groups', 'async_get_bilateral_group', 'async_get_bilateral_groups']
\ No newline at end of file
@@ -0,0 +1,230 @@
+"""Lokalny magazyn zdjęć posłów i logotypów klubów adresowany treścią.
+
+Pliki są zapisywane pod nazwą równą skrótowi SHA-256 treści (objects/ab/abcdef...), więc to samo zdjęcie posła
+z kilku kadencji zajmuje miejsce tylko raz. Indeks w pliku SQLite wiąże trójkę (kadencja, rodzaj, id) ze skrótem
+treści i walidatorami (ETag / Last-Modified). Wpis starszy niż max_age jest sprawdzany zapytaniem warunkowym,
+a odpowiedź 304 nie pobiera pliku ponownie. Miniatury w rozmiarach sizes są generowane przy zapisie nowej treści
+(wymaga pakietu Pillow), również z kluczem będącym skrótem treści.
+
+sync_term_images pobiera z wyprzedzeniem wszystkie zdjęcia i logotypy kadencji, a path/read odczytują je
+wyłącznie z dysku, bez kontaktu z API:
+
+    store = ImageStore('images')
+    await async_sync_term_images(session, store, 10)
+    store.path(10, PHOTO, 1, size=(100, 125))
+"""
+from .utils import BASE_URL
+from .mp import get_mps, async_get_mps
+from .clubs import get_clubs, async_get_clubs
+from ..transport import get_response, async_get_response
+from ..concurrency import gather_bounded
+from threading import Lock
+from io import BytesIO
+import asyncio
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+import httpx
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover
+    Image = None
+
+# Błędy Pillow dla treści, której nie da się odczytać lub która jest zbyt duża (DecompressionBombError)
+_IMAGE_ERRORS = (OSError, ValueError) + ((Image.DecompressionBombError,) if Image is not None else ())
+
+PHOTO = 'photo'
+PHOTO_MINI = 'photo-mini'
+LOGO = 'logo'
+KINDS = (PHOTO, PHOTO_MINI, LOGO)
+
+DEFAULT_SIZES = ((64, 80), (200, 250))
+
+
+def image_url(term:int, kind:str, id:int|str):
+    """Adres obrazu w API (odpowiednik Mp.build_photo_uri, Mp.build_mini_photo_uri i Club.build_logo_uri)"""
+    if kind == LOGO:
+        return f'{BASE_URL}/sejm/term{term}/clubs/{id}/logo'
+    if kind in (PHOTO, PHOTO_MINI):
+        return f'{BASE_URL}/sejm/term{term}/MP/{id}/{kind}'
+    raise ValueError(f'Nieznany rodzaj obrazu: {kind}')
+
+
+class ImageEntry:
+    __slots__ = ('term', 'kind', 'id', 'sha256', 'etag', 'last_modified', 'checked')
+
+    def __init__(self, term:int, kind:str, id:str, sha256:str, etag:str, last_modified:str, checked:float):
+        self.term = term
+        self.kind = kind
+        self.id = id
+        self.sha256 = sha256
+        self.etag = etag
+        self.last_modified = last_modified
+        self.checked = checked
+
+    def __str__(self):
+        return f'ImageEntry(term={self.term}, kind={self.kind}, id={self.id}, sha256={self.sha256[:12]})'
+
+
+class ImageStore:
+    """Magazyn obrazów w katalogu root: pliki objects/ adresowane treścią oraz indeks index.db"""
+    def __init__(self, root:str, sizes:tuple[tuple[int, int]]=DEFAULT_SIZES, max_age:float=24 * 60 * 60):
+        self.root = root
+        self.sizes = tuple(tuple(size) for size in sizes)
+        self.max_age = max_age
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(os.path.join(root, 'index.db'), timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS images (
+                term INTEGER, kind TEXT, id TEXT, sha256 TEXT NOT NULL, etag TEXT, last_modified TEXT, checked REAL,
+                PRIMARY KEY (term, kind, id))''')
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS thumbnails (
+                sha256 TEXT, width INTEGER, height INTEGER, thumb TEXT NOT NULL, PRIMARY KEY (sha256, width, height))''')
+
+    def _object_path(self, sha256:str):
+        return os.path.join(self.root, 'objects', sha256[:2], sha256)
+
+    def _write_object(self, content:bytes):
+        sha256 = hashlib.sha256(content).hexdigest()
+        path = self._object_path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp, path)
+        return sha256
+
+    def get(self, term:int, kind:str, id:int|str):
+        """Zwraca wpis indeksu (bez kontaktu z API) lub None"""
+        with self._lock:
+            row = self._conn.execute('SELECT sha256, etag, last_modified, checked FROM images WHERE term = ? AND kind = ? AND id = ?',
+                                     (term, kind, str(id))).fetchone()
+        return ImageEntry(term, kind, str(id), *row) if row else None
+
+    def path(self, term:int, kind:str, id:int|str, size:tuple[int, int]=None):
+        """Zwraca ścieżkę pliku obrazu lub jego miniatury (bez kontaktu z API) albo None, jeśli go nie ma"""
+        entry = self.get(term, kind, id)
+        if entry is None:
+            return None
+        if size is None:
+            return self._object_path(entry.sha256)
+        with self._lock:
+            row = self._conn.execute('SELECT thumb FROM thumbnails WHERE sha256 = ? AND width = ? AND height = ?',
+                                     (entry.sha256, *size)).fetchone()
+        return self._object_path(row[0]) if row else None
+
+    def read(self, term:int, kind:str, id:int|str, size:tuple[int, int]=None):
+        """Zwraca treść obrazu lub miniatury z dysku albo None"""
+        path = self.path(term, kind, id, size)
+        if path is None:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _thumbnails(self, sha256:str, content:bytes):
+        if Image is None or not self.sizes:
+            return
+        with self._lock:
+            done = {(w, h) for w, h in self._conn.execute('SELECT width, height FROM thumbnails WHERE sha256 = ?', (sha256,))}
+        for size in self.sizes:
+            if size in done:
+                continue
+            try:
+                with Image.open(BytesIO(content)) as image:
+                    image = image.convert('RGB')
+                    image.thumbnail(size)
+                    buffer = BytesIO()
+                    image.save(buffer, 'JPEG', quality=85)
+            except _IMAGE_ERRORS:
+                # Treść, której Pillow nie potrafi odczytać, jest przechowywana bez miniatur
+                return
+            thumb = self._write_object(buffer.getvalue())
+            with self._lock, self._conn:
+                self._conn.execute('INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?, ?)', (sha256, *size, thumb))
+
+    def _needs_check(self, entry:ImageEntry|None, force:bool):
+        return force or entry is None or entry.checked is None or time.time() - entry.checked >= self.max_age
+
+    @staticmethod
+    def _headers(entry:ImageEntry|None):
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def _update(self, term:int, kind:str, id:str, entry:ImageEntry|None, res:httpx.Response):
+        if res.status_code == 304 and entry is not None:
+            sha256 = entry.sha256
+        else:
+            res.raise_for_status()
+            sha256 = self._write_object(res.content)
+            self._thumbnails(sha256, res.content)
+        etag, last_modified = res.headers.get('etag'), res.headers.get('last-modified')
+        if res.status_code == 304:
+            etag, last_modified = etag or entry.etag, last_modified or entry.last_modified
+        checked = time.time()
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?, ?, ?)',
+                               (term, kind, id, sha256, etag, last_modified, checked))
+        return ImageEntry(term, kind, id, sha256, etag, last_modified, checked)
+
+    def fetch(self, session:httpx.Client, term:int, kind:str, id:int|str, force:bool=False):
+        """Zwraca wpis obrazu, pobierając go lub sprawdzając zapytaniem warunkowym, jeśli jest starszy niż max_age"""
+        entry = self.get(term, kind, id)
+        if not self._needs_check(entry, force):
+            return entry
+        res = get_response(session, image_url(term, kind, id), headers=self._headers(entry))
+        return self._update(term, kind, str(id), entry, res)
+
+    async def async_fetch(self, session:httpx.AsyncClient, term:int, kind:str, id:int|str, force:bool=False):
+        """Zwraca wpis obrazu, pobierając go lub sprawdzając zapytaniem warunkowym, jeśli jest starszy niż max_age.
+        Zapis pliku, miniatury i indeksu są wykonywane w osobnym wątku, aby nie blokować pętli zdarzeń"""
+        entry = self.get(term, kind, id)
+        if not self._needs_check(entry, force):
+            return entry
+        res = await async_get_response(session, image_url(term, kind, id), headers=self._headers(entry))
+        return await asyncio.to_thread(self._update, term, kind, str(id), entry, res)
+
+    def close(self):
+        self._conn.close()
+
+
+def _jobs(term:int, mps, clubs, minis:bool):
+    kinds = (PHOTO, PHOTO_MINI) if minis else (PHOTO,)
+    return [(term, kind, mp.id) for mp in mps for kind in kinds] + [(term, LOGO, club.id) for club in clubs]
+
+def sync_term_images(session:httpx.Client, store:ImageStore, term:int, minis:bool=True, force:bool=False):
+    """Pobiera lub sprawdza zdjęcia wszystkich posłów i logotypy klubów kadencji.
+    Zwraca listę (rodzaj, id) obrazów, których nie udało się pobrać"""
+    failed = []
+    for job in _jobs(term, get_mps(session, term), get_clubs(session, term), minis):
+        try:
+            store.fetch(session, *job, force=force)
+        except httpx.HTTPError:
+            failed.append(job[1:])
+    return failed
+
+async def async_sync_term_images(session:httpx.AsyncClient, store:ImageStore, term:int, minis:bool=True, force:bool=False,
+                                 concurrency:int=8):
+    """Pobiera lub sprawdza zdjęcia wszystkich posłów i logotypy klubów kadencji, najwyżej concurrency naraz.
+    Zwraca listę (rodzaj, id) obrazów, których nie udało się pobrać"""
+    jobs = _jobs(term, await async_get_mps(session, term), await async_get_clubs(session, term), minis)
+
+    async def fetch(job):
+        try:
+            await store.async_fetch(session, *job, force=force)
+        except httpx.HTTPError:
+            return job[1:]
+    return [job for job in await gather_bounded((fetch(job) for job in jobs), concurrency) if job is not None]
+
+__all__ = ['PHOTO', 'PHOTO_MINI', 'LOGO', 'KINDS', 'DEFAULT_SIZES', 'image_url', 'ImageEntry', 'ImageStore',
+           'sync_term_images', 'async_sync_term_images']
@@ -1,6 +1,8 @@
 """Moduł oparty o: https://api.sejm.gov.pl/interpellations.html"""
 
-from .utils import BASE_URL, filter_query_params, parse_normal_date, parse_iso_format
+from .utils import BASE_URL, filter_query_params, LazyDate, LazyDateTime
+from ..transport import get_json, async_get_json, get_text, async_get_text
+from ..pagination import iter_pages, aiter_pages
 from datetime import date, datetime
 from urllib.parse import urlencode
 from enum import StrEnum
@@ -8,11 +10,13 @@ import httpx
 
 class InterpellationsSortFields(StrEnum):
     NUM = 'num'
-    LAST_MODIFIED = 'lastModified '
-    RECEIPT_DATE = 'receiptDate '
-    SENT_DATE = 'sentDate '
+    LAST_MODIFIED = 'lastModified'
+    RECEIPT_DATE = 'receiptDate'
+    SENT_DATE = 'sentDate'
 
 class Link:
+    __slots__ = ('href', 'rel')
+
     def __init__(self, raw: dict):
         self.href = raw.get('href', '')  # Zmieniamy na 'href' zamiast 'url'
         self.rel = raw.get('rel', '')    # Zmieniamy na 'rel', zgodnie z danymi
@@ -21,38 +25,51 @@ class Link:
         return f"Link(href='{self.href}', rel='{self.rel}')"
 
 class Attachment:
+    __slots__ = ('url', 'name', '_last_modified')
+    last_modified = LazyDateTime()
+
     def __init__(self, raw: dict):
         self.url = raw.get('URL', '')  # Adres załącznika do pobrania
         self.name = raw.get('name', '')  # Nazwa pliku
-        self.last_modified = parse_iso_format(raw.get('lastModified', ''))
+        self.last_modified = raw.get('lastModified', '')
 
     def __str__(self):
         return f'Attachment(url={self.url}, name={self.name})'
 
 class Reply:
+    __slots__ = ('key', 'from_', 'links', '_receipt_date', 'only_attachment', 'attachments', '_last_modified')
+    receipt_date = LazyDate()
+    last_modified = LazyDateTime()
+
     def __init__(self, raw: dict):
         self.key = raw.get('key', '')  # Unikalny identyfikator odpowiedzi
         self.from_ = raw.get('from', '')  # Stanowisko i nazwisko osoby odpowiadającej
         self.links = [Link(link) for link in raw.get('links', [])]  # Lista URLi do treści odpowiedzi
-        self.receipt_date = parse_normal_date(raw.get('receiptDate', ''), '%Y-%m-%d')
+        self.receipt_date = raw.get('receiptDate', '')
         self.only_attachment = raw.get('onlyAttachment', False)  # Flaga, czy odpowiedź to tylko załącznik
         self.attachments = [Attachment(att) for att in raw.get('attachments', [])]  # Lista załączników
-        self.last_modified = parse_iso_format(raw.get('lastModified', ''))
+        self.last_modified = raw.get('lastModified', '')
 
     def __str__(self):
         return f'Reply(from={self.from_})'
 
 class Interpellation:
+    __slots__ = ('term', 'num', 'title', 'from_', 'to', '_receipt_date', '_sent_date', 'replies', '_last_modified',
+                 'links')
+    receipt_date = LazyDate()
+    sent_date = LazyDate()
+    last_modified = LazyDateTime()
+
     def __init__(self, raw: dict):
         self.term = raw.get('term', 0)
         self.num = raw.get('num', 0)
         self.title = raw.get('title', '')
         self.from_ = raw.get('from', [])  # "from" to słowo kluczowe, więc zmieniamy na "from_"
         self.to = raw.get('to', [])
-        self.receipt_date = parse_normal_date(raw.get('receiptDate', ''), '%Y-%m-%d')
-        self.sent_date = parse_normal_date(raw.get('sentDate', ''), '%Y-%m-%d')
+        self.receipt_date = raw.get('receiptDate', '')
+        self.sent_date = raw.get('sentDate', '')
         self.replies = [Reply(reply) for reply in raw.get('replies', [])]
-        self.last_modified = parse_iso_format(raw.get('lastModified', ''))
+        self.last_modified = raw.get('lastModified', '')
         self.links = [Link(link) for link in raw.get('links', [])]
 
     def __str__(self):
@@ -65,13 +82,10 @@ def get_interpellations(session:httpx.Client, term:int, offset:int=None, limit:i
         True:'-',
         False:''
     }
-    params = {}
+    params = filter_query_params(offset=offset, limit=limit, title=title, from_mp=from_mp, to=to, since=since, till=till, modifiedSince=modifiedSince.strftime('%Y-%m-%dT%H:%M') if modifiedSince else None)
     if sort_by != '':
         params['sort_by'] = f'{DESCENDING_MAP[descending]}{sort_by}'
-    params = filter_query_params(offset=offset, limit=limit, title=title, from_mp=from_mp, to=to, since=since, till=till, modifiedSince=modifiedSince.strftime('%Y-%m-%dT%H:%M'))
-    res = session.get(f'{BASE_URL}/sejm/term{term}/interpellations?' + urlencode(params, safe=':'))
-    res.raise_for_status()
-    return list(map(lambda d:Interpellation(d), res.json()))
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/interpellations?' + urlencode(params, safe=':'), Interpellation, many=True)
 
 
 async def async_get_interpellations(session: httpx.AsyncClient, term: int, offset: int = None, limit: int = 25,
@@ -83,9 +97,6 @@ async def async_get_interpellations(session: httpx.AsyncClient, term: int, offse
         True: '-',
         False: ''
     }
-    params = {}
-    if sort_by != '':
-        params['sort_by'] = f'{DESCENDING_MAP[descending]}{sort_by}'
     params = filter_query_params(
         offset=offset,
         limit=limit,
@@ -96,46 +107,49 @@ async def async_get_interpellations(session: httpx.AsyncClient, term: int, offse
         till=till,
         modifiedSince=modifiedSince.strftime('%Y-%m-%dT%H:%M') if modifiedSince else None
     )
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/interpellations?' + urlencode(params, safe=':'))
-    res.raise_for_status()
-    return list(map(lambda d: Interpellation(d), res.json()))
+    if sort_by != '':
+        params['sort_by'] = f'{DESCENDING_MAP[descending]}{sort_by}'
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/interpellations?' + urlencode(params, safe=':'), Interpellation, many=True)
+
+def iter_interpellations(session:httpx.Client, term:int, page_size:int=50, **filters):
+    """Zwraca kolejno wszystkie interpelacje, pobierając je stronami.
+    Parametry filters odpowiadają parametrom get_interpellations (bez offset i limit)"""
+    def fetch_page(offset, limit):
+        return get_interpellations(session, term, offset=offset, limit=limit, **filters), None
+    return iter_pages(fetch_page, page_size)
+
+def aiter_interpellations(session:httpx.AsyncClient, term:int, page_size:int=50, prefetch:int=4, **filters):
+    """Asynchronicznie zwraca wszystkie interpelacje, pobierając do prefetch stron naraz.
+    Parametry filters odpowiadają parametrom get_interpellations (bez offset i limit)"""
+    async def fetch_page(offset, limit):
+        return await async_get_interpellations(session, term, offset=offset, limit=limit, **filters), None
+    return aiter_pages(fetch_page, page_size, prefetch=prefetch)
 
 def get_interpellation(session:httpx.Client, term:int, num:str):
     """Zwraca szczegóły interpelacji"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/interpellations/{num}')
-    res.raise_for_status()
-    return  Interpellation(res.json())
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/interpellations/{num}', Interpellation)
 
 async def async_get_interpellation(session:httpx.AsyncClient, term:int, num:str):
     """Zwraca szczegóły interpelacji"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/interpellations/{num}')
-    res.raise_for_status()
-    return  Interpellation(res.json())
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/interpellations/{num}', Interpellation)
 
 def get_interpellation_html(session:httpx.Client, term:int, num:str):
     """Zwraca szczegóły interpelacji w formie html"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/interpellations/{num}/body')
-    res.raise_for_status()
-    return res.text
+    return get_text(session, f'{BASE_URL}/sejm/term{term}/interpellations/{num}/body')
 
 async def async_get_interpellation_html(session:httpx.AsyncClient, term:int, num:str):
     """Zwraca szczegóły interpelacji w formie html"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/interpellations/{num}/body')
-    res.raise_for_status()
-    return res.text
+    return await async_get_text(session, f'{BASE_URL}/sejm/term{term}/interpellations/{num}/body')
 
 def get_interpellation_reply_html(session:httpx.Client, term:int, num:str, key:str):
     """Zwraca szczegóły odpowiedzi interpelacji w formie html"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/interpellations/{num}/reply/{key}/body')
-    res.raise_for_status()
-    return res.text
+    return get_text(session, f'{BASE_URL}/sejm/term{term}/interpellations/{num}/reply/{key}/body')
 
 async def async_get_interpellation_reply_html(session:httpx.AsyncClient, term:int, num:str, key:str):
     """Zwraca szczegóły odpowiedzi interpelacji w formie html"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/interpellations/{num}/reply/{key}/body')
-    res.raise_for_status()
-    return res.text
+    return await async_get_text(session, f'{BASE_URL}/sejm/term{term}/interpellations/{num}/reply/{key}/body')
 
 __all__ = ['InterpellationsSortFields', 'Link', 'Attachment', 'Reply', 'Interpellation', 'get_interpellations',
            'async_get_interpellations', 'get_interpellation', 'async_get_interpellation', 'get_interpellation_html',
-           'async_get_interpellation_html', 'get_interpellation_reply_html', 'async_get_interpellation_reply_html']
\ No newline at end of file
+           'async_get_interpellation_html', 'get_interpellation_reply_html', 'async_get_interpellation_reply_html',
+           'iter_interpellations', 'aiter_interpellations']
\ No newline at end of file
@@ -1,13 +1,20 @@
 from enum import StrEnum
 from datetime import date
-from .utils import BASE_URL, parse_normal_date, parse_iso_format
+from .utils import BASE_URL, LazyDate, LazyDateTime
+from ..transport import get_json, async_get_json, get_bytes, async_get_bytes, download, async_download
 import httpx
 
 class Mp:
+    __slots__ = ('accusative_name', 'active', '_birth_date', 'birth_location', 'club', 'district_name',
+                 'district_num', 'education_level', 'email', 'first_last_name', 'first_name', 'genitive_name', 'id',
+                 'inactive_cause', 'last_first_name', 'last_name', 'number_of_votes', 'profession', 'second_name',
+                 'voivodeship')
+    birth_date = LazyDate()
+
     def __init__(self, raw: dict):
         self.accusative_name = raw.get('accusativeName', '')
         self.active = raw.get('active', False)
-        self.birth_date = parse_normal_date(raw.get('birthDate', ''), '%Y-%m-%d')
+        self.birth_date = raw.get('birthDate', '')
         self.birth_location = raw.get('birthLocation', '')
         self.club = raw.get('club', '')
         self.district_name = raw.get('districtName', '')
@@ -48,9 +55,12 @@ class VoteMP:
         vote_valid='VOTE_VALID'
         vote_invalid = 'VOTE_INVALID'
 
+    __slots__ = ('voting_number', '_date', 'title', 'description', 'topic', 'kind', 'vote', 'list_votes')
+    date = LazyDateTime()
+
     def __init__(self, raw:dict):
         self.voting_number = raw.get('votingNumber')
-        self.date = parse_iso_format(raw.get('date', ''))
+        self.date = raw.get('date', '')
         self.title = raw.get('title')
         self.description  = raw.get('description')
         self.topic = raw.get('topic')
@@ -65,38 +75,35 @@ class VoteMP:
         return f'VoteMP(voting_number={self.voting_number}, title={self.title})'
 
 def get_mps(session:httpx.Client, term:int):
-    res = session.get(f'{BASE_URL}/sejm/term{term}/MP')
-    res.raise_for_status()
-    return list(map(lambda d:Mp(d), res.json()))
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/MP', Mp, many=True)
 
 def get_mp_photo(session:httpx.Client, uri:str):
     """Zdjęcie powinno być pobrane w rozszerzeniu .jfif"""
-    res = session.get(uri)
-    res.raise_for_status()
-    return res.content
+    return get_bytes(session, uri)
 
 def get_mp_vote(session:httpx.Client,term:int,  id:int, sitting:int, date:date):
     """Pobierz informacje o głosowaniu danego posła, danym posiedzeniu o konkretnej dacie"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/MP/{id}/votings/{sitting}/{str(date)}')
-    res.raise_for_status()
-    return [VoteMP(e) for e in res.json()]
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/MP/{id}/votings/{sitting}/{str(date)}', VoteMP, many=True)
 
 async def async_get_mp_vote(session:httpx.AsyncClient,term:int,  id:int, sitting:int, date:date):
     """Pobierz informacje o głosowaniu danego posła, danym posiedzeniu o konkretnej dacie"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/MP/{id}/votings/{sitting}/{str(date)}')
-    res.raise_for_status()
-    return [VoteMP(e) for e in res.json()]
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/MP/{id}/votings/{sitting}/{str(date)}', VoteMP, many=True)
 
 
 async def async_get_mps(session:httpx.AsyncClient, term:int):
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/MP')
-    res.raise_for_status()
-    return list(map(lambda d: Mp(d), res.json()))
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/MP', Mp, many=True)
 
 async def async_get_mp_photo(session:httpx.AsyncClient, uri:str):
     """Zdjęcie powinno być pobrane w rozszerzeniu .jfif"""
-    res = await session.get(uri)
-    res.raise_for_status()
-    return res.content
+    return await async_get_bytes(session, uri)
+
+def download_mp_photo(session:httpx.Client, uri:str, dest, **options):
+    """Pobierz zdjęcie strumieniowo do pliku lub obiektu plikowego (rozszerzenie .jfif). Opcje (chunk_size, expected_size, sha256, resume) jak w transport.download"""
+    return download(session, uri, dest, **options)
+
+async def async_download_mp_photo(session:httpx.AsyncClient, uri:str, dest, **options):
+    """Pobierz zdjęcie strumieniowo do pliku lub obiektu plikowego (rozszerzenie .jfif). Opcje (chunk_size, expected_size, sha256, resume) jak w transport.download"""
+    return await async_download(session, uri, dest, **options)
 
-__all__ = ['Mp', 'get_mps', 'get_mp_photo', 'async_get_mps', 'async_get_mp_photo', 'VoteMP', 'get_mp_vote', 'async_get_mp_vote']
+__all__ = ['Mp', 'get_mps', 'get_mp_photo', 'async_get_mps', 'async_get_mp_photo', 'VoteMP', 'get_mp_vote', 'async_get_mp_vote',
+           'download_mp_photo', 'async_download_mp_photo']
@@ -1,7 +1,9 @@
 import httpx
+import os
 from urllib.parse import quote, unquote
 from enum import StrEnum
-from .utils import BASE_URL, parse_normal_date, parse_iso_format
+from .utils import BASE_URL, LazyDate, LazyDateTime
+from ..transport import get_json, async_get_json, get_bytes, async_get_bytes, download, async_download
 
 class PrintsFieldsEnum(StrEnum):
     NUMBER = 'number'
@@ -12,13 +14,19 @@ class PrintsFieldsEnum(StrEnum):
     ATTACHMENTS = 'attachments'
 
 class Print:
+    __slots__ = ('number', '_delivery_date', 'title', 'term', '_change_date', '_document_date', 'attachments',
+                 'additional_prints')
+    delivery_date = LazyDate()
+    change_date = LazyDateTime()
+    document_date = LazyDate()
+
     def __init__(self, raw):
         self.number = raw.get('number', '')
-        self.delivery_date = parse_normal_date(raw.get('deliveryDate', ''), '%Y-%m-%d')
+        self.delivery_date = raw.get('deliveryDate', '')
         self.title = raw.get('title', '')
         self.term = raw.get('term', -1)
-        self.change_date = parse_iso_format(raw.get('changeDate', ''))
-        self.document_date = parse_normal_date(raw.get('documentDate', ''), '%Y-%m-%d')
+        self.change_date = raw.get('changeDate', '')
+        self.document_date = raw.get('documentDate', '')
         self.attachments = raw.get('attachments', [])
         self.additional_prints = [AdditionalPrint(a) for a in raw.get('additionalPrints',[])]
 
@@ -29,6 +37,8 @@ class Print:
         return f'<Print {self.number}, {self.delivery_date}, {self.title}>'
 
 class AdditionalPrint(Print):
+    __slots__ = ('number_associated',)
+
     def __init__(self, raw):
         super().__init__(raw)
         self.number_associated = raw.get('numberAssociated', '')
@@ -55,23 +65,18 @@ def get_prints(session:httpx.Client, term:int, sort_by:str|PrintsFieldsEnum='',
     if sort_by != '':
         sort_query = f'?sort_by={DESCENDING_MAP[descending]}{sort_by}'
     print(sort_query)
-    response = session.get(f'{BASE_URL}/sejm/term{term}/prints{sort_query}')
-    response.raise_for_status()
-    return [Print(print_data) for print_data in response.json()]
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/prints{sort_query}', Print, many=True)
 
 
 def get_print_details(session:httpx.Client, term:int, print_number):
     """Zwraca szczegóły druku"""
-    response = session.get(f'{BASE_URL}/sejm/term{term}/prints/{print_number}')
-    response.raise_for_status()
-    return Print(response.json())
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/prints/{print_number}', Print)
 
 
 def get_print_attachment(session:httpx.Client, full_url:str):
     """Zwraca zawartość załącznika druku"""
-    response = session.get(full_url)
-    response.raise_for_status()
-    return PrintAttachment(unquote(full_url.split('/')[7]), response.content)
+    content = get_bytes(session, full_url)
+    return PrintAttachment(unquote(full_url.split('/')[7]), content)
 
 
 # Asynchroniczne wersje funkcji
@@ -85,25 +90,36 @@ async def async_get_prints(session:httpx.AsyncClient, term:int, sort_by:str|Prin
     if sort_by != '':
         sort_query = f'?sort_by={DESCENDING_MAP[descending]}{sort_by}'
     print(sort_query)
-    response = await session.get(f'{BASE_URL}/sejm/term{term}/prints{sort_query}')
-    response.raise_for_status()
-    return [Print(print_data) for print_data in response.json()]
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/prints{sort_query}', Print, many=True)
 
 
 async def async_get_print_details(session:httpx.AsyncClient, term:int, print_number):
     """Zwraca szczegóły druku"""
-    response = await session.get(f'{BASE_URL}/sejm/term{term}/prints/{print_number}')
-    response.raise_for_status()
-    return Print(response.json())
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/prints/{print_number}', Print)
 
 
 async def async_get_print_attachment(session:httpx.AsyncClient, full_url:str):
     """Zwraca zawartość załącznika druku"""
-    response = await session.get(full_url)
-    response.raise_for_status()
+    content = await async_get_bytes(session, full_url)
     print(full_url)
-    return PrintAttachment(unquote(full_url.split('/')[7]), response.content)
+    return PrintAttachment(unquote(full_url.split('/')[7]), content)
+
+def _attachment_dest(full_url:str, dest):
+    if hasattr(dest, 'write') or not os.path.isdir(dest):
+        return dest
+    return os.path.join(dest, unquote(full_url.split('/')[7]))
+
+def download_print_attachment(session:httpx.Client, full_url:str, dest='.', **options):
+    """Pobierz załącznik druku strumieniowo do pliku, katalogu (nazwa pliku z adresu) lub obiektu plikowego.
+    Opcje (chunk_size, expected_size, sha256, resume) jak w transport.download"""
+    return download(session, full_url, _attachment_dest(full_url, dest), **options)
+
+async def async_download_print_attachment(session:httpx.AsyncClient, full_url:str, dest='.', **options):
+    """Pobierz załącznik druku strumieniowo do pliku, katalogu (nazwa pliku z adresu) lub obiektu plikowego.
+    Opcje (chunk_size, expected_size, sha256, resume) jak w transport.download"""
+    return await async_download(session, full_url, _attachment_dest(full_url, dest), **options)
 
 __all__ = ['PrintsFieldsEnum', 'Print', 'AdditionalPrint', 'PrintAttachment', 'get_prints', 'get_print_details',
-           'get_print_attachment', 'async_get_prints', 'async_get_print_details', 'async_get_print_attachment']
+           'get_print_attachment', 'async_get_prints', 'async_get_print_details', 'async_get_print_attachment',
+           'download_print_attachment', 'async_download_print_attachment']
 
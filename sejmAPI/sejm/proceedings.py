@@ -1,8 +1,11 @@
-from .utils import BASE_URL, parse_normal_date, parse_iso_format
+from .utils import BASE_URL, parse_normal_date, LazyDate, LazyDateTime
+from ..transport import get_json, async_get_json, async_get_text, get_bytes, async_get_bytes, download, async_download
 from datetime import date
 import httpx
 
 class Proceeding:
+    __slots__ = ('title', 'dates', 'number')
+
     def __init__(self, raw:dict):
         self.title = raw.get('title', '')
         self.dates = list(map(lambda d:parse_normal_date(d, format='%Y-%m-%d'), raw.get('dates', [])))
@@ -12,6 +15,11 @@ class Proceeding:
         return f'Proceeding(title={self.title}, number={self.number})'
 
 class Statement:
+    __slots__ = ('num', 'function', 'name', 'member_id', 'rapporteur', 'secretary', 'unspoken', '_start_datetime',
+                 '_end_datetime')
+    start_datetime = LazyDateTime()
+    end_datetime = LazyDateTime()
+
     def __init__(self, raw:dict):
         self.num = raw.get('num', -1)
         self.function = raw.get('function', '')
@@ -20,16 +28,19 @@ class Statement:
         self.rapporteur = raw.get('rapporteur', False)
         self.secretary = raw.get('secretary', False)
         self.unspoken = raw.get('unspoken', False)
-        self.start_datetime = parse_iso_format(raw.get('startDateTime', ''))
-        self.end_datetime = parse_iso_format(raw.get('endDateTime', ''))
+        self.start_datetime = raw.get('startDateTime', '')
+        self.end_datetime = raw.get('endDateTime', '')
 
     def __str__(self):
         return f'Statement(num={self.num}, function={self.function})'
 
 class StatementList:
+    __slots__ = ('proceeding_num', '_date', 'statements')
+    date = LazyDate()
+
     def __init__(self, raw:dict):
         self.proceeding_num = raw.get('proceedingNum', -1)
-        self.date = parse_normal_date(raw.get('date', ''), '%Y-%m-%d')
+        self.date = raw.get('date', '')
         self.statements = [Statement(s) for s in raw.get('statements', [])]
 
     def __str__(self):
@@ -37,66 +48,54 @@ class StatementList:
 
 def get_proceedings(session:httpx.Client, term:int):
     """Zwraca listę posiedzeń"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/proceedings')
-    res.raise_for_status()
-    return list(map(lambda d:Proceeding(d), res.json()))
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/proceedings', Proceeding, many=True)
 
 def get_proceeding(session:httpx.Client, term:int, p_id:int):
     """Zwraca informacje o danym posiedzeniu"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/proceedings/{p_id}')
-    res.raise_for_status()
-    return Proceeding(res.json())
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/proceedings/{p_id}', Proceeding)
 
 async def async_get_proceedings(session: httpx.AsyncClient, term: int):
     """Asynchroniczna funkcja zwracająca listę posiedzeń"""
     url = f'{BASE_URL}/sejm/term{term}/proceedings'
-    res = await session.get(url)
-    res.raise_for_status()
-    return [Proceeding(d) for d in res.json()]
+    return await async_get_json(session, url, Proceeding, many=True)
 
 async def async_get_proceeding(session: httpx.AsyncClient, term: int, p_id: int):
     """Asynchroniczna funkcja zwracająca informacje o danym posiedzeniu"""
     url = f'{BASE_URL}/sejm/term{term}/proceedings/{p_id}'
-    res = await session.get(url)
-    res.raise_for_status()
-    return Proceeding(res.json())
+    return await async_get_json(session, url, Proceeding)
 
 def get_transcript(session:httpx.Client, term:int, id:int, d:date):
     """Zwróć oświadczenia dla danego posiedzenia w danym dniu"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts')
-    res.raise_for_status()
-    return StatementList(res.json())
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts', StatementList)
 
 async def async_get_transcript(session:httpx.AsyncClient, term:int, id:int, d:date):
     """Zwróć oświadczenia dla danego posiedzenia w danym dniu"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts')
-    res.raise_for_status()
-    return StatementList(res.json())
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts', StatementList)
 
 def get_transcript_pdf(session:httpx.Client, term:int, id:int, d:date):
     """Zwróć zawartość posiedzenia w PDF"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts/pdf')
-    res.raise_for_status()
-    return res.content
+    return get_bytes(session, f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts/pdf')
 
 async def async_get_transcript_pdf(session:httpx.AsyncClient, term:int, id:int, d:date, statement_num:int):
     """Zwróć zawartość posiedzenia w PDF"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts/{statement_num}')
-    res.raise_for_status()
-    return res.text
+    return await async_get_text(session, f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts/{statement_num}')
+
+def download_transcript_pdf(session:httpx.Client, term:int, id:int, d:date, dest, **options):
+    """Pobierz zawartość posiedzenia w PDF strumieniowo do pliku lub obiektu plikowego. Opcje (chunk_size, expected_size, sha256, resume) jak w transport.download"""
+    return download(session, f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts/pdf', dest, **options)
+
+async def async_download_transcript_pdf(session:httpx.AsyncClient, term:int, id:int, d:date, dest, **options):
+    """Pobierz zawartość posiedzenia w PDF strumieniowo do pliku lub obiektu plikowego. Opcje (chunk_size, expected_size, sha256, resume) jak w transport.download"""
+    return await async_download(session, f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts/pdf', dest, **options)
 
 def get_statement_html(session:httpx.Client, term:int, id:int, d:date):
     """Zwróć zawartość oświadczenia w HTML"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts/pdf')
-    res.raise_for_status()
-    return res.content
+    return get_bytes(session, f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts/pdf')
 
 async def async_get_statement_html(session:httpx.AsyncClient, term:int, id:int, d:date):
     """Zwróć zawartość oświadczenia w HTML"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts/pdf')
-    res.raise_for_status()
-    return res.content
+    return await async_get_bytes(session, f'{BASE_URL}/sejm/term{term}/proceedings/{id}/{d}/transcripts/pdf')
 
 __all__ = ["Proceeding", 'get_proceedings', 'get_proceeding', 'async_get_proceedings', 'async_get_proceeding',
            'StatementList', 'Statement', 'get_transcript', 'async_get_transcript', 'get_statement_html', 'async_get_statement_html',
-           'get_transcript_pdf', 'async_get_transcript_pdf']
\ No newline at end of file
+           'get_transcript_pdf', 'async_get_transcript_pdf', 'download_transcript_pdf', 'async_download_transcript_pdf']
\ No newline at end of file
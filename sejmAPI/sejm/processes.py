@@ -1,4 +1,5 @@
-from .utils import BASE_URL, parse_normal_date, parse_iso_format
+from .utils import BASE_URL, LazyDate, LazyDateTime
+from ..transport import get_json, async_get_json
 from enum import StrEnum
 import httpx
 
@@ -8,6 +9,13 @@ class ProcessHeader:
         adaptation = 'ADAPTATION'
         enforcement = 'ENFORCEMENT'
 
+    __slots__ = ('uE', 'term', 'number', 'title', 'description', 'ue', '_document_date', '_process_start_date',
+                 '_change_date', 'document_type', 'comments', '_web_generated_date')
+    document_date = LazyDate()
+    process_start_date = LazyDate()
+    change_date = LazyDateTime()
+    web_generated_date = LazyDateTime()
+
     def __init__(self, raw:dict):
         self.uE = ProcessHeader.UeEnum(raw.get('uE'))
         self.term = raw.get('term', -1)
@@ -15,12 +23,12 @@ class ProcessHeader:
         self.title = raw.get('title', '')
         self.description = raw.get('description', '')
         self.ue = ProcessHeader.UeEnum(raw.get('ue'))
-        self.document_date = parse_normal_date(raw.get('documentDate', ''), '%Y-%m-%d')
-        self.process_start_date = parse_normal_date(raw.get('processStartDate', ''), '%Y-%m-%d')
-        self.change_date = parse_iso_format(raw.get('changeDate', ''))
+        self.document_date = raw.get('documentDate', '')
+        self.process_start_date = raw.get('processStartDate', '')
+        self.change_date = raw.get('changeDate', '')
         self.document_type = raw.get('documentType', '')
         self.comments = raw.get('comments', '')
-        self.web_generated_date = parse_iso_format(raw.get('webGeneratedDate', ''))
+        self.web_generated_date = raw.get('webGeneratedDate', '')
 
     def __str__(self):
         return f'ProcessHeader(term={self.term}, number={self.number}, uE={self.uE})'
@@ -29,9 +37,12 @@ class ProcessHeader:
         return f'ProcessHeader(term={self.term}, number={self.number}, uE={self.uE})'
 
 class ProcessDocument:
+    __slots__ = ('number', '_registered_date')
+    registered_date = LazyDate()
+
     def __init__(self, raw:dict):
         self.number = raw.get('number', '')
-        self.registered_date = parse_normal_date(raw.get('registeredDate', ''), '%Y-%m-%d')
+        self.registered_date = raw.get('registeredDate', '')
 
     def __str__(self):
         return f'ProcessDocument(number={self.number}, registered_date={self.registered_date})'
@@ -40,9 +51,12 @@ class ProcessDocument:
         return f'ProcessDocument(number={self.number}, registered_date={self.registered_date})'
 
 class ProcessStage:
+    __slots__ = ('stage_name', '_date', 'children')
+    date = LazyDate()
+
     def __init__(self, raw:dict):
         self.stage_name = raw.get('stageName', '')
-        self.date = parse_normal_date(raw.get('date', ''), '%Y-%m-%d')
+        self.date = raw.get('date', '')
         self.children = self._get_children(raw.get('children', []))
 
     def _get_children(self, raw: list):
@@ -62,23 +76,33 @@ class ProcessDetails:
         urgent='URGENT'
         urgent_withdrawn = 'URGENT_WITHDRAWN '
 
+    __slots__ = ('uE', 'term', 'title', 'description', 'number', '_document_date', '_change_date',
+                 '_web_generated_date', '_process_start_date', 'document_type', 'comments', 'other_documents',
+                 'rcl_num', 'urgency_status', '_urgency_withdraw_date', 'legislative_committee',
+                 'principle_of_subsidiarity', 'stages', 'prints_considered_jointly')
+    document_date = LazyDate()
+    change_date = LazyDateTime()
+    web_generated_date = LazyDateTime()
+    process_start_date = LazyDate()
+    urgency_withdraw_date = LazyDate()
+
     def __init__(self, raw:dict):
         self.uE = ProcessHeader.UeEnum(raw.get('uE'))
         self.term = raw.get('term', -1)
         self.title = raw.get('title', '')
         self.description = raw.get('description', '')
         self.number = raw.get('number', '')
-        self.document_date = parse_normal_date(raw.get('documentDate', ''), '%Y-%m-%d')
-        self.change_date = parse_iso_format(raw.get('changeDate', ''))
-        self.web_generated_date = parse_iso_format(raw.get('webGeneratedDate', ''))
-        self.process_start_date = parse_normal_date(raw.get('processStartDate', ''), '%Y-%m-%d')
+        self.document_date = raw.get('documentDate', '')
+        self.change_date = raw.get('changeDate', '')
+        self.web_generated_date = raw.get('webGeneratedDate', '')
+        self.process_start_date = raw.get('processStartDate', '')
         self.document_type = raw.get('documentType', '')
         self.comments = raw.get('comments', '')
-        self.document_date = parse_normal_date(raw.get('documentDate', ''), '%Y-%m-%d')
+        self.document_date = raw.get('documentDate', '')
         self.other_documents = [ProcessDocument(e) for e in raw.get('otherDocuments', [])]
         self.rcl_num = raw.get('rclNum', '')
         self.urgency_status = ProcessDetails.UrgencyStatusEnum(raw.get('urgencyStatus'))
-        self.urgency_withdraw_date = parse_normal_date(raw.get('urgencyWithdrawDate', ''), '%Y-%m-%d')
+        self.urgency_withdraw_date = raw.get('urgencyWithdrawDate', '')
         self.legislative_committee = raw.get('legislativeCommittee', False)
         self.principle_of_subsidiarity = raw.get('principleOfSubsidiarity', False)
         self.stages = [ProcessStage(e) for e in raw.get('stages', [])]
@@ -94,26 +118,18 @@ class ProcessDetails:
 
 def get_processes(session:httpx.Client, term:int):
     """Pobierz listę procesór legislacyjnych"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/processes')
-    res.raise_for_status()
-    return [ProcessHeader(e) for e in res.json()]
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/processes', ProcessHeader, many=True)
 
 def get_process(session:httpx.Client, term:int, num:int):
     """Pobierz informacje na temat procesu legislacyjnego"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/processes/{num}')
-    res.raise_for_status()
-    return ProcessDetails(res.json())
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/processes/{num}', ProcessDetails)
 
 async def async_get_processes(session:httpx.AsyncClient, term:int):
     """Pobierz listę procesór legislacyjnych"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/processes')
-    res.raise_for_status()
-    return [ProcessHeader(e) for e in res.json()]
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/processes', ProcessHeader, many=True)
 
 async def async_get_process(session:httpx.AsyncClient, term:int, num:int):
     """Pobierz informacje na temat procesu legislacyjnego"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/processes/{num}')
-    res.raise_for_status()
-    return ProcessDetails(res.json())
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/processes/{num}', ProcessDetails)
 
 __all__ = ['ProcessDetails', 'ProcessStage', 'ProcessHeader', 'ProcessDocument', 'get_process', 'get_processes', 'async_get_process', 'async_get_processes']
\ No newline at end of file
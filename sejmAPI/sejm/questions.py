@@ -1,115 +1,134 @@
-from cgi import parse
 from enum import StrEnum
 
 import httpx
-from .utils import BASE_URL, filter_query_params, parse_normal_date, parse_iso_format
-from datetime import date
+from .utils import BASE_URL, filter_query_params, LazyDate, LazyDateTime
+from ..transport import get_json, async_get_json, get_text, async_get_text
+from ..pagination import iter_pages, aiter_pages
+from datetime import date, datetime
 
 class SortQuestionByEnum(StrEnum):
     last_modified = 'lastModified'
 
 class Link:
+    __slots__ = ('href', 'rel')
+
     def __init__(self, raw:dict):
         self.href = raw.get('href', '')
         self.rel = raw.get('rel', '')
 
 class Attachment:
+    __slots__ = ('name', 'url', '_last_modified')
+    last_modified = LazyDateTime()
+
     def __init__(self, raw:dict):
         self.name = raw.get('name', '')
         self.url = raw.get('URL', '')
-        self.last_modified = parse_iso_format(raw.get('lastModified', ''))
+        self.last_modified = raw.get('lastModified', '')
 
 
 class Reply:
+    __slots__ = ('key', '_receipt_date', '_last_modified', 'from_', 'links', 'only_attachment', 'attachments')
+    receipt_date = LazyDate()
+    last_modified = LazyDateTime()
+
     def __init__(self, raw:dict):
         self.key = raw.get('key')
-        self.receipt_date = parse_normal_date(raw.get('receiptDate', ''), '%Y-%m-%d')
-        self.last_modified = parse_iso_format(raw.get('lastModified', ''))
+        self.receipt_date = raw.get('receiptDate', '')
+        self.last_modified = raw.get('lastModified', '')
         self.from_ = raw.get('from', '')
         self.links = [Link(l) for l in raw.get('links')]
         self.only_attachment = raw.get('onlyAttachment', False)
         self.attachments = [Attachment(a) for a in raw.get('attachments', [])]
 
 class Question:
+    __slots__ = ('term', 'num', 'title', '_receipt_date', '_last_modified', 'links', 'from_', 'to', '_send_date',
+                 'replies')
+    receipt_date = LazyDate()
+    last_modified = LazyDateTime()
+    send_date = LazyDate()
+
     def __init__(self, raw:dict):
         self.term = raw.get('term', -1)
         self.num = raw.get('num', -1)
         self.title = raw.get('title', '')
-        self.receipt_date = parse_normal_date(raw.get('receiptDate', ''), '%Y-%m-%d')
-        self.last_modified = parse_iso_format(raw.get('lastModified', ''))
+        self.receipt_date = raw.get('receiptDate', '')
+        self.last_modified = raw.get('lastModified', '')
         self.links = [Link(l) for l in raw.get('links')]
         self.from_ = raw.get('from', [])
         self.to = raw.get('to', [])
-        self.send_date = parse_normal_date(raw.get('sentDate', ''), '%Y-%m-%d')
+        self.send_date = raw.get('sentDate', '')
         self.replies = [Reply(r) for r in raw.get('replies',[])]
 
 
 
-def get_written_questions(session:httpx.Client, term:int, from_:date=None, limit:int=None, modifiedSince:str=None, offset:int=None, since:date=None,
+def get_written_questions(session:httpx.Client, term:int, from_:date=None, limit:int=None, modifiedSince:str|datetime=None, offset:int=None, since:date=None,
                          till:date=None, title:str=None, to:str=None, sort_by:SortQuestionByEnum=None, descending=False):
     """Pobiera listę pytań
     UWAGA: Zbyt duża ilość parametrów wywołuje błąd 403"""
+    if isinstance(modifiedSince, datetime):
+        modifiedSince = modifiedSince.strftime('%Y-%m-%dT%H:%M')
     params = filter_query_params(from_=from_, limit=limit, modifiedSince=modifiedSince, offset=offset, since=since, till=till, title=title, to=to)
     DESCENDING_MAP = {
         True:'-',
         False:''
     }
-    if sort_by != '':
+    if sort_by:
         params['sort_by'] = f'{DESCENDING_MAP[descending]}{sort_by}'
-    res = session.get(f'{BASE_URL}/sejm/term{term}/writtenQuestions', params=params)
-    res.raise_for_status()
-    return [Question(q) for q in res.json()]
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/writtenQuestions', Question, many=True, params=params)
 
-async def async_get_written_questions(session:httpx.AsyncClient, term:int, from_:date=None, limit:int=None, modifiedSince:str=None, offset:int=None, since:date=None,
+async def async_get_written_questions(session:httpx.AsyncClient, term:int, from_:date=None, limit:int=None, modifiedSince:str|datetime=None, offset:int=None, since:date=None,
                          till:date=None, title:str=None, to:str=None, sort_by:SortQuestionByEnum=None, descending=False):
     """Pobiera listę pytań
     UWAGA: Zbyt duża ilość parametrów wywołuje błąd 403"""
+    if isinstance(modifiedSince, datetime):
+        modifiedSince = modifiedSince.strftime('%Y-%m-%dT%H:%M')
     params = filter_query_params(from_=from_, limit=limit, modifiedSince=modifiedSince, offset=offset, since=since, till=till, title=title, to=to)
     DESCENDING_MAP = {
         True:'-',
         False:''
     }
-    if sort_by != '':
+    if sort_by:
         params['sort_by'] = f'{DESCENDING_MAP[descending]}{sort_by}'
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/writtenQuestions', params=params)
-    res.raise_for_status()
-    return [Question(q) for q in res.json()]
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/writtenQuestions', Question, many=True, params=params)
+
+def iter_written_questions(session:httpx.Client, term:int, page_size:int=50, **filters):
+    """Zwraca kolejno wszystkie pytania, pobierając je stronami.
+    Parametry filters odpowiadają parametrom get_written_questions (bez offset i limit)"""
+    def fetch_page(offset, limit):
+        return get_written_questions(session, term, offset=offset, limit=limit, **filters), None
+    return iter_pages(fetch_page, page_size)
+
+def aiter_written_questions(session:httpx.AsyncClient, term:int, page_size:int=50, prefetch:int=4, **filters):
+    """Asynchronicznie zwraca wszystkie pytania, pobierając do prefetch stron naraz.
+    Parametry filters odpowiadają parametrom get_written_questions (bez offset i limit)"""
+    async def fetch_page(offset, limit):
+        return await async_get_written_questions(session, term, offset=offset, limit=limit, **filters), None
+    return aiter_pages(fetch_page, page_size, prefetch=prefetch)
 
 def get_question(session:httpx.Client, term:int, num:int):
     """Zwróć dane na temat pytania"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/writtenQuestion/{num}')
-    res.raise_for_status()
-    return Question(res.json())
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/writtenQuestion/{num}', Question)
 
 async def async_get_question(session:httpx.AsyncClient, term:int, num:int):
     """Zwróć dane na temat pytania"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/writtenQuestion/{num}')
-    res.raise_for_status()
-    return Question(res.json())
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/writtenQuestion/{num}', Question)
 
 def get_question_html(session:httpx.Client, term:int, num:int):
     """Zwróć pytanie w formie HTML"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/writtenQuestion/{num}/html')
-    res.raise_for_status()
-    return res.text
+    return get_text(session, f'{BASE_URL}/sejm/term{term}/writtenQuestion/{num}/html')
 
 async def async_get_question_html(session:httpx.AsyncClient, term:int, num:int):
     """Zwróć pytanie w formie HTML"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/writtenQuestion/{num}/html')
-    res.raise_for_status()
-    return res.text
+    return await async_get_text(session, f'{BASE_URL}/sejm/term{term}/writtenQuestion/{num}/html')
 
 def get_question_reply_html(session:httpx.Client, term:int, num:int, key:str):
     """Zwróć odpowiedź na pytanie w formie HTML"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/writtenQuestion/{num}/reply/{key}/body')
-    res.raise_for_status()
-    return res.text
+    return get_text(session, f'{BASE_URL}/sejm/term{term}/writtenQuestion/{num}/reply/{key}/body')
 
 async def async_get_question_reply_html(session:httpx.AsyncClient, term:int, num:int, key:str):
     """Zwróć odpowiedź na pytanie w formie HTML"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/writtenQuestion/{num}/reply/{key}/body')
-    res.raise_for_status()
-    return res.text
+    return await async_get_text(session, f'{BASE_URL}/sejm/term{term}/writtenQuestion/{num}/reply/{key}/body')
 
 __all__ = ['SortQuestionByEnum', 'Link', 'Attachment', 'Reply', "Question", 'get_question', 'get_question_html', 'get_question_reply_html',
-           'async_get_question_html', 'async_get_question', 'async_get_written_questions', 'async_get_question_reply_html', 'get_written_questions']
\ No newline at end of file
+           'async_get_question_html', 'async_get_question', 'async_get_written_questions', 'async_get_question_reply_html', 'get_written_questions',
+           'iter_written_questions', 'aiter_written_questions']
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""Migawka danych referencyjnych kadencji do szybkiego startu usług.
+
+TermSnapshot zawiera obiekty Term, Mp, Club, Committee i Group jednej kadencji (wyniki get_current_term lub
+get_term, get_mps, get_clubs, get_committees i get_bilateral_groups). Migawka jest zapisywana do jednego pliku:
+nagłówek z wersją formatu, a po nim skompresowane zlib surowe odpowiedzi API, z których load odtwarza obiekty
+bez żadnego zapytania. Zapis odbywa się przez plik tymczasowy i os.replace, więc czytelnicy nigdy nie widzą
+niepełnego pliku.
+
+SnapshotHolder przechowuje bieżącą migawkę i odświeża ją w tle (wątek lub zadanie asyncio). Nowa migawka
+zastępuje poprzednią jednym przypisaniem, więc odczyt holder.snapshot zawsze zwraca spójny zestaw danych:
+
+    holder = SnapshotHolder('term.snap')
+    holder.load_or_build(session)
+    holder.start(session, interval=3600)
+    mps = holder.snapshot.mps
+"""
+from .utils import BASE_URL
+from .terms import Term
+from .mp import Mp
+from .clubs import Club
+from .committees import Committee
+from .groups import Group
+from ..transport import get_json, async_get_json
+from .. import decoding
+from datetime import datetime, timezone
+from threading import Event, Thread
+import asyncio
+import json
+import logging
+import os
+import struct
+import tempfile
+import zlib
+import httpx
+
+MAGIC = b'SEJMSNP1'
+FORMAT_VERSION = 1
+SECTIONS = ('term', 'mps', 'clubs', 'committees', 'groups')
+
+logger = logging.getLogger('sejmAPI.snapshot')
+
+
+def _urls(term:int):
+    base = f'{BASE_URL}/sejm/term{term}'
+    return {'mps': f'{base}/MP', 'clubs': f'{base}/clubs', 'committees': f'{base}/committees',
+            'groups': f'{base}/bilateralGroups'}
+
+
+class TermSnapshot:
+    """Dane referencyjne jednej kadencji"""
+    __slots__ = ('term', 'mps', 'clubs', 'committees', 'groups', 'created', '_raw', '_mp_ids', '_club_ids')
+
+    def __init__(self, raw:dict, created:datetime=None):
+        self._raw = raw
+        self.created = created or datetime.now(timezone.utc)
+        self.term = Term(raw['term'])
+        self.mps = [Mp(d) for d in raw['mps']]
+        self.clubs = [Club(d) for d in raw['clubs']]
+        self.committees = [Committee(d) for d in raw['committees']]
+        self.groups = [Group(d) for d in raw['groups']]
+        self._mp_ids = self._club_ids = None
+
+    def mp(self, id:int):
+        """Zwraca posła o podanym id lub None"""
+        if self._mp_ids is None:
+            self._mp_ids = {mp.id: mp for mp in self.mps}
+        return self._mp_ids.get(id)
+
+    def club(self, id:str):
+        """Zwraca klub o podanym id lub None"""
+        if self._club_ids is None:
+            self._club_ids = {club.id: club for club in self.clubs}
+        return self._club_ids.get(id)
+
+    def save(self, path:str):
+        """Zapisuje migawkę atomowo do pliku"""
+        sections = [zlib.compress(json.dumps(self._raw[name], ensure_ascii=False).encode()) for name in SECTIONS]
+        header = json.dumps({'format': FORMAT_VERSION, 'term': self.term.num, 'created': self.created.isoformat(),
+                             'sections': dict(zip(SECTIONS, map(len, sections)))}).encode()
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(MAGIC + struct.pack('<I', len(header)) + header)
+                for section in sections:
+                    f.write(section)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path:str):
+        """Wczytuje migawkę zapisaną metodą save. Plik w innej wersji formatu, obcięty lub uszkodzony powoduje ValueError"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} nie jest plikiem migawki kadencji')
+        try:
+            header_size, = struct.unpack_from('<I', data, len(MAGIC))
+            start = len(MAGIC) + 4
+            header = json.loads(data[start:start + header_size])
+            if header.get('format') != FORMAT_VERSION:
+                raise ValueError(f'{path}: nieobsługiwana wersja formatu {header.get("format")}')
+            position, raw = start + header_size, {}
+            for name in SECTIONS:
+                size = header['sections'][name]
+                raw[name] = decoding.loads(zlib.decompress(data[position:position + size]))
+                position += size
+            return cls(raw, datetime.fromisoformat(header['created']))
+        except (KeyError, TypeError, AttributeError, IndexError, struct.error, zlib.error) as exc:
+            raise ValueError(f'{path}: uszkodzony plik migawki ({exc!r})') from exc
+
+    def __str__(self):
+        return (f'TermSnapshot(term={self.term.num}, mps={len(self.mps)}, clubs={len(self.clubs)}, '
+                f'committees={len(self.committees)}, groups={len(self.groups)})')
+
+
+def build_snapshot(session:httpx.Client, term:int=None):
+    """Pobiera dane referencyjne kadencji (domyślnie bieżącej) i tworzy migawkę"""
+    if term is None:
+        raw = {'term': get_json(session, f'{BASE_URL}/sejm/term')[-1]}
+    else:
+        raw = {'term': get_json(session, f'{BASE_URL}/sejm/term{term}')}
+    for name, url in _urls(raw['term']['num']).items():
+        raw[name] = get_json(session, url)
+    return TermSnapshot(raw)
+
+async def async_build_snapshot(session:httpx.AsyncClient, term:int=None):
+    """Pobiera dane referencyjne kadencji (domyślnie bieżącej) i tworzy migawkę. Listy są pobierane równolegle"""
+    if term is None:
+        raw = {'term': (await async_get_json(session, f'{BASE_URL}/sejm/term'))[-1]}
+    else:
+        raw = {'term': await async_get_json(session, f'{BASE_URL}/sejm/term{term}')}
+    urls = _urls(raw['term']['num'])
+    raw.update(zip(urls, await asyncio.gather(*(async_get_json(session, url) for url in urls.values()))))
+    return TermSnapshot(raw)
+
+
+class SnapshotHolder:
+    """Bieżąca migawka z plikiem path jako źródłem szybkiego startu i odświeżaniem w tle"""
+    def __init__(self, path:str, term:int=None):
+        self.path = path
+        self.term = term
+        self.snapshot:TermSnapshot|None = None
+        self.last_error:Exception|None = None
+        self._stop = Event()
+        self._thread = None
+
+    def load(self):
+        """Wczytuje migawkę z pliku, jeśli istnieje i ma obsługiwany format. Zwraca True, jeśli się udało"""
+        try:
+            self.snapshot = TermSnapshot.load(self.path)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def load_or_build(self, session:httpx.Client):
+        """Wczytuje migawkę z pliku, a jeśli to niemożliwe, pobiera ją z API"""
+        if not self.load():
+            self.refresh(session)
+        return self.snapshot
+
+    async def async_load_or_build(self, session:httpx.AsyncClient):
+        """Wczytuje migawkę z pliku, a jeśli to niemożliwe, pobiera ją z API"""
+        if not self.load():
+            await self.async_refresh(session)
+        return self.snapshot
+
+    def _swap(self, snapshot:TermSnapshot):
+        snapshot.save(self.path)
+        self.snapshot = snapshot
+        self.last_error = None
+        return snapshot
+
+    def _failed(self, exc:Exception):
+        self.last_error = exc
+        logger.warning('Odświeżenie migawki kadencji nie powiodło się: %r', exc, exc_info=exc)
+
+    def refresh(self, session:httpx.Client):
+        """Pobiera nową migawkę, zapisuje ją do pliku i podmienia bieżącą"""
+        return self._swap(build_snapshot(session, self.term))
+
+    async def async_refresh(self, session:httpx.AsyncClient):
+        """Pobiera nową migawkę, zapisuje ją do pliku i podmienia bieżącą"""
+        return self._swap(await async_build_snapshot(session, self.term))
+
+    def start(self, session:httpx.Client, interval:float=3600.0):
+        """Uruchamia wątek odświeżający migawkę co interval sekund. Błędy (zapytań, zapisu lub nieoczekiwanej
+        struktury odpowiedzi) są logowane i nie przerywają odświeżania, a bieżąca migawka pozostaje bez zmian
+        (ostatni błąd jest dostępny w last_error)"""
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh(session)
+                except Exception as exc:
+                    self._failed(exc)
+        self._thread = Thread(target=run, name='sejmAPI-snapshot', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def start_async(self, session:httpx.AsyncClient, interval:float=3600.0):
+        """Uruchamia zadanie asyncio odświeżające migawkę co interval sekund i zwraca je (do anulowania).
+        Błędy są obsługiwane jak w start"""
+        async def run():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.async_refresh(session)
+                except Exception as exc:
+                    self._failed(exc)
+        return asyncio.ensure_future(run())
+
+__all__ = ['FORMAT_VERSION', 'TermSnapshot', 'build_snapshot', 'async_build_snapshot', 'SnapshotHolder']
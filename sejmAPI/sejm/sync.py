@@ -0,0 +1,224 @@
+"""Przyrostowa synchronizacja interpelacji i zapytań pisemnych do lokalnej bazy SQLite.
+
+RecordStore przechowuje surowe dane interpelacji i zapytań (z których można odtworzyć obiekty Interpellation
+i Question) oraz osobny dla każdej pary (rodzaj, kadencja) znacznik (watermark) - najpóźniejszą datę modyfikacji
+(lastModified) widzianą podczas synchronizacji. Kolejna synchronizacja pobiera, posortowane rosnąco po lastModified,
+tylko pozycje zmodyfikowane od tej daty (pomniejszonej o overlap), więc przy niewielu zmianach kosztuje jedno lub kilka
+zapytań. Znacznik jest przesuwany dopiero po zapisaniu wszystkich stron, więc przerwana synchronizacja zostanie
+powtórzona od poprzedniego znacznika.
+
+Każda nowa lub zmieniona pozycja jest w tej samej transakcji oznaczana jako oczekująca na pobranie treści.
+Podanie bodies (BodyStore) pobiera treści HTML oczekujących pozycji i ich odpowiedzi, więc treści, których nie udało
+się pobrać (lub których pobranie przerwało zakończenie procesu), są ponawiane w kolejnych synchronizacjach - najwyżej
+body_attempts razy, aby trwale niedostępna treść nie była pobierana bez końca:
+
+    store, bodies = RecordStore('records.db'), BodyStore('bodies.db')
+    await async_sync_records(session, store, 10, QUESTIONS, bodies=bodies)
+"""
+from .bodies import INTERPELLATIONS, QUESTIONS, BodyStore, sync_bodies, async_sync_bodies
+from .interpellations import Interpellation
+from .questions import Question
+from .utils import BASE_URL
+from ..transport import get_json, async_get_json
+from ..pagination import iter_pages, aiter_pages
+from datetime import datetime, timedelta
+from threading import Lock
+import sqlite3
+import json
+import httpx
+
+_MODELS = {INTERPELLATIONS: Interpellation, QUESTIONS: Question}
+
+
+def _last_modified(raw:dict):
+    try:
+        return datetime.fromisoformat(raw.get('lastModified', ''))
+    except (TypeError, ValueError):
+        return None
+
+
+class RecordStore:
+    """Lokalna baza interpelacji i zapytań pisemnych w pliku SQLite (może być współdzielona z innymi procesami)"""
+    def __init__(self, path:str):
+        self.path = path
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS records (
+                kind TEXT, term INTEGER, num INTEGER, last_modified TEXT, data TEXT NOT NULL, PRIMARY KEY (kind, term, num))''')
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS watermarks (
+                kind TEXT, term INTEGER, value TEXT NOT NULL, PRIMARY KEY (kind, term))''')
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS body_pending (
+                kind TEXT, term INTEGER, num INTEGER, attempts INTEGER NOT NULL, PRIMARY KEY (kind, term, num))''')
+
+    def watermark(self, kind:str, term:int):
+        """Najpóźniejsza data modyfikacji zapisana dla rodzaju i kadencji lub None"""
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM watermarks WHERE kind = ? AND term = ?', (kind, term)).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def set_watermark(self, kind:str, term:int, value:datetime):
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?)', (kind, term, value.isoformat()))
+
+    def upsert(self, kind:str, term:int, raws:list[dict]):
+        """Zapisuje pozycje i zwraca te, które są nowe lub mają inną datę modyfikacji niż zapisana.
+        Zwracane pozycje są oznaczane jako oczekujące na pobranie treści"""
+        changed = []
+        with self._lock, self._conn:
+            for raw in raws:
+                num = raw.get('num')
+                row = self._conn.execute('SELECT last_modified FROM records WHERE kind = ? AND term = ? AND num = ?',
+                                         (kind, term, num)).fetchone()
+                if row is not None and row[0] == raw.get('lastModified'):
+                    continue
+                self._conn.execute('INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?)',
+                                   (kind, term, num, raw.get('lastModified'), json.dumps(raw, ensure_ascii=False)))
+                self._conn.execute('INSERT OR REPLACE INTO body_pending VALUES (?, ?, ?, 0)', (kind, term, num))
+                changed.append(raw)
+        return changed
+
+    def get_raw(self, kind:str, term:int, num:int):
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM records WHERE kind = ? AND term = ? AND num = ?',
+                                     (kind, term, num)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get(self, kind:str, term:int, num:int):
+        """Zwraca obiekt Interpellation lub Question albo None, jeśli pozycji nie ma w bazie"""
+        raw = self.get_raw(kind, term, num)
+        return _MODELS[kind](raw) if raw is not None else None
+
+    def iter(self, kind:str, term:int):
+        """Zwraca kolejno zapisane pozycje kadencji jako obiekty Interpellation lub Question"""
+        with self._lock:
+            rows = self._conn.execute('SELECT data FROM records WHERE kind = ? AND term = ? ORDER BY num',
+                                      (kind, term)).fetchall()
+        model = _MODELS[kind]
+        for (data,) in rows:
+            yield model(json.loads(data))
+
+    def body_pending(self, kind:str, term:int, max_attempts:int):
+        """Zwraca pozycje oczekujące na pobranie treści, dla których wykonano mniej niż max_attempts prób"""
+        with self._lock:
+            rows = self._conn.execute('''SELECT r.data FROM body_pending p JOIN records r USING (kind, term, num)
+                WHERE p.kind = ? AND p.term = ? AND p.attempts < ? ORDER BY p.num''', (kind, term, max_attempts)).fetchall()
+        model = _MODELS[kind]
+        return [model(json.loads(data)) for (data,) in rows]
+
+    def finish_bodies(self, kind:str, term:int, nums:list[int], failed:set[int]):
+        """Usuwa oznaczenie oczekiwania dla pozycji nums, których treści pobrano, a dla failed zwiększa licznik prób"""
+        with self._lock, self._conn:
+            for num in nums:
+                if num in failed:
+                    self._conn.execute('UPDATE body_pending SET attempts = attempts + 1 WHERE kind = ? AND term = ? AND num = ?',
+                                       (kind, term, num))
+                else:
+                    self._conn.execute('DELETE FROM body_pending WHERE kind = ? AND term = ? AND num = ?', (kind, term, num))
+
+    def count(self, kind:str=None, term:int=None):
+        query, args = 'SELECT COUNT(*) FROM records', []
+        conditions = [(c, v) for c, v in (('kind', kind), ('term', term)) if v is not None]
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(f'{c} = ?' for c, _ in conditions)
+            args = [v for _, v in conditions]
+        with self._lock:
+            return self._conn.execute(query, args).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RecordSyncResult:
+    """Podsumowanie synchronizacji. bodies zawiera wynik pobierania treści (BodySyncResult) lub None"""
+    __slots__ = ('seen', 'changed', 'watermark', 'bodies')
+
+    def __init__(self, watermark:datetime|None):
+        self.seen = 0
+        self.changed = 0
+        self.watermark = watermark
+        self.bodies = None
+
+    def __str__(self):
+        return (f'RecordSyncResult(seen={self.seen}, changed={self.changed}, watermark={self.watermark}, '
+                f'bodies={self.bodies})')
+
+
+def _params(since:datetime|None, offset:int, limit:int):
+    params = {'offset': str(offset), 'limit': str(limit), 'sort_by': 'lastModified'}
+    if since is not None:
+        params['modifiedSince'] = since.strftime('%Y-%m-%dT%H:%M')
+    return params
+
+def _start(store:RecordStore, kind:str, term:int, since:datetime|None, overlap:timedelta):
+    """Zwraca znacznik początkowy i datę przekazywaną jako modifiedSince (None oznacza pełne pobranie)"""
+    if kind not in _MODELS:
+        raise ValueError(f'Nieznany rodzaj: {kind}')
+    watermark = since or store.watermark(kind, term)
+    return watermark, watermark - overlap if watermark is not None else None
+
+def _record_page(store:RecordStore, kind:str, term:int, result:RecordSyncResult, raws:list[dict]):
+    result.seen += len(raws)
+    for raw in raws:
+        modified = _last_modified(raw)
+        if modified is not None and (result.watermark is None or modified > result.watermark):
+            result.watermark = modified
+    changed = store.upsert(kind, term, raws)
+    result.changed += len(changed)
+    return changed
+
+
+def _finish_bodies(store:RecordStore, kind:str, term:int, targets:list, result:RecordSyncResult):
+    store.finish_bodies(kind, term, [item.num for item in targets], {num for num, _ in result.bodies.failed})
+
+
+def sync_records(session:httpx.Client, store:RecordStore, term:int, kind:str=INTERPELLATIONS, since:datetime=None,
+                 bodies:BodyStore=None, page_size:int=100, overlap:timedelta=timedelta(minutes=5), body_attempts:int=5):
+    """Pobiera interpelacje (kind=INTERPELLATIONS) lub zapytania (kind=QUESTIONS) zmodyfikowane od since
+    (domyślnie od znacznika zapisanego w store; bez znacznika pobierana jest cała kadencja) i zapisuje je w store"""
+    watermark, modified_since = _start(store, kind, term, since, overlap)
+    result = RecordSyncResult(watermark)
+    url = f'{BASE_URL}/sejm/term{term}/{kind}'
+
+    def fetch_page(offset, limit):
+        raws = get_json(session, url, params=_params(modified_since, offset, limit))
+        _record_page(store, kind, term, result, raws)
+        return raws, None
+    for _ in iter_pages(fetch_page, page_size):
+        pass
+
+    if result.watermark is not None:
+        store.set_watermark(kind, term, result.watermark)
+    targets = store.body_pending(kind, term, body_attempts) if bodies is not None else []
+    if targets:
+        result.bodies = sync_bodies(session, bodies, term, kind, items=targets)
+        _finish_bodies(store, kind, term, targets, result)
+    return result
+
+async def async_sync_records(session:httpx.AsyncClient, store:RecordStore, term:int, kind:str=INTERPELLATIONS,
+                             since:datetime=None, bodies:BodyStore=None, page_size:int=100, prefetch:int=4,
+                             overlap:timedelta=timedelta(minutes=5), concurrency:int=8, body_attempts:int=5):
+    """Asynchronicznie pobiera zmodyfikowane pozycje, pobierając do prefetch stron naraz. Treści (gdy podano bodies)
+    są pobierane najwyżej concurrency naraz. Pozostałe parametry jak w sync_records"""
+    watermark, modified_since = _start(store, kind, term, since, overlap)
+    result = RecordSyncResult(watermark)
+    url = f'{BASE_URL}/sejm/term{term}/{kind}'
+
+    async def fetch_page(offset, limit):
+        raws = await async_get_json(session, url, params=_params(modified_since, offset, limit))
+        _record_page(store, kind, term, result, raws)
+        return raws, None
+    async for _ in aiter_pages(fetch_page, page_size, prefetch=prefetch):
+        pass
+
+    if result.watermark is not None:
+        store.set_watermark(kind, term, result.watermark)
+    targets = store.body_pending(kind, term, body_attempts) if bodies is not None else []
+    if targets:
+        result.bodies = await async_sync_bodies(session, bodies, term, kind, items=targets, concurrency=concurrency)
+        _finish_bodies(store, kind, term, targets, result)
+    return result
+
+__all__ = ['INTERPELLATIONS', 'QUESTIONS', 'RecordStore', 'RecordSyncResult', 'sync_records', 'async_sync_records']
@@ -1,11 +1,15 @@
 """Moduł oparty o: https://api.sejm.gov.pl/term.html"""
-from .utils import BASE_URL, parse_iso_format, parse_normal_date
+from .utils import BASE_URL, LazyDate, LazyDateTime
+from ..transport import get_json, async_get_json
 import httpx
 
 class Prints:
+    __slots__ = ('count', '_last_changed', 'link')
+    last_changed = LazyDateTime()
+
     def __init__(self, raw:dict):
         self.count = raw.get('count')
-        self.last_changed = parse_iso_format(raw.get('lastChanged'))
+        self.last_changed = raw.get('lastChanged')
         self.link = raw.get('link')
 
     def build_uri(self):
@@ -13,20 +17,26 @@ class Prints:
 
 
 class Term:
+    __slots__ = ('raw', 'to', 'current', '_start', 'num', 'prints')
+    start = LazyDate()
+
     def __init__(self, raw:dict):
         self.raw = raw
         self.to = raw.get('to', None)
         self.current = raw.get('current')
-        self.start = parse_normal_date(raw.get('from'), '%Y-%m-%d')
+        self.start = raw.get('from')
         self.num = raw.get('num')
         self.prints = Prints(raw.get('prints'))
 
     def __str__(self):
         return f'<{self.num}, {self.start}>'
 
+def _last_term(raw:list):
+    return Term(raw[-1])
+
 def get_current_term(client:httpx.Client):
     try:
-        return Term(client.get(f'{BASE_URL}/sejm/term').json()[-1])
+        return get_json(client, f'{BASE_URL}/sejm/term', _last_term)
     except httpx.RequestError as exc:
         print(f'Error occurred while requesting data: {exc}')
     except KeyError as exc:
@@ -34,26 +44,18 @@ def get_current_term(client:httpx.Client):
 
 
 def get_term(client:httpx.Client, term:int):
-    res = client.get(f'{BASE_URL}/sejm/term{term}')
-    res.raise_for_status()
-    return Term(res.json())
+    return get_json(client, f'{BASE_URL}/sejm/term{term}', Term)
 
 async def async_get_current_term(client:httpx.AsyncClient):
     try:
-        res = await client.get(f'{BASE_URL}/sejm/term')
+        return await async_get_json(client, f'{BASE_URL}/sejm/term', _last_term)
     except httpx.RequestError as exc:
         print(f'Error occurred while requesting data: {exc}')
-        return
-    try:
-        t = Term(res.json()[-1])
-        return t
     except KeyError as exc:
         print(f'Invalid response structure: {exc}')
 
 async def async_get_term(client:httpx.AsyncClient, term:int):
-    res = await client.get(f'{BASE_URL}/sejm/term{term}')
-    res.raise_for_status()
-    return Term(res.json())
+    return await async_get_json(client, f'{BASE_URL}/sejm/term{term}', Term)
 
 __all__ = ['Prints', 'Term', 'get_current_term', 'get_term', 'async_get_term', 'async_get_current_term']
 
@@ -0,0 +1,195 @@
+"""Eksport wszystkich wypowiedzi z kadencji do plików kolumnowych.
+
+Potok przechodzi get_proceedings -> Proceeding.dates -> get_transcript i zapisuje wiersze wypowiedzi bez tworzenia
+obiektów Statement, bezpośrednio ze zdekodowanego JSON-a. Wiersze są buforowane najwyżej po batch_size i
+zapisywane partiami, więc zużycie pamięci nie zależy od długości kadencji. Format wyjściowy:
+
+- parquet - plik Parquet (każda partia to osobna grupa wierszy), wymaga pakietu pyarrow,
+- jsonl - plik JSON Lines skompresowany gzip, w którym każda linia to jedna partia zapisana kolumnami,
+  np. {"proceeding": [1, 1], "num": [0, 1], ...}.
+
+Domyślnie wybierany jest parquet, jeśli pyarrow jest zainstalowany. Daty i godziny zapisywane są jako tekst ISO.
+"""
+from .proceedings import get_proceedings, async_get_proceedings
+from .utils import BASE_URL
+from ..transport import get_json, async_get_json
+from ..concurrency import bounded_as_completed
+import gzip
+import json
+import httpx
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+# kolumna: (klucz w odpowiedzi API, typ pyarrow)
+COLUMNS = {
+    'proceeding': (None, 'int32'),
+    'date': (None, 'string'),
+    'num': ('num', 'int32'),
+    'member_id': ('memberID', 'int32'),
+    'name': ('name', 'string'),
+    'function': ('function', 'string'),
+    'rapporteur': ('rapporteur', 'bool_'),
+    'secretary': ('secretary', 'bool_'),
+    'unspoken': ('unspoken', 'bool_'),
+    'start_datetime': ('startDateTime', 'string'),
+    'end_datetime': ('endDateTime', 'string'),
+}
+
+
+class JsonlColumnWriter:
+    """Zapisuje partie kolumn jako linie JSON w pliku gzip"""
+    def __init__(self, path:str):
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+
+    def write(self, columns:dict):
+        self._file.write(json.dumps(columns, ensure_ascii=False))
+        self._file.write('\n')
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetColumnWriter:
+    """Zapisuje partie kolumn jako grupy wierszy pliku Parquet"""
+    def __init__(self, path:str):
+        if pyarrow is None:
+            raise ImportError('Format parquet wymaga pakietu pyarrow: pip install pyarrow')
+        self.schema = pyarrow.schema([(name, getattr(pyarrow, kind)()) for name, (_, kind) in COLUMNS.items()])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write(self, columns:dict):
+        self._writer.write_table(pyarrow.table(columns, schema=self.schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def open_writer(path:str, format:str=None):
+    """Otwiera zapis w formacie parquet lub jsonl (None - parquet, jeśli dostępny jest pyarrow)"""
+    if format is None:
+        format = 'parquet' if pyarrow is not None else 'jsonl'
+    if format == 'parquet':
+        return ParquetColumnWriter(path)
+    if format == 'jsonl':
+        return JsonlColumnWriter(path)
+    raise ValueError(f'Nieznany format: {format}')
+
+def iter_batches(path:str):
+    """Zwraca kolejne partie zapisanego pliku jako słowniki kolumn (format rozpoznawany po zawartości)"""
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    if magic == b'PAR1':
+        if pyarrow is None:
+            raise ImportError('Odczyt pliku parquet wymaga pakietu pyarrow: pip install pyarrow')
+        parquet = pyarrow.parquet.ParquetFile(path)
+        for i in range(parquet.num_row_groups):
+            yield parquet.read_row_group(i).to_pydict()
+        return
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+class _Buffer:
+    """Bufor kolumn zapisywany partiami po batch_size wierszy"""
+    def __init__(self, writer, batch_size:int):
+        self.writer = writer
+        self.batch_size = batch_size
+        self.rows = 0
+        self.total = 0
+        self.columns = {name: [] for name in COLUMNS}
+
+    def extend(self, proceeding:int, day:str, statements:list[dict]):
+        columns = self.columns
+        for raw in statements:
+            columns['proceeding'].append(proceeding)
+            columns['date'].append(day)
+            for name, (key, _) in COLUMNS.items():
+                if key is not None:
+                    columns[name].append(raw.get(key))
+            self.rows += 1
+            if self.rows >= self.batch_size:
+                self.flush()
+                columns = self.columns
+
+    def flush(self):
+        if self.rows:
+            self.writer.write(self.columns)
+            self.total += self.rows
+            self.rows = 0
+            self.columns = {name: [] for name in COLUMNS}
+
+
+class ExportResult:
+    __slots__ = ('days', 'statements', 'failed')
+
+    def __init__(self, days:int, statements:int, failed:list):
+        self.days = days
+        self.statements = statements
+        self.failed = failed
+
+    def __str__(self):
+        return f'ExportResult(days={self.days}, statements={self.statements}, failed={len(self.failed)})'
+
+
+def _days(proceedings):
+    return [(p.number, str(d)) for p in proceedings for d in p.dates if d is not None]
+
+def _transcript_url(term:int, proceeding:int, day:str):
+    return f'{BASE_URL}/sejm/term{term}/proceedings/{proceeding}/{day}/transcripts'
+
+def export_transcripts(session:httpx.Client, term:int, path:str, format:str=None, batch_size:int=10000, progress=None):
+    """Zapisuje wszystkie wypowiedzi z kadencji do pliku path. Dni, których nie udało się pobrać, są pomijane
+    i zwracane w ExportResult.failed. Opcjonalna funkcja progress(done, total) jest wywoływana po każdym dniu"""
+    days = _days(get_proceedings(session, term))
+    writer = open_writer(path, format)
+    buffer, failed = _Buffer(writer, batch_size), []
+    try:
+        for done, (proceeding, day) in enumerate(days, 1):
+            try:
+                raw = get_json(session, _transcript_url(term, proceeding, day))
+            except httpx.HTTPError:
+                failed.append((proceeding, day))
+            else:
+                buffer.extend(proceeding, day, raw.get('statements', []))
+            if progress is not None:
+                progress(done, len(days))
+        buffer.flush()
+    finally:
+        writer.close()
+    return ExportResult(len(days), buffer.total, failed)
+
+async def async_export_transcripts(session:httpx.AsyncClient, term:int, path:str, format:str=None, batch_size:int=10000,
+                                   concurrency:int=4, progress=None):
+    """Zapisuje wszystkie wypowiedzi z kadencji do pliku path, pobierając najwyżej concurrency dni naraz.
+    Wiersze są zapisywane w kolejności pobrania"""
+    days = _days(await async_get_proceedings(session, term))
+    writer = open_writer(path, format)
+    buffer, failed = _Buffer(writer, batch_size), []
+
+    async def fetch(proceeding, day):
+        try:
+            return proceeding, day, await async_get_json(session, _transcript_url(term, proceeding, day))
+        except httpx.HTTPError:
+            return proceeding, day, None
+    try:
+        done = 0
+        async for proceeding, day, raw in bounded_as_completed((fetch(p, d) for p, d in days), concurrency):
+            if raw is None:
+                failed.append((proceeding, day))
+            else:
+                buffer.extend(proceeding, day, raw.get('statements', []))
+            done += 1
+            if progress is not None:
+                progress(done, len(days))
+        buffer.flush()
+    finally:
+        writer.close()
+    return ExportResult(len(days), buffer.total, failed)
+
+__all__ = ['COLUMNS', 'JsonlColumnWriter', 'ParquetColumnWriter', 'open_writer', 'iter_batches', 'ExportResult',
+           'export_transcripts', 'async_export_transcripts']
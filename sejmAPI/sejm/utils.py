@@ -1,4 +1,5 @@
 from datetime import datetime
+from ..lazy import LazyDate, LazyDateTime
 
 BASE_URL = "https://api.sejm.gov.pl"
 
@@ -18,4 +19,4 @@ def parse_normal_date(date_str:str, format:str):
     except ValueError:
         return None
 
-__all__ = ['BASE_URL', 'filter_query_params', 'parse_iso_format', 'parse_normal_date']
\ No newline at end of file
+__all__ = ['BASE_URL', 'filter_query_params', 'parse_iso_format', 'parse_normal_date', 'LazyDate', 'LazyDateTime']
\ No newline at end of file
@@ -1,14 +1,21 @@
-from .utils import BASE_URL, filter_query_params, parse_iso_format
+from .utils import BASE_URL, filter_query_params, LazyDateTime
+from ..transport import get_json, async_get_json
+from ..pagination import iter_pages, aiter_pages
 from datetime import date
 import httpx
 
 class Video:
+    __slots__ = ('committee', 'description', '_end_date_time', 'room', '_start_date_time', 'title', 'transcribe',
+                 'type', 'unid', 'video_link', 'other_video_links', 'video_messages_link', 'sign_lang_link', 'audio')
+    end_date_time = LazyDateTime()
+    start_date_time = LazyDateTime()
+
     def __init__(self, raw: dict):
         self.committee = raw.get('committee', '')  # Nazwa komisji
         self.description = raw.get('description', '')  # Opis wydarzenia
-        self.end_date_time = parse_iso_format(raw.get('endDateTime', ''))  # Czas zakończenia
+        self.end_date_time = raw.get('endDateTime', '')  # Czas zakończenia
         self.room = raw.get('room', '')  # Sala, w której odbywa się wydarzenie
-        self.start_date_time = parse_iso_format(raw.get('startDateTime', ''))  # Czas rozpoczęcia
+        self.start_date_time = raw.get('startDateTime', '')  # Czas rozpoczęcia
         self.title = raw.get('title', '')  # Tytuł wydarzenia
         self.transcribe = raw.get('transcribe', False)  # Flaga dotycząca transkrypcji
         self.type = raw.get('type', '')  # Typ wydarzenia (np. "komisja")
@@ -26,52 +33,50 @@ class Video:
 def get_videos(session:httpx.Client, term:int, offset:int=None, limit:int=None, committee:str=None, since:date=None,till:date=None, title:str=None, committee_type:str=None):
     """Zwraca listę transmisji wideo"""
     params = filter_query_params(offset=offset, limit=limit, committee=committee, till=till, title=title, since=since, committee_type=committee_type)
-    res = session.get(f'{BASE_URL}/sejm/term{term}/videos', params=params)
-    res.raise_for_status()
-    return list(map(lambda d:Video(d), res.json()))
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/videos', Video, many=True, params=params)
+
+def iter_videos(session:httpx.Client, term:int, page_size:int=50, **filters):
+    """Zwraca kolejno wszystkie transmisje wideo, pobierając je stronami.
+    Parametry filters odpowiadają parametrom get_videos (bez offset i limit)"""
+    def fetch_page(offset, limit):
+        return get_videos(session, term, offset=offset, limit=limit, **filters), None
+    return iter_pages(fetch_page, page_size)
+
+def aiter_videos(session:httpx.AsyncClient, term:int, page_size:int=50, prefetch:int=4, **filters):
+    """Asynchronicznie zwraca wszystkie transmisje wideo, pobierając do prefetch stron naraz.
+    Parametry filters odpowiadają parametrom get_videos (bez offset i limit)"""
+    async def fetch_page(offset, limit):
+        return await async_get_videos(session, term, offset=offset, limit=limit, **filters), None
+    return aiter_pages(fetch_page, page_size, prefetch=prefetch)
 
 def get_today_videos(session:httpx.Client, term:int):
     """Pobiera listę transmisji wideo dla dzisiejszego dnia"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/videos/today')
-    res.raise_for_status()
-    return list(map(lambda d: Video(d), res.json()))
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/videos/today', Video, many=True)
 
 async def async_get_videos(session:httpx.AsyncClient, term:int, offset:int=None, limit:int=None, committee:str=None, since:date=None,till:date=None, title:str=None, committee_type:str=None):
     """Zwraca listę transmisji wideo"""
     params = filter_query_params(offset=offset, limit=limit, committee=committee, till=till, title=title, since=since, committee_type=committee_type)
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/videos', params=params)
-    res.raise_for_status()
-    return list(map(lambda d:Video(d), res.json()))
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/videos', Video, many=True, params=params)
 
 async def async_get_today_videos(session: httpx.AsyncClient, term: int):
     """Pobiera listę transmisji wideo dla dzisiejszego dnia"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/videos/today')
-    res.raise_for_status()
-    return list(map(lambda d: Video(d), res.json()))
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/videos/today', Video, many=True)
 
 def get_videos_for_date(session:httpx.Client, term:int, d:date):
     """Pobiera listę transmisji wideo dla danej daty"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/videos/{str(d)}')
-    res.raise_for_status()
-    return list(map(lambda e: Video(e), res.json()))
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/videos/{str(d)}', Video, many=True)
 
 async def async_get_videos_for_date(session:httpx.AsyncClient, term:int, d:date):
     """Pobiera listę transmisji wideo dla danej daty"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/videos/{str(d)}')
-    res.raise_for_status()
-    return list(map(lambda e: Video(e), res.json()))
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/videos/{str(d)}', Video, many=True)
 
 def get_video_details(session:httpx.Client, term:int, unid:str):
     """Zwróć informacje na temat danej transmisji wideo"""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/videos/{unid}')
-    res.raise_for_status()
-    return Video(res.json())
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/videos/{unid}', Video)
 
 async def async_get_video_details(session:httpx.AsyncClient, term:int, unid:str):
     """Zwróć informacje na temat danej transmisji wideo"""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/videos/{unid}')
-    res.raise_for_status()
-    return Video(res.json())
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/videos/{unid}', Video)
 
 __all__ = ['Video', 'get_videos', 'get_today_videos', 'async_get_videos', 'async_get_today_videos', 'get_video_details', 'get_videos_for_date',
-           'async_get_video_details', 'async_get_videos_for_date']
+           'async_get_video_details', 'async_get_videos_for_date', 'iter_videos', 'aiter_videos']
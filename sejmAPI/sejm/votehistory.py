@@ -0,0 +1,198 @@
+"""Historie głosowań wszystkich posłów budowane z odwróconych szczegółów głosowań.
+
+Zamiast wywoływać get_mp_vote osobno dla każdego posła i dnia posiedzenia, moduł pobiera szczegóły wszystkich
+głosowań kadencji (jedno zapytanie na głosowanie, przez wspólną warstwę transport z jej pamięcią podręczną)
+i odwraca listy Voting.votes. Dla każdego posła przechowywane są tylko numery głosowań i kody głosów, a obiekty
+VoteMP są tworzone dopiero przy odczycie. Dni, dla których nie udało się pobrać szczegółów głosowania lub listy
+głosowań posiedzenia (luki), są uzupełniane wywołaniami get_mp_vote. Luki, których nie udało się uzupełnić, pozostają
+w polu gaps. Głosowania bez daty, których szczegółów nie udało się pobrać, nie mogą być uzupełnione przez get_mp_vote
+i są zgłaszane osobno w polu undated jako pary (posiedzenie, numer głosowania).
+"""
+from .votings import Vote, Voting, get_votings, async_get_votings, get_voting_list, async_get_voting_list, \
+    get_voting_details, async_get_voting_details
+from .mp import VoteMP, get_mps, async_get_mps, get_mp_vote, async_get_mp_vote
+from ..concurrency import bounded_as_completed, gather_bounded
+from array import array
+from datetime import date
+import httpx
+
+_VOTES = list(Vote.VoteValueEnum)
+_CODES = {v: i for i, v in enumerate(_VOTES)}
+
+
+class VotingHistories:
+    """Historie głosowań posłów w jednej kadencji"""
+    def __init__(self, term:int):
+        self.term = term
+        self.gaps = set()
+        self.undated = set()
+        self._votings = []
+        self._keys = {}
+        self._mp_votings = {}
+        self._mp_codes = {}
+        self._list_votes = {}
+        self._fallback = {}
+
+    def add_voting(self, voting:Voting):
+        """Dodaje głosowanie ze szczegółami (z wypełnionym polem votes)"""
+        key = (voting.sitting, voting.votingNumber)
+        if key in self._keys:
+            return
+        index = self._keys[key] = len(self._votings)
+        self._votings.append((voting.sitting, voting.date.date() if voting.date else None, {
+            'votingNumber': voting.votingNumber, 'date': voting.date, 'title': voting.title,
+            'description': voting.description, 'topic': voting.topic, 'kind': voting.kind}))
+        for vote in voting.votes:
+            votings = self._mp_votings.get(vote.mp)
+            if votings is None:
+                votings = self._mp_votings[vote.mp] = array('I')
+                self._mp_codes[vote.mp] = array('b')
+            votings.append(index)
+            self._mp_codes[vote.mp].append(_CODES[vote.vote])
+            if vote.list_votes:
+                self._list_votes[(vote.mp, index)] = list(vote.list_votes.values())
+
+    def add_gap(self, sitting:int, day:date):
+        """Oznacza dzień posiedzenia, dla którego brakuje szczegółów głosowań"""
+        self.gaps.add((sitting, day))
+
+    def add_missing(self, voting:Voting):
+        """Oznacza głosowanie, którego szczegółów nie udało się pobrać: jako lukę jego dnia lub, gdy głosowanie
+        nie ma daty, w polu undated"""
+        if voting.date:
+            self.add_gap(voting.sitting, voting.date.date())
+        else:
+            self.undated.add((voting.sitting, voting.votingNumber))
+
+    def set_fallback(self, mp_id:int, sitting:int, day:date, votes:list[VoteMP]):
+        """Zapisuje wynik get_mp_vote dla dnia z luką"""
+        self._fallback[(mp_id, sitting, day)] = votes
+
+    @property
+    def mp_ids(self):
+        return sorted(self._mp_votings.keys() | {mp_id for mp_id, _, _ in self._fallback})
+
+    def days(self):
+        """Zwraca posortowane pary (posiedzenie, dzień), dla których są dane"""
+        return sorted({(sitting, day) for sitting, day, _ in self._votings} | self.gaps)
+
+    def _vote_mp(self, mp_id:int, index:int, code:int):
+        _, _, base = self._votings[index]
+        return VoteMP({**base, 'vote': _VOTES[code].value, 'listVotes': self._list_votes.get((mp_id, index), [])})
+
+    def get(self, mp_id:int, sitting:int, day:date):
+        """Odpowiednik get_mp_vote(term, mp_id, sitting, day). Dla dnia z luką bez danych z get_mp_vote zwraca
+        tylko głosowania, których szczegóły udało się pobrać"""
+        fallback = self._fallback.get((mp_id, sitting, day))
+        if fallback is not None:
+            return list(fallback)
+        votings, codes = self._mp_votings.get(mp_id, ()), self._mp_codes.get(mp_id, ())
+        result = [self._vote_mp(mp_id, i, c) for i, c in zip(votings, codes) if self._votings[i][:2] == (sitting, day)]
+        result.sort(key=lambda v: v.voting_number)
+        return result
+
+    def history(self, mp_id:int):
+        """Zwraca całą historię posła jako listę par (posiedzenie, VoteMP), uporządkowaną wg posiedzenia i numeru głosowania"""
+        # Dni uzupełnione przez get_mp_vote zawierają wszystkie głosowania z tego dnia
+        result = [(self._votings[i][0], self._vote_mp(mp_id, i, c))
+                  for i, c in zip(self._mp_votings.get(mp_id, ()), self._mp_codes.get(mp_id, ()))
+                  if (mp_id, *self._votings[i][:2]) not in self._fallback]
+        for (fallback_mp, sitting, _), votes in self._fallback.items():
+            if fallback_mp == mp_id:
+                result.extend((sitting, v) for v in votes)
+        result.sort(key=lambda pair: (pair[0], pair[1].voting_number))
+        return result
+
+    def __len__(self):
+        return len(self._votings)
+
+    def __str__(self):
+        return (f'VotingHistories(term={self.term}, votings={len(self._votings)}, mps={len(self._mp_votings)}, '
+                f'gaps={len(self.gaps)}, undated={len(self.undated)})')
+
+
+def _proceeding_days(sittings):
+    """Zwraca słownik posiedzenie -> dni z głosowaniami (w kolejności z get_votings)"""
+    days = {}
+    for sitting in sittings:
+        if sitting.votings_num:
+            days.setdefault(sitting.proceeding, [])
+            if sitting.date is not None:
+                days[sitting.proceeding].append(sitting.date)
+    return days
+
+def _add_list_gap(histories:VotingHistories, proceeding:int, days:list[date]):
+    """Oznacza jako luki wszystkie dni posiedzenia, którego listy głosowań nie udało się pobrać"""
+    for day in days:
+        histories.add_gap(proceeding, day)
+
+def build_voting_histories(session:httpx.Client, term:int, fill_gaps:bool=True):
+    """Buduje historie głosowań wszystkich posłów z szczegółów głosowań kadencji"""
+    histories = VotingHistories(term)
+    for proceeding, days in _proceeding_days(get_votings(session, term)).items():
+        try:
+            votings = get_voting_list(session, term, proceeding)
+        except httpx.HTTPError:
+            _add_list_gap(histories, proceeding, days)
+            continue
+        for voting in votings:
+            try:
+                histories.add_voting(get_voting_details(session, term, voting.sitting, voting.votingNumber))
+            except httpx.HTTPError:
+                histories.add_missing(voting)
+    if fill_gaps and histories.gaps:
+        mp_ids = {mp.id for mp in get_mps(session, term)}
+        for sitting, day in sorted(histories.gaps):
+            for mp_id in sorted(mp_ids):
+                try:
+                    histories.set_fallback(mp_id, sitting, day, get_mp_vote(session, term, mp_id, sitting, day))
+                except httpx.HTTPError:
+                    continue
+    return histories
+
+async def async_build_voting_histories(session:httpx.AsyncClient, term:int, concurrency:int=8, fill_gaps:bool=True,
+                                       progress=None):
+    """Buduje historie głosowań wszystkich posłów, pobierając najwyżej concurrency szczegółów głosowań naraz.
+    Opcjonalna funkcja progress(done, total) jest wywoływana po pobraniu każdego głosowania"""
+    histories = VotingHistories(term)
+    days = _proceeding_days(await async_get_votings(session, term))
+
+    async def voting_list(proceeding:int):
+        try:
+            return await async_get_voting_list(session, term, proceeding)
+        except httpx.HTTPError:
+            _add_list_gap(histories, proceeding, days[proceeding])
+            return []
+    voting_lists = await gather_bounded((voting_list(p) for p in days), concurrency)
+    votings = [v for voting_list in voting_lists for v in voting_list]
+
+    async def details(voting:Voting):
+        try:
+            return voting, await async_get_voting_details(session, term, voting.sitting, voting.votingNumber)
+        except httpx.HTTPError:
+            return voting, None
+    done = 0
+    async for voting, detail in bounded_as_completed((details(v) for v in votings), concurrency):
+        if detail is None:
+            histories.add_missing(voting)
+        else:
+            histories.add_voting(detail)
+        done += 1
+        if progress is not None:
+            progress(done, len(votings))
+
+    if fill_gaps and histories.gaps:
+        mp_ids = sorted(mp.id for mp in await async_get_mps(session, term))
+        jobs = [(mp_id, sitting, day) for sitting, day in sorted(histories.gaps) for mp_id in mp_ids]
+
+        async def fallback(mp_id, sitting, day):
+            try:
+                return mp_id, sitting, day, await async_get_mp_vote(session, term, mp_id, sitting, day)
+            except httpx.HTTPError:
+                return mp_id, sitting, day, None
+        async for mp_id, sitting, day, votes in bounded_as_completed((fallback(*job) for job in jobs), concurrency):
+            if votes is not None:
+                histories.set_fallback(mp_id, sitting, day, votes)
+    return histories
+
+__all__ = ['VotingHistories', 'build_voting_histories', 'async_build_voting_histories']
@@ -0,0 +1,128 @@
+"""Macierz głosów posłów w całej kadencji oparta o NumPy.
+
+Wiersze odpowiadają posłom (mp_ids), kolumny głosowaniom (votings - pary posiedzenie, numer głosowania).
+Komórki przechowują kody głosów typu int8 (VOTE_CODES), a 0 oznacza brak posła na liście głosujących.
+Moduł wymaga pakietu numpy (pip install sejmAPI[numpy]) i nie jest importowany przez sejmAPI.sejm.
+"""
+from .votings import Vote, Voting, fetch_term_votings
+import httpx
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+NO_DATA = 0
+VOTE_CODES = {
+    Vote.VoteValueEnum.yes: 1,
+    Vote.VoteValueEnum.no: 2,
+    Vote.VoteValueEnum.abstain: 3,
+    Vote.VoteValueEnum.no_vote: 4,
+    Vote.VoteValueEnum.absent: 5,
+    Vote.VoteValueEnum.vote_valid: 6,
+    Vote.VoteValueEnum.vote_invalid: 7,
+}
+PRESENT_CODES = (1, 2, 3, 6, 7)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('VoteMatrix wymaga pakietu numpy: pip install numpy')
+
+
+class VoteMatrix:
+    """Macierz głosów int8 o wymiarach (liczba posłów, liczba głosowań) z równoległą tablicą klubów"""
+    def __init__(self, values, mp_ids, votings, clubs):
+        _require_numpy()
+        self.values = values
+        self.mp_ids = mp_ids
+        self.votings = votings
+        self.clubs = clubs
+        self._mp_index = {int(mp): i for i, mp in enumerate(mp_ids)}
+        self._voting_index = {(int(s), int(n)): i for i, (s, n) in enumerate(votings)}
+
+    @classmethod
+    def from_votings(cls, votings:list[Voting]):
+        """Buduje macierz z listy głosowań ze szczegółami (Voting lub VotingDetails z wypełnionym polem votes).
+        Jako klub posła przyjmowany jest klub z ostatniego głosowania"""
+        _require_numpy()
+        votings = sorted(votings, key=lambda v: (v.sitting, v.votingNumber))
+        clubs = {}
+        for voting in votings:
+            for vote in voting.votes:
+                clubs[vote.mp] = vote.club
+        mp_ids = np.array(sorted(clubs), dtype=np.int32)
+        mp_index = {int(mp): i for i, mp in enumerate(mp_ids)}
+        values = np.zeros((len(mp_ids), len(votings)), dtype=np.int8)
+        for column, voting in enumerate(votings):
+            rows = [mp_index[vote.mp] for vote in voting.votes]
+            codes = [VOTE_CODES[vote.vote] for vote in voting.votes]
+            values[rows, column] = codes
+        voting_keys = np.array([(v.sitting, v.votingNumber) for v in votings], dtype=np.int32).reshape(-1, 2)
+        club_labels = np.array([clubs[int(mp)] for mp in mp_ids], dtype=str)
+        return cls(values, mp_ids, voting_keys, club_labels)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def mp_index(self, mp_id:int):
+        return self._mp_index[mp_id]
+
+    def voting_index(self, sitting:int, voting_number:int):
+        return self._voting_index[(sitting, voting_number)]
+
+    def mp_votes(self, mp_id:int):
+        """Zwraca wiersz kodów głosów danego posła"""
+        return self.values[self._mp_index[mp_id]]
+
+    def voting_votes(self, sitting:int, voting_number:int):
+        """Zwraca kolumnę kodów głosów dla danego głosowania"""
+        return self.values[:, self._voting_index[(sitting, voting_number)]]
+
+    def counts(self, vote:Vote.VoteValueEnum):
+        """Liczba głosów danego rodzaju w każdym głosowaniu"""
+        return np.count_nonzero(self.values == VOTE_CODES[vote], axis=0)
+
+    def yes_counts(self):
+        return self.counts(Vote.VoteValueEnum.yes)
+
+    def no_counts(self):
+        return self.counts(Vote.VoteValueEnum.no)
+
+    def abstain_counts(self):
+        return self.counts(Vote.VoteValueEnum.abstain)
+
+    def attendance(self):
+        """Odsetek głosowań, w których poseł oddał głos, spośród głosowań, w których był na liście"""
+        present = np.isin(self.values, PRESENT_CODES).sum(axis=1)
+        listed = np.count_nonzero(self.values != NO_DATA, axis=1)
+        return np.divide(present, listed, out=np.zeros(len(present), dtype=np.float64), where=listed > 0)
+
+    def club_tallies(self, vote:Vote.VoteValueEnum):
+        """Zwraca krotkę (nazwy klubów, macierz liczba klubów x liczba głosowań) z liczbą głosów danego rodzaju"""
+        labels, inverse = np.unique(self.clubs, return_inverse=True)
+        membership = np.zeros((len(labels), len(self.mp_ids)), dtype=np.int32)
+        membership[inverse, np.arange(len(self.mp_ids))] = 1
+        return labels, membership @ (self.values == VOTE_CODES[vote]).astype(np.int32)
+
+    def save(self, path:str):
+        """Zapisuje macierz do pliku .npz"""
+        np.savez_compressed(path, values=self.values, mp_ids=self.mp_ids, votings=self.votings, clubs=self.clubs)
+
+    @classmethod
+    def load(cls, path:str):
+        """Wczytuje macierz zapisaną metodą save"""
+        _require_numpy()
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['values'], data['mp_ids'], data['votings'], data['clubs'])
+
+    def __str__(self):
+        return f'VoteMatrix(mps={self.shape[0]}, votings={self.shape[1]})'
+
+
+async def async_build_vote_matrix(session:httpx.AsyncClient, term:int, concurrency:int=8, progress=None):
+    """Pobiera wszystkie głosowania kadencji (fetch_term_votings) i buduje z nich VoteMatrix"""
+    return VoteMatrix.from_votings([v async for v in fetch_term_votings(session, term, concurrency, progress)])
+
+__all__ = ['NO_DATA', 'VOTE_CODES', 'PRESENT_CODES', 'VoteMatrix', 'async_build_vote_matrix']
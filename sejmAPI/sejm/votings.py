@@ -1,9 +1,14 @@
 from enum import StrEnum
-from .utils import BASE_URL, parse_normal_date, parse_iso_format, filter_query_params
+from .utils import BASE_URL, filter_query_params, LazyDate, LazyDateTime
+from ..transport import get_json, async_get_json
+from ..concurrency import bounded_as_completed, gather_bounded
 from datetime import date
 import httpx
+import sys
 
 class VotingOption:
+    __slots__ = ('option_index', 'option', 'description', 'votes')
+
     def __init__(self, raw:dict):
         self.option_index = raw.get('optionIndex', -1)
         self.option = raw.get('option', '')
@@ -13,6 +18,10 @@ class VotingOption:
     def __str__(self):
         return f'VotingOption(option={self.option}, votes={self.votes})'
 
+def _intern(value):
+    # Nazwy klubów i posłów powtarzają się w każdym głosowaniu, więc współdzielimy jedną kopię napisu
+    return sys.intern(value) if isinstance(value, str) else value
+
 class Vote:
     class VoteValueEnum(StrEnum):
         yes="YES"
@@ -23,12 +32,14 @@ class Vote:
         vote_valid="VOTE_VALID"
         vote_invalid = "VOTE_INVALID"
 
+    __slots__ = ('mp', 'mP', 'club', 'first_name', 'last_name', 'vote', 'list_votes')
+
     def __init__(self, raw:dict):
         self.mp = raw.get('MP', -1)
         self.mP = raw.get('mP', -1)
-        self.club = raw.get('club', '')
-        self.first_name = raw.get('firstName', '')
-        self.last_name = raw.get('lastName', '')
+        self.club = _intern(raw.get('club', ''))
+        self.first_name = _intern(raw.get('firstName', ''))
+        self.last_name = _intern(raw.get('lastName', ''))
         self.vote = Vote.VoteValueEnum(raw.get('vote'))
         self.list_votes = {k:Vote.VoteValueEnum(v) for k, v in raw.get('listVotes', {})}
 
@@ -41,6 +52,10 @@ class Voting:
         traditional='TRADITIONAL'
         on_list='ON_LIST'
 
+    __slots__ = ('term', 'sitting', 'sittingDay', 'votingNumber', 'yes', 'no', 'abstain', 'notParticipating',
+                 'totalVoted', '_date', 'title', 'description', 'topic', 'pdfLink', 'kind', 'votingOptions', 'votes')
+    date = LazyDateTime()
+
     def __init__(self, raw: dict):
         self.term = raw.get('term', -1)
         self.sitting = raw.get('sitting', -1)
@@ -51,7 +66,7 @@ class Voting:
         self.abstain = raw.get('abstain', -1)
         self.notParticipating = raw.get('notParticipating', -1)
         self.totalVoted = raw.get('totalVoted', -1)
-        self.date = parse_iso_format(raw.get('date', ''))
+        self.date = raw.get('date', '')
         self.title = raw.get('title', '')
         self.description = raw.get('description', '')
         self.topic = raw.get('topic', '')
@@ -65,8 +80,11 @@ class Voting:
 
 
 class Sitting:
+    __slots__ = ('_date', 'proceeding', 'votings_num')
+    date = LazyDate()
+
     def __init__(self, raw:dict):
-        self.date = parse_normal_date(raw.get('date'), '%Y-%m-%d')
+        self.date = raw.get('date')
         self.proceeding = raw.get('proceeding')
         self.votings_num = raw.get('votingsNum')
 
@@ -74,6 +92,10 @@ class Sitting:
         return f'Sitting(date={self.date}, proceeding={self.proceeding}, votings_num={self.votings_num})'
 
 class VotingDetails:
+    __slots__ = ('term', 'sitting', 'sittingDay', 'votingNumber', 'yes', 'no', 'abstain', 'notParticipating',
+                 'totalVoted', '_date', 'title', 'description', 'topic', 'pdfLink', 'kind', 'votingOptions', 'votes')
+    date = LazyDateTime()
+
     def __init__(self, raw:dict):
         self.term = raw.get('term', -1)
         self.sitting = raw.get('sitting', -1)
@@ -84,7 +106,7 @@ class VotingDetails:
         self.abstain = raw.get('abstain', -1)
         self.notParticipating = raw.get('notParticipating', -1)
         self.totalVoted = raw.get('totalVoted', -1)
-        self.date = parse_iso_format(raw.get('date', ''))
+        self.date = raw.get('date', '')
         self.title = raw.get('title', '')
         self.description = raw.get('description', '')
         self.topic = raw.get('topic', '')
@@ -95,62 +117,66 @@ class VotingDetails:
 
 def get_voting_list(session:httpx.Client, term:int, sitting:int):
     """Zwraca listę głosowań na danym posiedzeniu Sejmu."""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/votings/{sitting}')
-    res.raise_for_status()
-    return list(map(lambda d:Voting(d), res.json()))
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/votings/{sitting}', Voting, many=True)
 
 def get_votings(session:httpx.Client, term:int):
     """Zwraca listę posiedzeń dla danej kadencji."""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/votings')
-    res.raise_for_status()
-    return list(map(lambda d:Sitting(d), res.json()))
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/votings', Sitting, many=True)
 
 def get_voting_details(session:httpx.Client, term:int, sitting:int, voting_num:int):
     """Zwraca szczegóły głosowania na danym posiedzeniu Sejmu."""
-    res = session.get(f'{BASE_URL}/sejm/term{term}/votings/{sitting}/{voting_num}')
-    res.raise_for_status()
-    return Voting(res.json())
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/votings/{sitting}/{voting_num}', Voting)
 
 def get_voting_search(session:httpx.Client, term:int, dateFrom:date=None, dateTo:date=None,proceeding:int=None, title:str=None):
     """Zwraca głosowania, które spełniają dane kryteria
     UWAGA: Parametry offset oraz limit sprawiają, że jest zwracany 403
     UWAGA: W przypadku za dużej ilości parametrów zostaje zwracany 403"""
     params = filter_query_params(dateFrom=dateFrom, dateTo=dateTo, proceeding=proceeding, title=title)
-    res = session.get(f'{BASE_URL}/sejm/term{term}/votings/search', params=params, headers = {
+    return get_json(session, f'{BASE_URL}/sejm/term{term}/votings/search', Voting, many=True, params=params, headers = {
     "accept": "application/json"
 })
-    res.raise_for_status()
-    return [Voting(v) for v in res.json()]
 
 async def async_get_voting_search(session:httpx.AsyncClient, term:int, dateFrom:date=None, dateTo:date=None,proceeding:int=None, title:str=None):
     """Zwraca głosowania, które spełniają dane kryteria
     UWAGA: Parametry offset oraz limit sprawiają, że jest zwracany 403
     UWAGA: W przypadku za dużej ilości parametrów zostaje zwracany 403"""
     params = filter_query_params(dateFrom=dateFrom, dateTo=dateTo, proceeding=proceeding, title=title)
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/votings/search', params=params, headers = {
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/votings/search', Voting, many=True, params=params, headers = {
     "accept": "application/json"
 })
-    res.raise_for_status()
-    return [Voting(v) for v in res.json()]
 
 async def async_get_voting_list(session: httpx.AsyncClient, term: int, sitting: int):
     """Zwraca listę głosowań na danym posiedzeniu Sejmu (wersja asynchroniczna)."""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/votings/{sitting}')
-    res.raise_for_status()
-    return list(map(lambda d: Voting(d), res.json()))
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/votings/{sitting}', Voting, many=True)
 
 async def async_get_votings(session: httpx.AsyncClient, term: int):
     """Zwraca listę posiedzeń dla danej kadencji (wersja asynchroniczna)."""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/votings')
-    res.raise_for_status()
-    return list(map(lambda d: Sitting(d), res.json()))
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/votings', Sitting, many=True)
 
 async def async_get_voting_details(session: httpx.AsyncClient, term: int, sitting: int, voting_num: int):
     """Zwraca szczegóły głosowania na danym posiedzeniu Sejmu (wersja asynchroniczna)."""
-    res = await session.get(f'{BASE_URL}/sejm/term{term}/votings/{sitting}/{voting_num}')
-    res.raise_for_status()
-    return Voting(res.json())
+    return await async_get_json(session, f'{BASE_URL}/sejm/term{term}/votings/{sitting}/{voting_num}', Voting)
+
+async def fetch_term_votings(session:httpx.AsyncClient, term:int, concurrency:int=8, progress=None):
+    """Zwraca (asynchronicznie, w kolejności pobrania) szczegóły wszystkich głosowań w kadencji razem z głosami posłów.
+    Jednocześnie wykonywanych jest najwyżej concurrency zapytań. Opcjonalna funkcja progress(done, total)
+    jest wywoływana po pobraniu każdego głosowania"""
+    sittings = await async_get_votings(session, term)
+    proceedings = list(dict.fromkeys(s.proceeding for s in sittings if s.votings_num))
+    voting_lists = await gather_bounded((async_get_voting_list(session, term, p) for p in proceedings), concurrency)
+    votings = [v for voting_list in voting_lists for v in voting_list]
+    total = len(votings)
+    done = 0
+    if progress is not None:
+        progress(done, total)
+    details = (async_get_voting_details(session, term, v.sitting, v.votingNumber) for v in votings)
+    async for voting in bounded_as_completed(details, concurrency):
+        done += 1
+        if progress is not None:
+            progress(done, total)
+        yield voting
 
 
 __all__ = ['VotingOption', 'Vote', 'Voting', 'Sitting', 'get_voting_list', 'get_votings', 'get_voting_details',
-           'async_get_voting_list', 'async_get_votings', 'async_get_voting_details', 'VotingDetails', 'get_voting_search', 'async_get_voting_search']
+           'async_get_voting_list', 'async_get_votings', 'async_get_voting_details', 'VotingDetails', 'get_voting_search', 'async_get_voting_search',
+           'fetch_term_votings']
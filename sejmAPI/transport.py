@@ -0,0 +1,482 @@
+"""Wspólna warstwa transportowa dla funkcji z pakietów sejm oraz eli.
+
+Wszystkie funkcje get_*/async_get_* wykonują zapytania przez ten moduł. Odpowiedzi JSON i tekstowe
+są zapamiętywane razem z walidatorami (ETag / Last-Modified), dzięki czemu kolejne zapytanie o ten sam
+zasób jest warunkowe, a odpowiedź 304 zwraca wcześniej sparsowany wynik.
+
+Opcjonalnie można ustawić trwałą pamięć podręczną (set_response_cache), z której świeże wpisy są
+zwracane bez kontaktu z API.
+
+Nieudane zapytania są ponawiane zgodnie z retry_policy (set_retry_policy), a tempo zapytań może być
+ograniczane adaptacyjnym limiterem (set_rate_limiter). Równoczesne, identyczne zapytania asynchroniczne mogą być
+łączone w jedno (set_single_flight) - wszyscy oczekujący dostają ten sam sparsowany wynik.
+
+Odpowiedzi JSON są dekodowane bezpośrednio z bajtów najszybszym dostępnym backendem (moduł decoding).
+
+Po włączeniu set_metrics zapisywane są bajty odpowiedzi, ponowienia, błędy połączenia oraz czasy dekodowania
+i tworzenia modeli (moduł metrics).
+
+Duże pliki (PDF, załączniki, zdjęcia) można pobierać strumieniowo funkcjami download/async_download,
+które zapisują dane porcjami i wznawiają przerwane pobieranie nagłówkiem Range.
+"""
+from collections import OrderedDict
+from threading import Lock
+import asyncio
+import hashlib
+import os
+import re
+import time
+import httpx
+from .cache import ResponseCache, CachedResponse
+from . import decoding
+from .ratelimit import RateLimiter, RetryPolicy
+from .concurrency import SingleFlight
+from .metrics import Metrics
+
+
+class _Entry:
+    __slots__ = ('etag', 'last_modified', 'value', 'size')
+
+    def __init__(self, etag, last_modified, value, size:int=0):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.value = value
+        self.size = size
+
+
+class ConditionalCache:
+    """Pamięć walidatorów oraz sparsowanych wyników, ograniczona do max_entries wpisów i max_bytes bajtów
+    odpowiedzi (LRU, rozmiar wpisu to len(res.content)). Odpowiedzi większe niż max_entry_bytes nie są zapamiętywane,
+    więc masowe pobieranie treści HTML czy dużych list nie trzyma ich w pamięci do końca procesu.
+    UWAGA: Przy trafieniu (304) zwracany jest ten sam obiekt modelu co przy poprzednim wywołaniu"""
+    def __init__(self, max_entries:int=1024, max_bytes:int=32 * 1024 * 1024, max_entry_bytes:int=1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    def lookup(self, key):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def store(self, key, res:httpx.Response, value):
+        with self._lock:
+            self.misses += 1
+            if not self.enabled:
+                return
+            etag = res.headers.get('etag')
+            last_modified = res.headers.get('last-modified')
+            size = len(res.content)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            if (etag is None and last_modified is None) or size > min(self.max_entry_bytes, self.max_bytes):
+                return
+            self._entries[key] = _Entry(etag, last_modified, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def hit(self, value):
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def stats(self):
+        """Zwraca liczniki trafień (304) i chybień (pełna odpowiedź)"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'bytes': self._bytes}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+conditional_cache = ConditionalCache()
+response_cache:ResponseCache|None = None
+
+retry_policy:RetryPolicy|None = RetryPolicy()
+rate_limiter:RateLimiter|None = None
+
+def set_response_cache(cache:ResponseCache|None):
+    """Ustawia trwałą pamięć podręczną używaną przez wszystkie funkcje get_*/async_get_* (None ją wyłącza)"""
+    global response_cache
+    response_cache = cache
+
+def set_retry_policy(policy:RetryPolicy|None):
+    """Ustawia politykę ponawiania zapytań (None wyłącza ponawianie)"""
+    global retry_policy
+    retry_policy = policy
+
+def set_rate_limiter(limiter:RateLimiter|None):
+    """Ustawia limiter tempa zapytań (domyślnie wyłączony)"""
+    global rate_limiter
+    rate_limiter = limiter
+
+single_flight:SingleFlight|None = None
+
+def set_single_flight(flight:SingleFlight|None):
+    """Włącza łączenie równoczesnych, identycznych zapytań async_get_json/async_get_text (domyślnie wyłączone)"""
+    global single_flight
+    single_flight = flight
+
+metrics:Metrics|None = None
+
+def set_metrics(collector:Metrics|None):
+    """Włącza zapisywanie pomiarów zapytań get_*/async_get_* (domyślnie wyłączone). Opóźnienia i kody statusu
+    mierzą haki dodawane do sesji przez Metrics.instrument"""
+    global metrics
+    metrics = collector
+
+
+def _is_throttled(status_code:int):
+    return status_code in (403, 429) or status_code >= 500
+
+def _next_delay(bucket, attempt:int, res:httpx.Response|None):
+    """Aktualizuje limiter na podstawie wyniku zapytania i zwraca czas do ponowienia lub None"""
+    if res is not None and not _is_throttled(res.status_code):
+        if bucket is not None and res.status_code < 400:
+            bucket.on_success()
+        return None
+    if bucket is not None:
+        bucket.on_throttle()
+    delay = retry_policy.delay(attempt, res) if retry_policy is not None else None
+    if delay is not None and bucket is not None and res is not None and 'retry-after' in res.headers:
+        bucket.pause(delay)
+    return delay
+
+def _send(session:httpx.Client, url:str, params:dict=None, headers:dict=None):
+    bucket = rate_limiter.bucket(url) if rate_limiter is not None else None
+    attempt = 0
+    while True:
+        if bucket is not None and (wait := bucket.reserve()) > 0:
+            time.sleep(wait)
+        try:
+            res = session.get(url, params=params, headers=headers)
+        except httpx.TransportError:
+            if metrics is not None:
+                metrics.record_error(url)
+            if (delay := _next_delay(bucket, attempt, None)) is None:
+                raise
+        else:
+            if (delay := _next_delay(bucket, attempt, res)) is None:
+                return res
+        if metrics is not None:
+            metrics.record_retry(url)
+        attempt += 1
+        time.sleep(delay)
+
+async def _async_send(session:httpx.AsyncClient, url:str, params:dict=None, headers:dict=None):
+    bucket = rate_limiter.bucket(url) if rate_limiter is not None else None
+    attempt = 0
+    while True:
+        if bucket is not None and (wait := bucket.reserve()) > 0:
+            await asyncio.sleep(wait)
+        try:
+            res = await session.get(url, params=params, headers=headers)
+        except httpx.TransportError:
+            if metrics is not None:
+                metrics.record_error(url)
+            if (delay := _next_delay(bucket, attempt, None)) is None:
+                raise
+        else:
+            if (delay := _next_delay(bucket, attempt, res)) is None:
+                return res
+        if metrics is not None:
+            metrics.record_retry(url)
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def _cache_key(url:str, params:dict|None, model, many:bool):
+    full_url = httpx.URL(url, params=params) if params else httpx.URL(url)
+    return str(full_url), model, many
+
+def _lookup(key):
+    entry = conditional_cache.lookup(key)
+    stored = response_cache.get(key[0]) if response_cache is not None else None
+    return entry, stored
+
+def _conditional_headers(headers:dict|None, entry:_Entry|None, stored:CachedResponse|None):
+    headers = dict(headers) if headers else {}
+    validators = entry if entry is not None else stored
+    if validators is not None:
+        if validators.etag is not None:
+            headers['If-None-Match'] = validators.etag
+        if validators.last_modified is not None:
+            headers['If-Modified-Since'] = validators.last_modified
+    return headers
+
+def _parse(data, model, many:bool):
+    if model is None or model is str:
+        return data
+    if many:
+        return [model(d) for d in data]
+    return model(data)
+
+def _decode_stored(stored:CachedResponse, model):
+    if model is str:
+        return stored.body.decode(stored.encoding or 'utf-8')
+    return decoding.loads(stored.body)
+
+def _measured_parse(res:httpx.Response, url:str, model, many:bool):
+    start = time.perf_counter()
+    data = res.text if model is str else decoding.loads(res.content)
+    decoded = time.perf_counter()
+    value = _parse(data, model, many)
+    metrics.record_parse(url, decoded - start)
+    if model is not None and model is not str:
+        metrics.record_model(url, time.perf_counter() - decoded)
+    metrics.record_bytes(url, res.num_bytes_downloaded or len(res.content))
+    return data, value
+
+def _result(value, many:bool):
+    # Lista jest kopiowana, aby zmiany po stronie wywołującego nie psuły wpisu w pamięci
+    return list(value) if many else value
+
+def _finish(res:httpx.Response, key, entry:_Entry|None, stored:CachedResponse|None, model, many:bool):
+    if res.status_code == 304 and (entry is not None or stored is not None):
+        if entry is not None:
+            value = conditional_cache.hit(entry.value)
+        else:
+            value = conditional_cache.hit(_parse(_decode_stored(stored, model), model, many))
+        if stored is not None:
+            response_cache.refresh(key[0], stored)
+    else:
+        res.raise_for_status()
+        if metrics is None:
+            data = res.text if model is str else decoding.loads(res.content)
+            value = _parse(data, model, many)
+        else:
+            data, value = _measured_parse(res, key[0], model, many)
+        conditional_cache.store(key, res, value)
+        if response_cache is not None:
+            response_cache.store(key[0], res, data)
+    return _result(value, many)
+
+
+def get_json(session:httpx.Client, url:str, model=None, many:bool=False, params:dict=None, headers:dict=None):
+    """Wykonuje zapytanie GET i zwraca odpowiedź JSON przekształconą przez model.
+    Jeśli many=True, model jest stosowany do każdego elementu zwróconej listy"""
+    key = _cache_key(url, params, model, many)
+    entry, stored = _lookup(key)
+    if stored is not None and stored.fresh:
+        return _result(_parse(_decode_stored(stored, model), model, many), many)
+    res = _send(session, url, params, _conditional_headers(headers, entry, stored))
+    return _finish(res, key, entry, stored, model, many)
+
+async def async_get_json(session:httpx.AsyncClient, url:str, model=None, many:bool=False, params:dict=None, headers:dict=None):
+    """Wykonuje zapytanie GET i zwraca odpowiedź JSON przekształconą przez model.
+    Jeśli many=True, model jest stosowany do każdego elementu zwróconej listy"""
+    key = _cache_key(url, params, model, many)
+    if single_flight is not None:
+        flight_key = (key, tuple(sorted(headers.items())) if headers else None)
+        return _result(await single_flight.do(flight_key, lambda: _async_fetch_json(session, url, key, model, many, params, headers)), many)
+    return await _async_fetch_json(session, url, key, model, many, params, headers)
+
+async def _async_fetch_json(session:httpx.AsyncClient, url:str, key, model, many:bool, params:dict, headers:dict):
+    entry, stored = _lookup(key)
+    if stored is not None and stored.fresh:
+        return _result(_parse(_decode_stored(stored, model), model, many), many)
+    res = await _async_send(session, url, params, _conditional_headers(headers, entry, stored))
+    return _finish(res, key, entry, stored, model, many)
+
+def get_text(session:httpx.Client, url:str, params:dict=None, headers:dict=None):
+    """Wykonuje zapytanie GET i zwraca treść odpowiedzi jako tekst"""
+    return get_json(session, url, str, params=params, headers=headers)
+
+async def async_get_text(session:httpx.AsyncClient, url:str, params:dict=None, headers:dict=None):
+    """Wykonuje zapytanie GET i zwraca treść odpowiedzi jako tekst"""
+    return await async_get_json(session, url, str, params=params, headers=headers)
+
+def get_response(session:httpx.Client, url:str, params:dict=None, headers:dict=None):
+    """Wykonuje zapytanie GET (z ponawianiem i limiterem) i zwraca odpowiedź bez sprawdzania kodu statusu,
+    np. do samodzielnej obsługi odpowiedzi 304"""
+    res = _send(session, url, params, headers)
+    if metrics is not None:
+        metrics.record_bytes(url, res.num_bytes_downloaded or len(res.content))
+    return res
+
+async def async_get_response(session:httpx.AsyncClient, url:str, params:dict=None, headers:dict=None):
+    """Wykonuje zapytanie GET (z ponawianiem i limiterem) i zwraca odpowiedź bez sprawdzania kodu statusu,
+    np. do samodzielnej obsługi odpowiedzi 304"""
+    res = await _async_send(session, url, params, headers)
+    if metrics is not None:
+        metrics.record_bytes(url, res.num_bytes_downloaded or len(res.content))
+    return res
+
+def get_bytes(session:httpx.Client, url:str, params:dict=None, headers:dict=None):
+    """Wykonuje zapytanie GET i zwraca treść odpowiedzi w bajtach (bez zapamiętywania)"""
+    res = _send(session, url, params, headers)
+    res.raise_for_status()
+    if metrics is not None:
+        metrics.record_bytes(url, res.num_bytes_downloaded or len(res.content))
+    return res.content
+
+async def async_get_bytes(session:httpx.AsyncClient, url:str, params:dict=None, headers:dict=None):
+    """Wykonuje zapytanie GET i zwraca treść odpowiedzi w bajtach (bez zapamiętywania)"""
+    res = await _async_send(session, url, params, headers)
+    res.raise_for_status()
+    if metrics is not None:
+        metrics.record_bytes(url, res.num_bytes_downloaded or len(res.content))
+    return res.content
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class DownloadError(Exception):
+    """Pobrany plik ma inny rozmiar lub sumę kontrolną niż oczekiwano"""
+
+
+class _Download:
+    """Stan pobierania strumieniowego wspólny dla wersji synchronicznej i asynchronicznej.
+    Przy zapisie do ścieżki dane trafiają najpierw do pliku .part, który po weryfikacji zastępuje plik docelowy"""
+    def __init__(self, dest, expected_size:int=None, sha256:str=None, resume:bool=True):
+        self.to_path = not hasattr(dest, 'write')
+        self.dest = os.fspath(dest) if self.to_path else dest
+        self.part = f'{self.dest}.part' if self.to_path else None
+        self.expected_size = expected_size
+        self.sha256 = sha256.lower() if sha256 else None
+        self.resume = resume and self.to_path
+        self.total = None
+        self.written = 0
+        self.hasher = None
+        self.file = None
+
+    @property
+    def offset(self):
+        if self.resume and os.path.exists(self.part):
+            return os.path.getsize(self.part)
+        return 0
+
+    def headers(self):
+        offset = self.offset
+        return {'Range': f'bytes={offset}-'} if offset else {}
+
+    def begin(self, res:httpx.Response):
+        offset = self.offset if res.status_code == 206 else 0
+        match = re.match(r'bytes (\d+)-\d+/(\d+|\*)', res.headers.get('content-range', ''))
+        if res.status_code == 206 and (match is None or int(match[1]) != offset):
+            raise DownloadError(f'Nieoczekiwany zakres odpowiedzi: {res.headers.get("content-range")}')
+        if match is not None and match[2] != '*':
+            self.total = int(match[2])
+        elif 'content-length' in res.headers:
+            self.total = offset + int(res.headers['content-length'])
+        self.hasher = hashlib.sha256() if self.sha256 else None
+        if self.to_path:
+            if offset and self.hasher is not None:
+                with open(self.part, 'rb') as f:
+                    for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                        self.hasher.update(chunk)
+            self.file = open(self.part, 'ab' if offset else 'wb')
+        else:
+            self.file = self.dest
+        self.written = offset
+
+    def write(self, chunk:bytes):
+        self.file.write(chunk)
+        self.written += len(chunk)
+        if self.hasher is not None:
+            self.hasher.update(chunk)
+
+    def close(self):
+        if self.to_path and self.file is not None:
+            self.file.close()
+        self.file = None
+
+    def finish(self):
+        self.close()
+        for expected in (self.total, self.expected_size):
+            if expected is not None and expected != self.written:
+                raise DownloadError(f'Pobrano {self.written} bajtów, oczekiwano {expected}')
+        if self.hasher is not None and self.hasher.hexdigest() != self.sha256:
+            if self.to_path:
+                os.remove(self.part)
+            raise DownloadError('Suma kontrolna SHA-256 pobranego pliku jest niezgodna')
+        if self.to_path:
+            os.replace(self.part, self.dest)
+            return self.dest
+        return self.written
+
+    def can_retry(self, bucket, attempt:int, res:httpx.Response|None):
+        if res is not None and res.status_code == 416 and self.offset:
+            # Serwer nie obsługuje zakresu zapisanego w pliku .part - pobieramy plik od nowa
+            os.remove(self.part)
+            return 0.0
+        # Bez zapisu do ścieżki nie da się wznowić pobierania po otrzymaniu części danych
+        if not self.resume and self.written:
+            return None
+        return _next_delay(bucket, attempt, res)
+
+
+def download(session:httpx.Client, url:str, dest, chunk_size:int=DOWNLOAD_CHUNK_SIZE, expected_size:int=None,
+             sha256:str=None, resume:bool=True):
+    """Pobiera zasób strumieniowo do pliku (ścieżka) lub obiektu plikowego otwartego w trybie binarnym.
+    Przerwane pobieranie do ścieżki jest wznawiane od miejsca przerwania. Zwraca ścieżkę pliku
+    lub liczbę zapisanych bajtów, jeśli dest jest obiektem plikowym"""
+    dl = _Download(dest, expected_size, sha256, resume)
+    bucket = rate_limiter.bucket(url) if rate_limiter is not None else None
+    attempt = 0
+    while True:
+        if bucket is not None and (wait := bucket.reserve()) > 0:
+            time.sleep(wait)
+        try:
+            with session.stream('GET', url, headers=dl.headers()) as res:
+                if (delay := dl.can_retry(bucket, attempt, res)) is None:
+                    res.raise_for_status()
+                    dl.begin(res)
+                    for chunk in res.iter_bytes(chunk_size):
+                        dl.write(chunk)
+                    return dl.finish()
+        except httpx.TransportError:
+            if (delay := dl.can_retry(bucket, attempt, None)) is None:
+                raise
+        finally:
+            dl.close()
+        attempt += 1
+        time.sleep(delay)
+
+async def async_download(session:httpx.AsyncClient, url:str, dest, chunk_size:int=DOWNLOAD_CHUNK_SIZE, expected_size:int=None,
+                         sha256:str=None, resume:bool=True):
+    """Pobiera zasób strumieniowo do pliku (ścieżka) lub obiektu plikowego otwartego w trybie binarnym.
+    Przerwane pobieranie do ścieżki jest wznawiane od miejsca przerwania. Zwraca ścieżkę pliku
+    lub liczbę zapisanych bajtów, jeśli dest jest obiektem plikowym"""
+    dl = _Download(dest, expected_size, sha256, resume)
+    bucket = rate_limiter.bucket(url) if rate_limiter is not None else None
+    attempt = 0
+    while True:
+        if bucket is not None and (wait := bucket.reserve()) > 0:
+            await asyncio.sleep(wait)
+        try:
+            async with session.stream('GET', url, headers=dl.headers()) as res:
+                if (delay := dl.can_retry(bucket, attempt, res)) is None:
+                    res.raise_for_status()
+                    dl.begin(res)
+                    async for chunk in res.aiter_bytes(chunk_size):
+                        dl.write(chunk)
+                    return dl.finish()
+        except httpx.TransportError:
+            if (delay := dl.can_retry(bucket, attempt, None)) is None:
+                raise
+        finally:
+            dl.close()
+        attempt += 1
+        await asyncio.sleep(delay)
+
+__all__ = ['ConditionalCache', 'conditional_cache', 'response_cache', 'set_response_cache',
+           'retry_policy', 'set_retry_policy', 'rate_limiter', 'set_rate_limiter', 'single_flight', 'set_single_flight', 'metrics', 'set_metrics', 'get_json', 'async_get_json', 'get_text', 'async_get_text', 'get_bytes', 'async_get_bytes', 'get_response', 'async_get_response',
+           'DOWNLOAD_CHUNK_SIZE', 'DownloadError', 'download', 'async_download']